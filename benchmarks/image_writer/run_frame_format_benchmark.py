@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+
+# Copyright 2024 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Assess the cost of writing the recorded camera frames in each `FrameFormat`.
+
+For each format, this script reports the time spent writing a frame with `write_image` (i.e. the CPU time of an
+image writer thread), the time spent reading it back like `encode_video_frames` does, and its size on disk.
+
+Frames are read from a directory of images with `--images-dir` (e.g. the frames of a recorded episode), or
+synthesized otherwise. Synthetic frames are smooth gradients with some noise, which compress roughly like camera
+frames, unlike uniform noise.
+
+Example:
+```bash
+python benchmarks/image_writer/run_frame_format_benchmark.py --num-frames 100 --height 480 --width 640
+```
+"""
+
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from lerobot.datasets.image_writer import FrameFormat, write_image
+from lerobot.datasets.utils import load_image_as_numpy
+from lerobot.datasets.video_utils import get_frame_paths
+
+FRAME_FORMATS = {
+    "png (level 6)": FrameFormat("png", png_compress_level=6),
+    "png (level 1)": FrameFormat("png", png_compress_level=1),
+    "png (level 0)": FrameFormat("png", png_compress_level=0),
+    "jpeg (quality 95)": FrameFormat("jpeg", jpeg_quality=95),
+    "jpeg (quality 80)": FrameFormat("jpeg", jpeg_quality=80),
+    "npy": FrameFormat("npy"),
+}
+
+
+def synthesize_frames(num_frames: int, height: int, width: int, seed: int = 0) -> list[np.ndarray]:
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width]
+    frames = []
+    for i in range(num_frames):
+        base = np.stack([x * 255 / width, y * 255 / height, np.full((height, width), 8.0 * i % 255)], axis=-1)
+        noise = rng.normal(0, 4, size=base.shape)
+        frames.append(np.clip(base + noise, 0, 255).astype(np.uint8))
+    return frames
+
+
+def benchmark_frame_format(frames: list[np.ndarray], frame_format: FrameFormat, output_dir: Path) -> dict:
+    output_dir.mkdir(parents=True)
+    start = time.perf_counter()
+    for i, frame in enumerate(frames):
+        write_image(frame, output_dir / f"frame_{i:06d}{frame_format.suffix}", frame_format)
+    write_s = time.perf_counter() - start
+
+    frame_paths = get_frame_paths(output_dir)
+    num_bytes = sum(Path(path).stat().st_size for path in frame_paths)
+    start = time.perf_counter()
+    for path in frame_paths:
+        load_image_as_numpy(path, dtype=np.uint8, channel_first=False)
+    read_s = time.perf_counter() - start
+
+    return {
+        "write_ms_per_frame": 1000 * write_s / len(frames),
+        "read_ms_per_frame": 1000 * read_s / len(frames),
+        "kb_per_frame": num_bytes / 1024 / len(frames),
+    }
+
+
+def main(images_dir: Path | None, num_frames: int, height: int, width: int, output_dir: Path | None):
+    if images_dir is not None:
+        frame_paths = get_frame_paths(images_dir)[:num_frames]
+        frames = [load_image_as_numpy(path, dtype=np.uint8, channel_first=False) for path in frame_paths]
+    else:
+        frames = synthesize_frames(num_frames, height, width)
+
+    tmp_dir = Path(tempfile.mkdtemp(dir=output_dir))
+    try:
+        results = {
+            name: benchmark_frame_format(frames, frame_format, tmp_dir / name.split()[0] / str(i))
+            for i, (name, frame_format) in enumerate(FRAME_FORMATS.items())
+        }
+    finally:
+        shutil.rmtree(tmp_dir)
+
+    df = pd.DataFrame.from_dict(results, orient="index")
+    print(f"{len(frames)} frames of shape {frames[0].shape}")
+    print(df.round(2).to_string())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--images-dir",
+        type=Path,
+        default=None,
+        help="Directory of frames to write, named 'frame_XXXXXX.<ext>'. Frames are synthesized if not provided.",
+    )
+    parser.add_argument("--num-frames", type=int, default=50, help="Number of frames written per format.")
+    parser.add_argument("--height", type=int, default=480, help="Height of the synthesized frames.")
+    parser.add_argument("--width", type=int, default=640, help="Width of the synthesized frames.")
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=None,
+        help="Directory in which the frames are temporarily written. Defaults to the system temporary directory.",
+    )
+    args = parser.parse_args()
+    main(**vars(args))
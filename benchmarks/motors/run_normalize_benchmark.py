@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+
+# Copyright 2024 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Assess the cost of normalizing and unnormalizing motor values in `MotorsBus`.
+
+The vectorized `_normalize` and `_unnormalize`, which use the calibration compiled into arrays, are compared with
+a loop over the motors reading the calibration of each one, which is how they used to be implemented. Both are
+run on a bus which is not connected, so only the computation is measured (i.e. the overhead added to every
+`sync_read` and `sync_write` of the positions).
+
+Example:
+```bash
+python benchmarks/motors/run_normalize_benchmark.py --num-motors 6 12 --num-calls 10000
+```
+"""
+
+import argparse
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from lerobot.motors import Motor, MotorCalibration, MotorNormMode
+from lerobot.motors.feetech import FeetechMotorsBus
+
+
+def loop_normalize(bus: FeetechMotorsBus, ids_values: dict[int, int]) -> dict[int, float]:
+    normalized_values = {}
+    for id_, val in ids_values.items():
+        motor = bus._id_to_name(id_)
+        min_ = bus.calibration[motor].range_min
+        max_ = bus.calibration[motor].range_max
+        drive_mode = bus.apply_drive_mode and bus.calibration[motor].drive_mode
+        if max_ == min_:
+            raise ValueError(f"Invalid calibration for motor '{motor}': min and max are equal.")
+
+        bounded_val = min(max_, max(min_, val))
+        if bus.motors[motor].norm_mode is MotorNormMode.RANGE_M100_100:
+            norm = (((bounded_val - min_) / (max_ - min_)) * 200) - 100
+            normalized_values[id_] = -norm if drive_mode else norm
+        elif bus.motors[motor].norm_mode is MotorNormMode.RANGE_0_100:
+            norm = ((bounded_val - min_) / (max_ - min_)) * 100
+            normalized_values[id_] = 100 - norm if drive_mode else norm
+        elif bus.motors[motor].norm_mode is MotorNormMode.DEGREES:
+            mid = (min_ + max_) / 2
+            max_res = bus.model_resolution_table[bus._id_to_model(id_)] - 1
+            normalized_values[id_] = (val - mid) * 360 / max_res
+        else:
+            raise NotImplementedError
+
+    return normalized_values
+
+
+def loop_unnormalize(bus: FeetechMotorsBus, ids_values: dict[int, float]) -> dict[int, int]:
+    unnormalized_values = {}
+    for id_, val in ids_values.items():
+        motor = bus._id_to_name(id_)
+        min_ = bus.calibration[motor].range_min
+        max_ = bus.calibration[motor].range_max
+        drive_mode = bus.apply_drive_mode and bus.calibration[motor].drive_mode
+        if max_ == min_:
+            raise ValueError(f"Invalid calibration for motor '{motor}': min and max are equal.")
+
+        if bus.motors[motor].norm_mode is MotorNormMode.RANGE_M100_100:
+            val = -val if drive_mode else val
+            bounded_val = min(100.0, max(-100.0, val))
+            unnormalized_values[id_] = int(((bounded_val + 100) / 200) * (max_ - min_) + min_)
+        elif bus.motors[motor].norm_mode is MotorNormMode.RANGE_0_100:
+            val = 100 - val if drive_mode else val
+            bounded_val = min(100.0, max(0.0, val))
+            unnormalized_values[id_] = int((bounded_val / 100) * (max_ - min_) + min_)
+        elif bus.motors[motor].norm_mode is MotorNormMode.DEGREES:
+            mid = (min_ + max_) / 2
+            max_res = bus.model_resolution_table[bus._id_to_model(id_)] - 1
+            unnormalized_values[id_] = int((val * max_res / 360) + mid)
+        else:
+            raise NotImplementedError
+
+    return unnormalized_values
+
+
+def make_bus(num_motors: int) -> FeetechMotorsBus:
+    """Bus with the motors of one or more SO-101 arms: joints in [-100, 100] and a gripper in [0, 100]."""
+    motors, calibration = {}, {}
+    for id_ in range(1, num_motors + 1):
+        norm_mode = MotorNormMode.RANGE_0_100 if id_ % 6 == 0 else MotorNormMode.RANGE_M100_100
+        motors[f"motor_{id_}"] = Motor(id_, "sts3215", norm_mode)
+        calibration[f"motor_{id_}"] = MotorCalibration(id_, id_ % 2, 0, 700 + id_, 3400 - id_)
+    return FeetechMotorsBus("/dev/null", motors, calibration)
+
+
+def main(num_motors: list[int], num_calls: int):
+    rng = np.random.default_rng(0)
+    results = {}
+    for n in num_motors:
+        bus = make_bus(n)
+        positions = dict(zip(bus.ids, rng.integers(700, 3400, n).tolist(), strict=True))
+        goals = dict(zip(bus.ids, rng.uniform(-100, 100, n).tolist(), strict=True))
+        assert bus._normalize(positions) == loop_normalize(bus, positions)
+        assert bus._unnormalize(goals) == loop_unnormalize(bus, goals)
+
+        timings = {
+            "normalize (loop)": lambda bus=bus, p=positions: loop_normalize(bus, p),
+            "normalize (vectorized)": lambda bus=bus, p=positions: bus._normalize(p),
+            "unnormalize (loop)": lambda bus=bus, g=goals: loop_unnormalize(bus, g),
+            "unnormalize (vectorized)": lambda bus=bus, g=goals: bus._unnormalize(g),
+        }
+        results[f"{n} motors"] = {
+            name: 1e6 * min(timeit.repeat(fn, number=num_calls, repeat=5)) / num_calls
+            for name, fn in timings.items()
+        }
+
+    df = pd.DataFrame.from_dict(results, orient="index")
+    print("Time per call (µs)")
+    print(df.round(2).to_string())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--num-motors", type=int, nargs="+", default=[6, 12], help="Numbers of motors on the bus."
+    )
+    parser.add_argument("--num-calls", type=int, default=10_000, help="Number of calls timed per repeat.")
+    args = parser.parse_args()
+    main(**vars(args))
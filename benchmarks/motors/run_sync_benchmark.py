@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+
+# Copyright 2024 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Assess the cost of preparing the sync reads and writes of `MotorsBus`.
+
+The sync readers and writers cached by (ids, addr, length), whose parameters are only changed in place, are
+compared with rebuilding their parameters on every call (i.e. `clearParam` and `addParam` for every motor), which
+is how they used to be prepared. For each protocol, this script reports the time spent preparing a call alone, and
+the time of a whole `_sync_read` / `_sync_write` with the motors simulated by the mock port handlers of
+`tests/mocks`, which includes the round trip through a pseudo-terminal.
+
+It has to be run from the root of the repository, so that `tests.mocks` can be imported.
+
+Example:
+```bash
+python -m benchmarks.motors.run_sync_benchmark --num-motors 6 12 --num-calls 200
+```
+"""
+
+import argparse
+import importlib
+import timeit
+
+import pandas as pd
+
+from lerobot.motors import Motor, MotorNormMode
+from lerobot.motors.dynamixel import DynamixelMotorsBus
+from lerobot.motors.feetech import FeetechMotorsBus
+from lerobot.motors.motors_bus import MotorsBus, get_address
+
+PROTOCOLS = {
+    "feetech": (FeetechMotorsBus, "sts3215", "tests.mocks.mock_feetech"),
+    "dynamixel": (DynamixelMotorsBus, "xl330-m288", "tests.mocks.mock_dynamixel"),
+}
+
+
+def rebuild_sync_reader(bus: MotorsBus, motor_ids: list[int], addr: int, length: int) -> None:
+    bus.sync_reader.clearParam()
+    bus.sync_reader.start_address = addr
+    bus.sync_reader.data_length = length
+    for id_ in motor_ids:
+        bus.sync_reader.addParam(id_)
+
+
+def rebuild_sync_writer(bus: MotorsBus, ids_values: dict[int, int], addr: int, length: int) -> None:
+    bus.sync_writer.clearParam()
+    bus.sync_writer.start_address = addr
+    bus.sync_writer.data_length = length
+    for id_, value in ids_values.items():
+        bus.sync_writer.addParam(id_, bus._serialize_data(value, length))
+
+
+def rebuilt_sync_read(bus: MotorsBus, motor_ids: list[int], addr: int, length: int) -> dict[int, int]:
+    rebuild_sync_reader(bus, motor_ids, addr, length)
+    comm = bus.sync_reader.txRxPacket()
+    assert bus._is_comm_success(comm), bus.packet_handler.getTxRxResult(comm)
+    return {id_: bus.sync_reader.getData(id_, addr, length) for id_ in motor_ids}
+
+
+def rebuilt_sync_write(bus: MotorsBus, ids_values: dict[int, int], addr: int, length: int) -> None:
+    rebuild_sync_writer(bus, ids_values, addr, length)
+    comm = bus.sync_writer.txPacket()
+    assert bus._is_comm_success(comm), bus.packet_handler.getTxRxResult(comm)
+
+
+def benchmark_protocol(protocol: str, num_motors: int, num_calls: int) -> dict[str, float]:
+    bus_cls, model, mocks_module = PROTOCOLS[protocol]
+    mock_motors = importlib.import_module(mocks_module).MockMotors()
+    mock_motors.open()
+    try:
+        motors = {
+            f"motor_{id_}": Motor(id_, model, MotorNormMode.RANGE_M100_100)
+            for id_ in range(1, num_motors + 1)
+        }
+        bus = bus_cls(mock_motors.port, motors)
+        bus.connect(handshake=False)
+
+        ids = list(range(1, num_motors + 1))
+        read_addr, read_length = get_address(bus.model_ctrl_table, model, "Present_Position")
+        write_addr, write_length = get_address(bus.model_ctrl_table, model, "Goal_Position")
+        positions = {id_: 1000 + 10 * id_ for id_ in ids}
+        mock_motors.build_sync_read_stub(read_addr, read_length, positions)
+        mock_motors.build_sync_write_stub(write_addr, write_length, positions)
+
+        assert bus._sync_read(read_addr, read_length, ids)[0] == positions
+        assert rebuilt_sync_read(bus, ids, read_addr, read_length) == positions
+
+        timings = {
+            "read setup (rebuilt)": (lambda: rebuild_sync_reader(bus, ids, read_addr, read_length), 100),
+            "read setup (cached)": (lambda: bus._setup_sync_reader(ids, read_addr, read_length), 100),
+            "write setup (rebuilt)": (
+                lambda: rebuild_sync_writer(bus, positions, write_addr, write_length),
+                100,
+            ),
+            "write setup (cached)": (
+                lambda: bus._setup_sync_writer(positions, write_addr, write_length),
+                100,
+            ),
+            "sync_read (rebuilt)": (lambda: rebuilt_sync_read(bus, ids, read_addr, read_length), 1),
+            "sync_read (cached)": (lambda: bus._sync_read(read_addr, read_length, ids), 1),
+            "sync_write (rebuilt)": (lambda: rebuilt_sync_write(bus, positions, write_addr, write_length), 1),
+            "sync_write (cached)": (lambda: bus._sync_write(write_addr, write_length, positions), 1),
+        }
+        # The setups alone are cheap, so they are called more times to be timed accurately
+        results = {
+            name: 1e6 * min(timeit.repeat(fn, number=num_calls * factor, repeat=3)) / (num_calls * factor)
+            for name, (fn, factor) in timings.items()
+        }
+        bus.disconnect(disable_torque=False)
+    finally:
+        mock_motors.close()
+
+    return results
+
+
+def main(protocols: list[str], num_motors: list[int], num_calls: int):
+    results = {
+        f"{protocol}, {n} motors": benchmark_protocol(protocol, n, num_calls)
+        for protocol in protocols
+        for n in num_motors
+    }
+    df = pd.DataFrame.from_dict(results, orient="index").T
+    print("Time per call (µs)")
+    print(df.round(2).to_string())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--protocols", nargs="+", choices=list(PROTOCOLS), default=list(PROTOCOLS), help="Buses to benchmark."
+    )
+    parser.add_argument(
+        "--num-motors", type=int, nargs="+", default=[6, 12], help="Numbers of motors on the bus."
+    )
+    parser.add_argument(
+        "--num-calls",
+        type=int,
+        default=200,
+        help="Number of sync reads and writes timed per repeat (100 times more for the setups alone).",
+    )
+    args = parser.parse_args()
+    main(**vars(args))
@@ -37,6 +37,15 @@ class DatasetConfig:
     revision: str | None = None
     use_imagenet_stats: bool = True
     video_backend: str = field(default_factory=get_safe_default_codec)
+    # Load the non-visual columns in contiguous arrays to speed up `delta_timestamps` queries. With
+    # `frame_table_mmap`, the arrays are stored next to the dataset and memory-mapped by every worker.
+    use_frame_table: bool = False
+    frame_table_mmap: bool = False
+    # Number of video decoders kept open in each dataloader worker (0 opens a new decoder for every sample).
+    video_decoder_cache_size: int = 0
+    # Read video frames from the pre-decoded frame store of the dataset, which must have been built beforehand
+    # with `scripts/decode_dataset_videos.py`.
+    use_frame_store: bool = False
 
 
 @dataclass
@@ -52,6 +52,11 @@ class TrainPipelineConfig(HubMixin):
     # Number of workers for the dataloader.
     num_workers: int = 4
     batch_size: int = 8
+    # Mixture sampling when `dataset.repo_id` is a list of datasets: each batch element is drawn from a dataset
+    # picked with probability proportional to `dataset_weights` (defaults to the number of frames of each
+    # dataset) to the power of 1 / `dataset_sampling_temperature`. It is enabled when any of them is set.
+    dataset_weights: list[float] | None = None
+    dataset_sampling_temperature: float | None = None
     steps: int = 100_000
     eval_freq: int = 20_000
     log_freq: int = 200
@@ -109,7 +114,16 @@ class TrainPipelineConfig(HubMixin):
 
         if isinstance(self.dataset.repo_id, list):
             # MultiLeRobotDataset is supported now
-            pass
+            if self.dataset_weights is not None and len(self.dataset_weights) != len(self.dataset.repo_id):
+                raise ValueError(
+                    f"'dataset_weights' has {len(self.dataset_weights)} values but "
+                    f"{len(self.dataset.repo_id)} datasets were provided."
+                )
+        elif self.use_mixture_sampling:
+            raise ValueError(
+                "'dataset_weights' and 'dataset_sampling_temperature' require a list of datasets in "
+                "'dataset.repo_id'."
+            )
 
         if not self.use_policy_training_preset and (self.optimizer is None or self.scheduler is None):
             raise ValueError("Optimizer and Scheduler must be set when the policy presets are not used.")
@@ -122,6 +136,10 @@ class TrainPipelineConfig(HubMixin):
                 "'policy.repo_id' argument missing. Please specify it to push the model to the hub."
             )
 
+    @property
+    def use_mixture_sampling(self) -> bool:
+        return self.dataset_weights is not None or self.dataset_sampling_temperature is not None
+
     @classmethod
     def __get_path_fields__(cls) -> list[str]:
         """This enables the parser to load config from the policy using `--policy.path=local/dir`"""
@@ -54,14 +54,18 @@ def auto_downsample_height_width(img: np.ndarray, target_size: int = 150, max_si
     return img[:, ::downsample_factor, ::downsample_factor]
 
 
-def sample_images(image_paths: list[str]) -> np.ndarray:
+def sample_images(image_paths: list[str] | list[np.ndarray]) -> np.ndarray:
+    """Samples and downsamples the images of an episode, given as paths or as uint8 (C, H, W) arrays."""
     sampled_indices = sample_indices(len(image_paths))
 
     images = None
     for i, idx in enumerate(sampled_indices):
         path = image_paths[idx]
-        # we load as uint8 to reduce memory usage
-        img = load_image_as_numpy(path, dtype=np.uint8, channel_first=True)
+        if isinstance(path, np.ndarray):
+            img = path
+        else:
+            # we load as uint8 to reduce memory usage
+            img = load_image_as_numpy(path, dtype=np.uint8, channel_first=True)
         img = auto_downsample_height_width(img)
 
         if images is None:
@@ -82,13 +86,114 @@ def get_feature_stats(array: np.ndarray, axis: tuple, keepdims: bool) -> dict[st
     }
 
 
+class RunningStats:
+    """Min, max, mean and standard deviation of a feature, updated online one frame at a time.
+
+    The mean and variance are accumulated with Welford's algorithm, and two accumulators are merged with the
+    parallel algorithm of Chan et al., so that the stats of several episodes can be combined exactly.
+
+    Args:
+        reduce_axes (tuple[int, ...], optional): Axes of each frame reduced in addition to the frames, e.g.
+            (1, 2) to compute the per-channel stats of (C, H, W) images. Defaults to (), which computes the stats
+            of each element of the frames.
+    """
+
+    def __init__(self, reduce_axes: tuple[int, ...] = ()):
+        self.reduce_axes = reduce_axes
+        # Number of frames, and number of values accumulated per element (frames x size of the reduced axes)
+        self.count = 0
+        self._num_values = 0
+        self.min = None
+        self.max = None
+        self.mean = None
+        self._m2 = None
+
+    def update(self, frame: np.ndarray) -> None:
+        frame = np.atleast_1d(frame)
+        if self.reduce_axes:
+            values = frame.astype(np.float64)
+            mean = values.mean(axis=self.reduce_axes, keepdims=True)
+            m2 = ((values - mean) ** 2).sum(axis=self.reduce_axes, keepdims=True)
+            num_values = int(np.prod([frame.shape[axis] for axis in self.reduce_axes]))
+            self._merge(
+                num_values,
+                frame.min(axis=self.reduce_axes, keepdims=True),
+                frame.max(axis=self.reduce_axes, keepdims=True),
+                mean,
+                m2,
+            )
+        else:
+            self._merge(1, frame, frame, frame.astype(np.float64), np.zeros(frame.shape))
+        self.count += 1
+
+    def _merge(self, num_values: int, min_: np.ndarray, max_: np.ndarray, mean: np.ndarray, m2: np.ndarray):
+        if self._num_values == 0:
+            self.min, self.max, self.mean, self._m2 = min_, max_, mean, m2
+            self._num_values = num_values
+            return
+
+        total = self._num_values + num_values
+        delta = mean - self.mean
+        self.mean = self.mean + delta * (num_values / total)
+        self._m2 = self._m2 + m2 + delta**2 * (self._num_values * num_values / total)
+        self.min = np.minimum(self.min, min_)
+        self.max = np.maximum(self.max, max_)
+        self._num_values = total
+
+    def merge(self, other: "RunningStats") -> None:
+        """Adds the frames accumulated by 'other'."""
+        if other._num_values > 0:
+            self._merge(other._num_values, other.min, other.max, other.mean, other._m2)
+            self.count += other.count
+
+    @classmethod
+    def from_stats(cls, stats: dict[str, np.ndarray]) -> "RunningStats":
+        """Accumulator with the stats of `get_feature_stats`, weighted by their count."""
+        obj = cls()
+        obj.count = obj._num_values = int(stats["count"].sum())
+        obj.min, obj.max, obj.mean = stats["min"], stats["max"], stats["mean"]
+        obj._m2 = stats["std"] ** 2 * obj._num_values
+        return obj
+
+    def get_stats(self) -> dict[str, np.ndarray]:
+        """Returns the stats in the same format as `get_feature_stats`."""
+        return {
+            "min": self.min,
+            "max": self.max,
+            "mean": self.mean,
+            "std": np.sqrt(self._m2 / self._num_values),
+            "count": np.array([self.count]),
+        }
+
+
+def get_running_stats(features: dict) -> dict[str, RunningStats]:
+    """Returns the accumulators filled by `LeRobotDataset.add_frame` for the features of 'features' which are
+    given in each frame, with per-channel stats for the images."""
+    return {
+        key: RunningStats(reduce_axes=(1, 2) if ft["dtype"] in ["image", "video"] else ())
+        for key, ft in features.items()
+        if ft["dtype"] != "string" and key not in ["index", "episode_index", "task_index"]
+    }
+
+
+def get_running_episode_stats(running_stats: dict[str, RunningStats], features: dict) -> dict:
+    """Returns the stats of the accumulators of `get_running_stats`, in the same format as
+    `compute_episode_stats`."""
+    ep_stats = {}
+    for key, stats in running_stats.items():
+        ep_stats[key] = stats.get_stats()
+        if features[key]["dtype"] in ["image", "video"]:
+            ep_stats[key] = {k: v if k == "count" else v / 255.0 for k, v in ep_stats[key].items()}
+    return ep_stats
+
+
 def compute_episode_stats(episode_data: dict[str, list[str] | np.ndarray], features: dict) -> dict:
     ep_stats = {}
     for key, data in episode_data.items():
         if features[key]["dtype"] == "string":
             continue  # HACK: we should receive np.arrays of strings
         elif features[key]["dtype"] in ["image", "video"]:
-            ep_ft_array = sample_images(data)  # data is a list of image paths
+            ep_ft_array = sample_images(data)  # data is a list of image paths or arrays
             axes_to_reduce = (0, 2, 3)  # keep channel dim
             keepdims = True
         else:
@@ -125,31 +230,10 @@ def _assert_type_and_shape(stats_list: list[dict[str, dict]]):
 
 def aggregate_feature_stats(stats_ft_list: list[dict[str, dict]]) -> dict[str, dict[str, np.ndarray]]:
     """Aggregates stats for a single feature."""
-    means = np.stack([s["mean"] for s in stats_ft_list])
-    variances = np.stack([s["std"] ** 2 for s in stats_ft_list])
-    counts = np.stack([s["count"] for s in stats_ft_list])
-    total_count = counts.sum(axis=0)
-
-    # Prepare weighted mean by matching number of dimensions
-    while counts.ndim < means.ndim:
-        counts = np.expand_dims(counts, axis=-1)
-
-    # Compute the weighted mean
-    weighted_means = means * counts
-    total_mean = weighted_means.sum(axis=0) / total_count
-
-    # Compute the variance using the parallel algorithm
-    delta_means = means - total_mean
-    weighted_variances = (variances + delta_means**2) * counts
-    total_variance = weighted_variances.sum(axis=0) / total_count
-
-    return {
-        "min": np.min(np.stack([s["min"] for s in stats_ft_list]), axis=0),
-        "max": np.max(np.stack([s["max"] for s in stats_ft_list]), axis=0),
-        "mean": total_mean,
-        "std": np.sqrt(total_variance),
-        "count": total_count,
-    }
+    running_stats = RunningStats.from_stats(stats_ft_list[0])
+    for stats in stats_ft_list[1:]:
+        running_stats.merge(RunningStats.from_stats(stats))
+    return running_stats.get_stats()
 
 
 def aggregate_stats(stats_list: list[dict[str, dict]]) -> dict[str, dict[str, np.ndarray]]:
@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+
+# Copyright 2024 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Background finalization of the episodes recorded in a LeRobotDataset.
+
+Saving an episode writes its parquet file, computes its stats and encodes its videos, which keeps the robot
+idle for several seconds at the end of every episode. With an `EpisodeFinalizer`, `save_episode` only writes a
+snapshot of the episode buffer in 'root/cache/pending_episodes' and hands it over to a pool of processes, so
+that the next episode can be recorded right away.
+
+Finalized episodes are committed to the metadata in the main process, in the order in which they were
+recorded, and their snapshot is only deleted once committed. Snapshots left behind by a crash are finalized
+when the dataset is opened again to record in it (see `LeRobotDataset.recover_pending_episodes`).
+"""
+
+import multiprocessing
+import os
+import pickle
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+
+import datasets
+import numpy as np
+
+from lerobot.datasets.compute_stats import compute_episode_stats
+from lerobot.datasets.utils import check_timestamps_sync, embed_images, get_hf_features_from_features
+from lerobot.datasets.video_utils import encode_video_frames
+
+
+def write_episode_snapshot(snapshot: dict, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Written atomically so that a crash never leaves a truncated snapshot behind.
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "wb") as f:
+        pickle.dump(snapshot, f)
+    os.replace(tmp_path, path)
+
+
+def load_episode_snapshot(path: Path) -> dict:
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def finalize_episode(
+    snapshot_path: Path,
+    root: Path,
+    features: dict,
+    fps: int,
+    tolerance_s: float,
+    data_path: str,
+    video_paths: dict[str, str],
+) -> dict:
+    """Writes the parquet file and encodes the videos of an episode snapshot, then returns its stats.
+
+    Runs in a worker process. Every file is written under a temporary name and then moved into place, so that
+    the episode can be finalized again from scratch if the worker is interrupted.
+    """
+    snapshot = load_episode_snapshot(snapshot_path)
+    episode_buffer = snapshot["episode_buffer"]
+    episode_length = snapshot["episode_length"]
+
+    check_timestamps_sync(
+        episode_buffer["timestamp"],
+        episode_buffer["episode_index"],
+        {"from": np.array([0]), "to": np.array([episode_length])},
+        fps,
+        tolerance_s,
+    )
+
+    hf_features = get_hf_features_from_features(features)
+    episode_dict = {key: episode_buffer[key] for key in hf_features}
+    ep_dataset = datasets.Dataset.from_dict(episode_dict, features=hf_features, split="train")
+    ep_dataset = embed_images(ep_dataset)
+    ep_data_path = root / data_path
+    ep_data_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_data_path = ep_data_path.with_name(f"{ep_data_path.stem}.tmp{ep_data_path.suffix}")
+    ep_dataset.to_parquet(tmp_data_path)
+    os.replace(tmp_data_path, ep_data_path)
+
+    # Stats which were accumulated while recording are not computed again
+    missing_data = {key: data for key, data in episode_buffer.items() if key not in snapshot["stats"]}
+    ep_stats = {**snapshot["stats"], **compute_episode_stats(missing_data, features)}
+
+    for key, video_path in video_paths.items():
+        video_path = root / video_path
+        if video_path.is_file():
+            # Already encoded while recording, or before an interruption.
+            continue
+        img_dir = Path(episode_buffer[key][0]).parent
+        tmp_video_path = video_path.with_name(f"{video_path.stem}.tmp{video_path.suffix}")
+        encode_video_frames(img_dir, tmp_video_path, fps, overwrite=True)
+        os.replace(tmp_video_path, video_path)
+
+    return {key: ep_stats[key] for key in features if key in ep_stats}
+
+
+class EpisodeFinalizer:
+    """Pool of processes finalizing episode snapshots with `finalize_episode`, with ordered commits.
+
+    Args:
+        on_finalized (Callable[[dict, dict], None]): Called in the main process with the header of the snapshot
+            (i.e. without its episode buffer) and the stats of every finalized episode, in submission order.
+        num_workers (int, optional): Number of worker processes. Video encoding is already multithreaded, so
+            more than one worker only helps when episodes are short. Defaults to 1.
+        max_backlog (int, optional): Maximum number of episodes waiting to be committed. `submit` blocks until
+            the oldest episodes are committed when it is exceeded. Defaults to 2.
+    """
+
+    def __init__(
+        self, on_finalized: Callable[[dict, dict], None], num_workers: int = 1, max_backlog: int = 2
+    ):
+        if max_backlog < 1:
+            raise ValueError(f"`max_backlog` must be at least 1, got {max_backlog}.")
+        self.on_finalized = on_finalized
+        self.max_backlog = max_backlog
+        # Forking a process which runs threads (e.g. the image writer) is unsafe.
+        self._pool = ProcessPoolExecutor(num_workers, mp_context=multiprocessing.get_context("spawn"))
+        self._pending: deque[tuple[dict, Future]] = deque()
+
+    @property
+    def backlog(self) -> int:
+        """Number of episodes submitted but not committed yet."""
+        return len(self._pending)
+
+    @property
+    def num_pending_frames(self) -> int:
+        return sum(header["episode_length"] for header, _ in self._pending)
+
+    def submit(self, snapshot: dict, snapshot_path: Path, **finalize_kwargs) -> None:
+        """Finalizes the episode 'snapshot', already written at 'snapshot_path', in the background.
+
+        'finalize_kwargs' are the remaining arguments of `finalize_episode`.
+        """
+        header = {key: value for key, value in snapshot.items() if key != "episode_buffer"}
+        future = self._pool.submit(finalize_episode, snapshot_path, **finalize_kwargs)
+        self._pending.append((header, future))
+        self.commit_finished()
+        while self.backlog > self.max_backlog:
+            self._commit_oldest()
+
+    def _commit_oldest(self) -> None:
+        header, future = self._pending[0]
+        # The episode stays pending if it failed, so that the later episodes are never committed before it.
+        ep_stats = future.result()
+        self.on_finalized(header, ep_stats)
+        self._pending.popleft()
+
+    def commit_finished(self) -> None:
+        """Commits the episodes which are finalized, without waiting for the others."""
+        while self._pending and self._pending[0][1].done():
+            self._commit_oldest()
+
+    def wait_until_done(self) -> None:
+        while self._pending:
+            self._commit_oldest()
+
+    def stop(self) -> None:
+        try:
+            self.wait_until_done()
+        finally:
+            self._pool.shutdown(cancel_futures=True)
@@ -79,7 +79,9 @@ def make_dataset(cfg: TrainPipelineConfig) -> LeRobotDataset | MultiLeRobotDatas
         LeRobotDataset | MultiLeRobotDataset
     """
     image_transforms = (
-        ImageTransforms(cfg.dataset.image_transforms) if cfg.dataset.image_transforms.enable else None
+        ImageTransforms(cfg.dataset.image_transforms)
+        if cfg.dataset.image_transforms.enable and not cfg.dataset.image_transforms.batched
+        else None
     )
 
     if isinstance(cfg.dataset.repo_id, str):
@@ -95,6 +97,10 @@ def make_dataset(cfg: TrainPipelineConfig) -> LeRobotDataset | MultiLeRobotDatas
             image_transforms=image_transforms,
             revision=cfg.dataset.revision,
             video_backend=cfg.dataset.video_backend,
+            use_frame_table=cfg.dataset.use_frame_table,
+            frame_table_mmap=cfg.dataset.frame_table_mmap,
+            video_decoder_cache_size=cfg.dataset.video_decoder_cache_size,
+            use_frame_store=cfg.dataset.use_frame_store,
         )
     else:
         # raise NotImplementedError("The MultiLeRobotDataset isn't supported for now.")
@@ -110,6 +116,10 @@ def make_dataset(cfg: TrainPipelineConfig) -> LeRobotDataset | MultiLeRobotDatas
             delta_timestamps=delta_timestamps,
             image_transforms=image_transforms,
             video_backend=cfg.dataset.video_backend,
+            use_frame_table=cfg.dataset.use_frame_table,
+            frame_table_mmap=cfg.dataset.frame_table_mmap,
+            video_decoder_cache_size=cfg.dataset.video_decoder_cache_size,
+            use_frame_store=cfg.dataset.use_frame_store,
         )
         logging.info(
             "Multiple datasets were provided. Applied the following index mapping to the provided datasets: "
@@ -0,0 +1,265 @@
+#!/usr/bin/env python
+
+# Copyright 2024 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Store of pre-decoded video frames for LeRobotDataset.
+
+Training for many epochs on a video dataset decodes the same frames over and over. The `VideoFrameStore` trades
+disk space for dataloader CPU: each camera stream is decoded once, optionally resized, and written as uint8 in a
+memory-mapped .npy file of shape (total_frames, channels, height, width), indexed by the global frame index of
+the dataset. Queries then read frames directly from the page cache without any decoding.
+
+The store lives next to the dataset, in 'root/cache/frames', and is built with `build_frame_store` (see also
+`lerobot/scripts/decode_dataset_videos.py`).
+"""
+
+import json
+import logging
+import os
+from itertools import accumulate
+from pathlib import Path
+
+import numpy as np
+import torch
+from torchvision.transforms.v2 import functional as F  # noqa: N812
+
+from lerobot.datasets.utils import DEFAULT_FRAME_STORE_PATH
+from lerobot.datasets.video_utils import decode_video_frames
+
+FRAME_STORE_INFO = "info.json"
+
+
+class VideoFrameStore:
+    """Memory-mapped uint8 frames of the video keys of a dataset, one file per camera.
+
+    Args:
+        root (Path): Directory of the store, usually 'dataset_root/cache/frames'.
+    """
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+        info_path = self.root / FRAME_STORE_INFO
+        self.info = json.loads(info_path.read_text()) if info_path.is_file() else None
+        self._frames = {}
+
+    def __getstate__(self) -> dict:
+        # Memory maps are re-opened lazily in each dataloader worker instead of being copied through pickle.
+        return {"root": self.root, "info": self.info, "_frames": {}}
+
+    @property
+    def exists(self) -> bool:
+        return self.info is not None
+
+    @property
+    def episodes(self) -> set[int]:
+        """Episodes whose frames have been fully written."""
+        return set(self.info["episodes"]) if self.exists else set()
+
+    @property
+    def resolution(self) -> tuple[int, int] | None:
+        return tuple(self.info["resolution"]) if self.exists and self.info["resolution"] else None
+
+    def _get_frames(self, key: str) -> np.ndarray:
+        if key not in self._frames:
+            self._frames[key] = np.load(self.root / f"{key}.npy", mmap_mode="r")
+        return self._frames[key]
+
+    def _write_info(self) -> None:
+        # Written atomically since dataloader workers may read it while the store is being extended.
+        tmp_path = self.root / f"{FRAME_STORE_INFO}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.info, f, indent=4)
+        os.replace(tmp_path, self.root / FRAME_STORE_INFO)
+
+    @classmethod
+    def create(
+        cls,
+        root: str | Path,
+        fps: int,
+        episode_lengths: dict[int, int],
+        resolution: tuple[int, int] | None = None,
+    ) -> "VideoFrameStore":
+        """Creates an empty store for a dataset whose episodes have the given lengths."""
+        obj = cls.__new__(cls)
+        obj.root = Path(root)
+        obj.root.mkdir(parents=True, exist_ok=True)
+        obj._frames = {}
+        cumulative_lengths = list(accumulate(episode_lengths.values()))
+        obj.info = {
+            "fps": fps,
+            "resolution": list(resolution) if resolution is not None else None,
+            "total_frames": cumulative_lengths[-1] if cumulative_lengths else 0,
+            # Keys are strings, as they would be after a round trip through json.
+            "episode_from": {
+                str(ep_idx): from_idx
+                for ep_idx, from_idx in zip(episode_lengths, [0] + cumulative_lengths[:-1], strict=True)
+            },
+            "episode_length": {str(ep_idx): length for ep_idx, length in episode_lengths.items()},
+            "episodes": [],
+            "shapes": {},
+        }
+        obj._write_info()
+        return obj
+
+    def extend(self, episode_lengths: dict[int, int]) -> None:
+        """Makes room for the episodes of 'episode_lengths' which are not in the store yet (e.g. recorded after it
+        was built), keeping the frames already written.
+
+        The files of the cameras are copied into larger ones, which then replace them, so that the files memory
+        mapped by dataloader workers are never modified.
+        """
+        new_lengths = {
+            ep_idx: length
+            for ep_idx, length in episode_lengths.items()
+            if str(ep_idx) not in self.info["episode_length"]
+        }
+        if not new_lengths:
+            return
+
+        total_frames = self.info["total_frames"]
+        for ep_idx, length in new_lengths.items():
+            self.info["episode_from"][str(ep_idx)] = total_frames
+            self.info["episode_length"][str(ep_idx)] = length
+            total_frames += length
+
+        for key, shape in self.info["shapes"].items():
+            old_frames = np.load(self.root / f"{key}.npy", mmap_mode="r")
+            tmp_path = self.root / f"{key}.tmp.npy"
+            frames = np.lib.format.open_memmap(
+                tmp_path, mode="w+", dtype=np.uint8, shape=(total_frames, *shape)
+            )
+            frames[: len(old_frames)] = old_frames
+            frames.flush()
+            del frames, old_frames
+            os.replace(tmp_path, self.root / f"{key}.npy")
+            self._frames.pop(key, None)
+
+        self.info["total_frames"] = total_frames
+        self._write_info()
+
+    def write_frames(self, key: str, ep_idx: int, start: int, frames: torch.Tensor) -> None:
+        """Writes uint8 (T, C, H, W) 'frames' of episode 'ep_idx', starting at its frame 'start'."""
+        if key not in self.info["shapes"]:
+            self.info["shapes"][key] = list(frames.shape[1:])
+            np.lib.format.open_memmap(
+                self.root / f"{key}.npy",
+                mode="w+",
+                dtype=np.uint8,
+                shape=(self.info["total_frames"], *frames.shape[1:]),
+            ).flush()
+            self._write_info()
+
+        if key not in self._frames or not self._frames[key].flags.writeable:
+            self._frames[key] = np.load(self.root / f"{key}.npy", mmap_mode="r+")
+        from_idx = self.info["episode_from"][str(ep_idx)] + start
+        self._frames[key][from_idx : from_idx + len(frames)] = frames.numpy()
+
+    def add_episode(self, ep_idx: int) -> None:
+        """Marks all the frames of episode 'ep_idx' as written."""
+        for frames in self._frames.values():
+            if isinstance(frames, np.memmap):
+                frames.flush()
+        self.info["episodes"] = sorted({*self.info["episodes"], ep_idx})
+        self._write_info()
+
+    def query(self, key: str, ep_idx: int, timestamps: list[float], tolerance_s: float) -> torch.Tensor:
+        """Returns the frames of episode 'ep_idx' at 'timestamps', in the same format as
+        `decode_video_frames`: float32 in [0,1] range and channel first.
+        """
+        ep_idx = str(ep_idx)
+        fps = self.info["fps"]
+        query_ts = np.asarray(timestamps)
+        frame_indices = np.round(query_ts * fps).astype(np.int64)
+        dist = np.abs(frame_indices / fps - query_ts)
+        is_within_bounds = (frame_indices >= 0) & (frame_indices < self.info["episode_length"][ep_idx])
+        is_within_tol = (dist < tolerance_s) & is_within_bounds
+        assert is_within_tol.all(), (
+            f"One or several query timestamps unexpectedly violate the tolerance ({dist[~is_within_tol]} > {tolerance_s=})."
+            "It means that the closest frame that can be loaded from the frame store is too far away in time."
+            f"\nqueried timestamps: {query_ts}"
+            f"\nepisode: {ep_idx}, video key: {key}"
+        )
+
+        frames = self._get_frames(key)[self.info["episode_from"][ep_idx] + frame_indices]
+        return torch.from_numpy(frames).type(torch.float32) / 255
+
+
+def build_frame_store(
+    dataset,
+    resolution: tuple[int, int] | None = None,
+    overwrite: bool = False,
+    chunk_size: int = 64,
+) -> VideoFrameStore:
+    """Decodes the videos of the episodes selected in 'dataset' into its frame store.
+
+    Episodes already present in the store are skipped, so that decoding can be resumed and other episodes can
+    be added later: the store is extended with the episodes recorded since it was built. A ValueError is raised
+    if the store was built for another resolution or if the length of its episodes changed, unless 'overwrite'
+    is set.
+
+    Args:
+        dataset (LeRobotDataset): Dataset whose videos are decoded.
+        resolution (tuple[int, int] | None, optional): Target (height, width) of the stored frames. Defaults
+            to None, which keeps the resolution of the existing store, or else the resolution of the videos.
+        overwrite (bool, optional): Re-create the store from scratch. Defaults to False.
+        chunk_size (int, optional): Number of frames decoded at once. Defaults to 64.
+    """
+    root = dataset.root / DEFAULT_FRAME_STORE_PATH
+    episode_lengths = {ep_idx: ep_dict["length"] for ep_idx, ep_dict in dataset.meta.episodes.items()}
+    resolution = tuple(resolution) if resolution is not None else None
+    store = VideoFrameStore(root)
+    if overwrite or not store.exists:
+        store = VideoFrameStore.create(root, dataset.fps, episode_lengths, resolution)
+    else:
+        if resolution is None:
+            resolution = store.resolution
+        elif resolution != store.resolution:
+            raise ValueError(
+                f"The frame store in '{root}' was built for the resolution {store.resolution}, not {resolution}. "
+                "Set `overwrite` to re-create it."
+            )
+        changed_episodes = [
+            int(ep_idx)
+            for ep_idx, length in store.info["episode_length"].items()
+            if episode_lengths.get(int(ep_idx)) != length
+        ]
+        if changed_episodes:
+            raise ValueError(
+                f"The episodes {changed_episodes} of the frame store in '{root}' don't match the dataset anymore. "
+                "Set `overwrite` to re-create it."
+            )
+        store.extend(episode_lengths)
+
+    episodes = dataset.episodes if dataset.episodes is not None else list(episode_lengths)
+    for ep_idx in episodes:
+        if ep_idx in store.episodes:
+            continue
+        logging.info(f"Decoding videos of episode {ep_idx} into the frame store")
+        timestamps = (np.arange(episode_lengths[ep_idx]) / dataset.fps).tolist()
+        for key in dataset.meta.video_keys:
+            video_path = dataset.root / dataset.meta.get_video_file_path(ep_idx, key)
+            for start in range(0, len(timestamps), chunk_size):
+                frames = decode_video_frames(
+                    video_path,
+                    timestamps[start : start + chunk_size],
+                    dataset.tolerance_s,
+                    dataset.video_backend,
+                )
+                if resolution is not None:
+                    frames = F.resize(frames, list(resolution), antialias=True)
+                frames = (frames * 255).round().clamp(0, 255).type(torch.uint8)
+                store.write_frames(key, ep_idx, start, frames)
+        store.add_episode(ep_idx)
+
+    return store
@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+
+# Copyright 2024 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Columnar in-memory copy of the non-visual columns of a LeRobotDataset.
+
+`datasets.Dataset.select` builds a new Arrow view and a python list of tensors on every call, which makes
+delta-timestamps queries in `LeRobotDataset.__getitem__` dominate the dataloader CPU time. The `FrameTable`
+holds each numeric column as one contiguous numpy array so that a delta window becomes a single fancy-index
+gather. The arrays can optionally be written once to disk and memory-mapped, in which case every dataloader
+worker shares the same pages through the OS page cache.
+
+Written arrays are never modified: each save goes to a new directory, which is published by atomically replacing
+the info file that points to it. Processes that already memory-mapped a previous version keep reading it.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import datasets
+import numpy as np
+import pyarrow as pa
+import torch
+
+FRAME_TABLE_INFO = "info.json"
+
+
+def _is_tabular_feature(feature) -> bool:
+    """Whether a hf feature can be stored as a fixed-shape numeric array."""
+    if isinstance(feature, datasets.Value):
+        return feature.dtype not in ["string", "large_string"]
+    if isinstance(feature, datasets.Sequence):
+        return _is_tabular_feature(feature.feature)
+    return isinstance(feature, (datasets.Array2D, datasets.Array3D, datasets.Array4D, datasets.Array5D))
+
+
+def _column_to_numpy(column: pa.ChunkedArray) -> np.ndarray:
+    """Converts a (possibly nested) fixed-shape arrow column into a single (num_rows, *shape) array."""
+    array = column.combine_chunks()
+    shape = [len(array)]
+    while pa.types.is_list(array.type) or pa.types.is_fixed_size_list(array.type):
+        if len(array) > 0:
+            shape.append(len(array.flatten()) // len(array))
+        array = array.flatten()
+    array = array.to_numpy(zero_copy_only=False).reshape(shape)
+    # `hf_transform_to_torch` goes through python floats, which torch turns into float32.
+    if np.issubdtype(array.dtype, np.floating) and array.dtype != np.float32:
+        array = array.astype(np.float32)
+    return array
+
+
+def dataset_fingerprint(hf_dataset: datasets.Dataset) -> str:
+    """Identifies the data of 'hf_dataset', so that a FrameTable written on disk is not reused once it changes.
+
+    For a dataset backed by arrow files (e.g. loaded from parquet files), these are the paths, sizes and
+    modification times of its files, which are rewritten when the data is downloaded again or edited. Otherwise,
+    this is its `datasets` fingerprint.
+    """
+    if not hf_dataset.cache_files:
+        return hf_dataset._fingerprint
+    files = []
+    for cache_file in hf_dataset.cache_files:
+        stat = os.stat(cache_file["filename"])
+        files.append([cache_file["filename"], stat.st_size, stat.st_mtime_ns])
+    return hashlib.sha256(json.dumps(files).encode()).hexdigest()
+
+
+class FrameTable:
+    """Contiguous numpy arrays for the numeric columns of a `datasets.Dataset`, indexed by row."""
+
+    def __init__(self, columns: dict[str, np.ndarray], columns_dir: Path | None = None):
+        lengths = {len(array) for array in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"All columns of a FrameTable must have the same length, got {lengths}.")
+        self._columns = columns
+        self._num_frames = lengths.pop() if lengths else 0
+        self._columns_dir = columns_dir
+
+    def __getstate__(self) -> dict:
+        # Memory-mapped tables are re-opened in each dataloader worker instead of being copied through pickle.
+        # The directory of the columns is never rewritten, so the workers map the same data as this process.
+        if self._columns_dir is not None:
+            return {"columns_dir": self._columns_dir, "keys": list(self._columns)}
+        return self.__dict__
+
+    def __setstate__(self, state: dict) -> None:
+        if "columns_dir" in state:
+            state = self._open(state["columns_dir"], state["keys"]).__dict__
+        self.__dict__.update(state)
+
+    @classmethod
+    def _open(cls, columns_dir: Path, keys: list[str]) -> "FrameTable":
+        columns = {key: np.load(columns_dir / f"{key}.npy", mmap_mode="r") for key in keys}
+        return cls(columns, columns_dir=columns_dir)
+
+    @classmethod
+    def from_hf_dataset(
+        cls, hf_dataset: datasets.Dataset, mmap_dir: str | Path | None = None
+    ) -> "FrameTable":
+        """Extracts the numeric columns of 'hf_dataset'.
+
+        If 'mmap_dir' is provided, the columns are stored there as .npy files the first time and memory-mapped
+        afterwards. They are written again when they don't match the number of rows, the columns or the
+        fingerprint (see `dataset_fingerprint`) of 'hf_dataset'. Several processes can do this concurrently.
+        """
+        keys = [key for key, ft in hf_dataset.features.items() if _is_tabular_feature(ft)]
+        if mmap_dir is not None:
+            mmap_dir = Path(mmap_dir)
+            fingerprint = dataset_fingerprint(hf_dataset)
+            table = cls.load(mmap_dir, fingerprint=fingerprint)
+            if table is not None and table.keys() == set(keys) and len(table) == len(hf_dataset):
+                return table
+
+        table = hf_dataset.with_format("arrow", columns=keys)[:]
+        columns = {key: _column_to_numpy(table[key]) for key in keys}
+        if mmap_dir is None:
+            return cls(columns)
+
+        return cls(columns).save(mmap_dir, fingerprint=fingerprint)
+
+    @classmethod
+    def load(cls, mmap_dir: str | Path, fingerprint: str | None = None) -> "FrameTable | None":
+        """Memory-maps a FrameTable previously written with `save`. Returns None if there is none, or if
+        'fingerprint' is provided and differs from the one it was saved with."""
+        mmap_dir = Path(mmap_dir)
+        info_path = mmap_dir / FRAME_TABLE_INFO
+        if not info_path.is_file():
+            return None
+        with open(info_path) as f:
+            info = json.load(f)
+        if fingerprint is not None and info.get("fingerprint") != fingerprint:
+            return None
+        try:
+            return cls._open(mmap_dir / info["columns_dir"], info["keys"])
+        except FileNotFoundError:
+            # Replaced by a newer save in the meantime.
+            return None
+
+    def save(self, mmap_dir: str | Path, fingerprint: str | None = None) -> "FrameTable":
+        """Writes the columns to a new directory in 'mmap_dir', makes it the one returned by `load` and returns
+        the table memory-mapped from it.
+
+        Files that may already be memory-mapped are never rewritten, so that concurrent processes (e.g. the
+        ranks of a distributed run) can save and load the same 'mmap_dir'. The previous columns are removed,
+        which doesn't affect the processes that mapped them.
+        """
+        mmap_dir = Path(mmap_dir)
+        mmap_dir.mkdir(parents=True, exist_ok=True)
+        columns_dir = Path(tempfile.mkdtemp(prefix="columns-", dir=mmap_dir))
+        for key, array in self._columns.items():
+            np.save(columns_dir / f"{key}.npy", np.ascontiguousarray(array))
+        # Mapped before being published, as a concurrent save may remove it right after.
+        table = self._open(columns_dir, list(self._columns))
+
+        info_path = mmap_dir / FRAME_TABLE_INFO
+        previous_info = None
+        if info_path.is_file():
+            with open(info_path) as f:
+                previous_info = json.load(f)
+        info = {
+            "keys": list(self._columns),
+            "num_frames": self._num_frames,
+            "fingerprint": fingerprint,
+            "columns_dir": columns_dir.name,
+        }
+        # Written last and atomically, so that `load` never picks up an interrupted or partial save.
+        with tempfile.NamedTemporaryFile("w", dir=mmap_dir, suffix=".tmp", delete=False) as f:
+            json.dump(info, f, indent=4)
+        os.replace(f.name, info_path)
+
+        if previous_info is not None and "columns_dir" in previous_info:
+            shutil.rmtree(mmap_dir / previous_info["columns_dir"], ignore_errors=True)
+        return table
+
+    def keys(self) -> set[str]:
+        return set(self._columns)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._columns
+
+    def __len__(self) -> int:
+        return self._num_frames
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        return self._columns[key]
+
+    def gather(self, key: str, indices: list[int] | np.ndarray) -> torch.Tensor:
+        """Returns the rows of column 'key' at 'indices' stacked in a single tensor."""
+        return torch.from_numpy(np.ascontiguousarray(self._columns[key][np.asarray(indices)]))
@@ -16,7 +16,12 @@
 import multiprocessing
 import queue
 import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
 from pathlib import Path
+from typing import NamedTuple
 
 import numpy as np
 import PIL.Image
@@ -38,7 +43,7 @@ def safe_stop_image_writer(func):
     return wrapper
 
 
-def image_array_to_pil_image(image_array: np.ndarray, range_check: bool = True) -> PIL.Image.Image:
+def image_array_to_uint8_hwc(image_array: np.ndarray, range_check: bool = True) -> np.ndarray:
     # TODO(aliberts): handle 1 channel and 4 for depth images
     if image_array.ndim != 3:
         raise ValueError(f"The array has {image_array.ndim} dimensions, but 3 is expected for an image.")
@@ -65,42 +70,180 @@ def image_array_to_pil_image(image_array: np.ndarray, range_check: bool = True)
 
         image_array = (image_array * 255).astype(np.uint8)
 
-    return PIL.Image.fromarray(image_array)
+    return image_array
+
+
+def image_array_to_pil_image(image_array: np.ndarray, range_check: bool = True) -> PIL.Image.Image:
+    return PIL.Image.fromarray(image_array_to_uint8_hwc(image_array, range_check))
+
+
+FRAME_CODECS = {"png": ".png", "jpeg": ".jpg", "npy": ".npy"}
+
+
+@dataclass
+class FrameFormat:
+    """Format of the frames written on disk before being encoded into videos.
+
+    PNG is lossless but its compression is the most expensive part of recording. A lower 'png_compress_level'
+    (0 to 9) is faster and larger, JPEG (with 'jpeg_quality' from 1 to 95) is lossy but much faster to write,
+    and raw `.npy` arrays cost no CPU at all but take the most disk space. See
+    `benchmarks/image_writer/run_frame_format_benchmark.py` to compare them on your frames.
+    """
+
+    codec: str = "png"
+    png_compress_level: int = 6
+    jpeg_quality: int = 95
+
+    def __post_init__(self):
+        if self.codec not in FRAME_CODECS:
+            raise ValueError(f"Unsupported frame codec '{self.codec}', must be one of {list(FRAME_CODECS)}.")
+        if not 0 <= self.png_compress_level <= 9:
+            raise ValueError(f"`png_compress_level` must be in [0, 9], got {self.png_compress_level}.")
+        if not 1 <= self.jpeg_quality <= 95:
+            raise ValueError(f"`jpeg_quality` must be in [1, 95], got {self.jpeg_quality}.")
 
+    @property
+    def suffix(self) -> str:
+        return FRAME_CODECS[self.codec]
 
-def write_image(image: np.ndarray | PIL.Image.Image, fpath: Path):
+
+def write_image(image: np.ndarray | PIL.Image.Image, fpath: Path, frame_format: FrameFormat | None = None):
+    """Writes an image in the format given by the suffix of 'fpath', with the settings of 'frame_format'."""
     try:
+        fpath = Path(fpath)
+        if fpath.suffix == ".npy":
+            if isinstance(image, PIL.Image.Image):
+                image = np.asarray(image.convert("RGB"))
+            np.save(fpath, image_array_to_uint8_hwc(image))
+            return
+
         if isinstance(image, np.ndarray):
             img = image_array_to_pil_image(image)
         elif isinstance(image, PIL.Image.Image):
             img = image
         else:
             raise TypeError(f"Unsupported image type: {type(image)}")
-        img.save(fpath)
+
+        if frame_format is None:
+            img.save(fpath)
+        else:
+            # Each plugin only reads its own settings
+            img.save(fpath, compress_level=frame_format.png_compress_level, quality=frame_format.jpeg_quality)
     except Exception as e:
         print(f"Error writing image {fpath}: {e}")
 
 
-def worker_thread_loop(queue: queue.Queue):
+class SharedFrame(NamedTuple):
+    """Location of a frame in a `SharedFrameRing`, sent to the worker processes instead of the frame itself."""
+
+    shm_name: str
+    slot: int
+    shape: tuple[int, ...]
+    dtype: str
+
+
+class SharedFrameRing:
+    """Fixed number of slots holding frames of the same shape and dtype, in a single shared memory block.
+
+    Only used in the main process: the slots are handed over to the worker processes as `SharedFrame`
+    descriptors, and released once their frame is written.
+    """
+
+    def __init__(self, shape: tuple[int, ...], dtype: np.dtype, num_slots: int):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.num_slots = num_slots
+        slot_nbytes = int(np.prod(self.shape)) * self.dtype.itemsize
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, slot_nbytes * num_slots))
+        self.frames = np.ndarray((num_slots, *self.shape), dtype=self.dtype, buffer=self.shm.buf)
+        self.free_slots = deque(range(num_slots))
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def put(self, image_array: np.ndarray) -> SharedFrame:
+        slot = self.free_slots.popleft()
+        self.frames[slot] = image_array
+        return SharedFrame(self.name, slot, self.shape, self.dtype.str)
+
+    def release(self, slot: int) -> None:
+        self.free_slots.append(slot)
+
+    def close(self) -> None:
+        # The view on the buffer must be released before closing it
+        del self.frames
+        self.shm.close()
+        self.shm.unlink()
+
+
+# Shared memory blocks attached by the threads of a worker process, by name
+_attached_shms: dict[str, shared_memory.SharedMemory] = {}
+_attached_shms_lock = threading.Lock()
+
+
+def read_shared_frame(frame: SharedFrame) -> np.ndarray:
+    """Returns a view on the frame in shared memory, valid until its slot is released."""
+    with _attached_shms_lock:
+        shm = _attached_shms.get(frame.shm_name)
+        if shm is None:
+            shm = shared_memory.SharedMemory(name=frame.shm_name)
+            _attached_shms[frame.shm_name] = shm
+    dtype = np.dtype(frame.dtype)
+    offset = frame.slot * int(np.prod(frame.shape)) * dtype.itemsize
+    return np.ndarray(frame.shape, dtype=dtype, buffer=shm.buf, offset=offset)
+
+
+def detach_shared_frames() -> None:
+    with _attached_shms_lock:
+        for shm in _attached_shms.values():
+            try:
+                shm.close()
+            except BufferError:
+                # A frame is still referenced, the memory is released when the process exits.
+                pass
+        _attached_shms.clear()
+
+
+def worker_thread_loop(
+    queue: queue.Queue, released_slots: queue.Queue | None = None, frame_format: FrameFormat | None = None
+):
     while True:
         item = queue.get()
         if item is None:
             queue.task_done()
             break
         image_array, fpath = item
-        write_image(image_array, fpath)
+        if isinstance(image_array, SharedFrame):
+            shared_frame = image_array
+            try:
+                write_image(read_shared_frame(shared_frame), fpath, frame_format)
+            finally:
+                released_slots.put((shared_frame.shm_name, shared_frame.slot))
+        else:
+            write_image(image_array, fpath, frame_format)
         queue.task_done()
 
 
-def worker_process(queue: queue.Queue, num_threads: int):
+def worker_process(
+    queue: queue.Queue,
+    num_threads: int,
+    released_slots: queue.Queue | None = None,
+    frame_format: FrameFormat | None = None,
+):
     threads = []
     for _ in range(num_threads):
-        t = threading.Thread(target=worker_thread_loop, args=(queue,))
+        t = threading.Thread(target=worker_thread_loop, args=(queue, released_slots, frame_format))
         t.daemon = True
         t.start()
         threads.append(t)
     for t in threads:
         t.join()
+    detach_shared_frames()
+
+
+# Period at which the liveness of the processes is checked while waiting for a free shared memory slot
+RELEASED_SLOT_POLL_S = 1.0
 
 
 class AsyncImageWriter:
@@ -116,14 +259,35 @@ class AsyncImageWriter:
     The optimal number of processes and threads depends on your computer capabilities.
     We advise to use 4 threads per camera with 0 processes. If the fps is not stable, try to increase or lower
     the number of threads. If it is still not stable, try to use 1 subprocess, or more.
+
+    With processes, numpy arrays and tensors are not pickled through the queue: they are copied into a ring of
+    `num_shared_slots` shared memory slots for their shape and dtype (i.e. one ring per camera), and only
+    their slot is sent to the processes. When every slot of a ring is in use, `save_image` waits for one
+    to be released, so that every frame added to a dataset is written. Waits are counted in
+    `num_backpressure_waits` and `backpressure_wait_s`. If a process died in the meantime (e.g. killed when
+    running out of memory), `save_image` raises a RuntimeError instead of waiting forever.
+
+    Images are written in the format given by the suffix of their path, with the settings of 'frame_format'.
     """
 
-    def __init__(self, num_processes: int = 0, num_threads: int = 1):
+    def __init__(
+        self,
+        num_processes: int = 0,
+        num_threads: int = 1,
+        num_shared_slots: int = 32,
+        frame_format: FrameFormat | None = None,
+    ):
         self.num_processes = num_processes
         self.num_threads = num_threads
+        self.num_shared_slots = num_shared_slots
+        self.frame_format = frame_format
         self.queue = None
+        self.released_slots = None
         self.threads = []
         self.processes = []
+        self.rings: dict[tuple, SharedFrameRing] = {}
+        self.num_backpressure_waits = 0
+        self.backpressure_wait_s = 0.0
         self._stopped = False
 
         if num_threads <= 0 and num_processes <= 0:
@@ -133,15 +297,22 @@ class AsyncImageWriter:
             # Use threading
             self.queue = queue.Queue()
             for _ in range(self.num_threads):
-                t = threading.Thread(target=worker_thread_loop, args=(self.queue,))
+                t = threading.Thread(target=worker_thread_loop, args=(self.queue, None, self.frame_format))
                 t.daemon = True
                 t.start()
                 self.threads.append(t)
         else:
             # Use multiprocessing
             self.queue = multiprocessing.JoinableQueue()
+            self.released_slots = multiprocessing.Queue()
+            # The processes must share the resource tracker of the main process, otherwise they start their own
+            # when attaching to the shared memory, which unlinks it when they exit.
+            resource_tracker.ensure_running()
             for _ in range(self.num_processes):
-                p = multiprocessing.Process(target=worker_process, args=(self.queue, self.num_threads))
+                p = multiprocessing.Process(
+                    target=worker_process,
+                    args=(self.queue, self.num_threads, self.released_slots, self.frame_format),
+                )
                 p.daemon = True
                 p.start()
                 self.processes.append(p)
@@ -150,8 +321,51 @@ class AsyncImageWriter:
         if isinstance(image, torch.Tensor):
             # Convert tensor to numpy array to minimize main process time
             image = image.cpu().numpy()
+        if self.num_processes > 0 and not self._stopped and isinstance(image, np.ndarray):
+            image = self._put_shared_frame(image)
         self.queue.put((image, fpath))
 
+    def _put_shared_frame(self, image: np.ndarray) -> SharedFrame:
+        key = (image.shape, image.dtype.str)
+        ring = self.rings.get(key)
+        if ring is None:
+            ring = SharedFrameRing(image.shape, image.dtype, self.num_shared_slots)
+            self.rings[key] = ring
+
+        self._collect_released_slots()
+        if not ring.free_slots:
+            self.num_backpressure_waits += 1
+            start = time.perf_counter()
+            self._collect_released_slots(ring)
+            self.backpressure_wait_s += time.perf_counter() - start
+
+        return ring.put(image)
+
+    def _collect_released_slots(self, ring: SharedFrameRing | None = None) -> None:
+        """Returns the slots released by the processes to their ring.
+
+        Without 'ring', only the slots already released are collected. Otherwise, waits until a slot of 'ring'
+        is released.
+        """
+        rings_by_name = {r.name: r for r in self.rings.values()}
+        while ring is None or not ring.free_slots:
+            try:
+                shm_name, slot = self.released_slots.get(
+                    block=ring is not None, timeout=RELEASED_SLOT_POLL_S if ring is not None else None
+                )
+            except queue.Empty:
+                if ring is None:
+                    return
+                # The slots held by a dead process are never released.
+                dead = [p for p in self.processes if not p.is_alive()]
+                if dead:
+                    raise RuntimeError(
+                        f"{len(dead)} image writer process(es) died (exit codes: "
+                        f"{[p.exitcode for p in dead]}), the frames in flight can't be written."
+                    ) from None
+                continue
+            rings_by_name[shm_name].release(slot)
+
     def wait_until_done(self):
         self.queue.join()
 
@@ -174,5 +388,10 @@ class AsyncImageWriter:
                     p.terminate()
             self.queue.close()
             self.queue.join_thread()
+            self.released_slots.close()
+            self.released_slots.join_thread()
+            for ring in self.rings.values():
+                ring.close()
+            self.rings = {}
 
         self._stopped = True
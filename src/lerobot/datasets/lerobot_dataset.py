@@ -13,35 +13,70 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import bisect
 import contextlib
 import copy
+import hashlib
+import json
 import logging
+import os
 import shutil
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import datasets
 import numpy as np
 import packaging.version
 import PIL.Image
+import pyarrow.parquet as pq
 import torch
 import torch.utils
 from datasets import concatenate_datasets, load_dataset
+from filelock import FileLock, Timeout
 from huggingface_hub import HfApi, snapshot_download
 from huggingface_hub.constants import REPOCARD_NAME
 from huggingface_hub.errors import RevisionNotFoundError
 
 from lerobot.constants import HF_LEROBOT_HOME
-from lerobot.datasets.compute_stats import aggregate_stats, compute_episode_stats
-from lerobot.datasets.image_writer import AsyncImageWriter, write_image
+from lerobot.datasets.compute_stats import (
+    aggregate_stats,
+    auto_downsample_height_width,
+    compute_episode_stats,
+    get_running_episode_stats,
+    get_running_stats,
+)
+from lerobot.datasets.episode_finalizer import (
+    EpisodeFinalizer,
+    finalize_episode,
+    load_episode_snapshot,
+    write_episode_snapshot,
+)
+from lerobot.datasets.frame_store import VideoFrameStore
+from lerobot.datasets.frame_table import FrameTable
+from lerobot.datasets.image_writer import (
+    AsyncImageWriter,
+    FrameFormat,
+    image_array_to_uint8_hwc,
+    write_image,
+)
 from lerobot.datasets.utils import (
     DEFAULT_FEATURES,
+    DEFAULT_FRAME_STORE_PATH,
+    DEFAULT_FRAME_TABLE_PATH,
     DEFAULT_IMAGE_PATH,
+    DEFAULT_MERGED_STATS_PATH,
+    DEFAULT_PENDING_EPISODE_PATH,
+    EPISODES_PATH,
+    EPISODES_STATS_PATH,
     INFO_PATH,
+    RECORDING_LOCK_PATH,
+    STATS_PATH,
     TASKS_PATH,
     _validate_feature_names,
     append_jsonlines,
     backward_compatible_episodes_stats,
+    cast_stats_to_numpy,
     check_delta_timestamps,
     check_timestamps_sync,
     check_version_compatibility,
@@ -57,8 +92,12 @@ from lerobot.datasets.utils import (
     load_episodes,
     load_episodes_stats,
     load_info,
+    load_json,
+    load_last_episode,
     load_stats,
     load_tasks,
+    remove_uncommitted_episodes,
+    serialize_dict,
     validate_episode_buffer,
     validate_frame,
     write_episode,
@@ -67,9 +106,12 @@ from lerobot.datasets.utils import (
     write_json,
 )
 from lerobot.datasets.video_utils import (
+    StreamingVideoEncoder,
+    VideoDecoderCache,
+    VideoEncodingJob,
     VideoFrame,
     decode_video_frames,
-    encode_video_frames,
+    encode_videos,
     get_safe_default_codec,
     get_video_info,
 )
@@ -106,12 +148,47 @@ class LeRobotDatasetMetadata:
         check_version_compatibility(self.repo_id, self._version, CODEBASE_VERSION)
         self.tasks, self.task_to_task_index = load_tasks(self.root)
         self.episodes = load_episodes(self.root)
+        episodes_stats_path = self.root / EPISODES_STATS_PATH
+        if self._version >= packaging.version.parse("v2.1") and not episodes_stats_path.is_file():
+            raise FileNotFoundError(episodes_stats_path)
+        # Parsing and aggregating the stats of every episode is slow on large datasets, so it is deferred to
+        # the first access of `episodes_stats` or `stats`.
+        self._episodes_stats, self._stats = None, None
+
+    def _load_stats(self) -> None:
+        """Loads the stats that have not been loaded or set yet."""
         if self._version < packaging.version.parse("v2.1"):
-            self.stats = load_stats(self.root)
-            self.episodes_stats = backward_compatible_episodes_stats(self.stats, self.episodes)
+            stats = load_stats(self.root)
+            episodes_stats = backward_compatible_episodes_stats(stats, self.episodes)
         else:
-            self.episodes_stats = load_episodes_stats(self.root)
-            self.stats = aggregate_stats(list(self.episodes_stats.values()))
+            episodes_stats = load_episodes_stats(self.root)
+            stats = aggregate_stats(list(episodes_stats.values()))
+        if self._episodes_stats is None:
+            self._episodes_stats = episodes_stats
+        if self._stats is None:
+            self._stats = stats
+
+    @property
+    def episodes_stats(self) -> dict[int, dict]:
+        """Stats of each episode, indexed by episode index."""
+        if self._episodes_stats is None:
+            self._load_stats()
+        return self._episodes_stats
+
+    @episodes_stats.setter
+    def episodes_stats(self, episodes_stats: dict[int, dict]) -> None:
+        self._episodes_stats = episodes_stats
+
+    @property
+    def stats(self) -> dict[str, dict]:
+        """Stats of the whole dataset."""
+        if self._stats is None:
+            self._load_stats()
+        return self._stats
+
+    @stats.setter
+    def stats(self, stats: dict[str, dict]) -> None:
+        self._stats = stats
 
     def pull_from_repo(
         self,
@@ -262,8 +339,6 @@ class LeRobotDatasetMetadata:
         self.info["splits"] = {"train": f"0:{self.info['total_episodes']}"}
         self.info["total_videos"] += len(self.video_keys)
 
-        write_info(self.info, self.root)
-
         episode_dict = {
             "episode_index": episode_index,
             "tasks": episode_tasks,
@@ -272,10 +347,16 @@ class LeRobotDatasetMetadata:
         self.episodes[episode_index] = episode_dict
         write_episode(episode_dict, self.root)
 
-        self.episodes_stats[episode_index] = episode_stats
-        self.stats = aggregate_stats([self.stats, episode_stats]) if self.stats else episode_stats
+        # Stats which are not loaded yet will be read from the stats files, which then include this episode.
+        if self._episodes_stats is not None:
+            self._episodes_stats[episode_index] = episode_stats
+        if self._stats is not None:
+            self._stats = aggregate_stats([self._stats, episode_stats]) if self._stats else episode_stats
         write_episode_stats(episode_index, episode_stats, self.root)
 
+        # Written last, since it marks the episode as committed (see `open_for_append`)
+        write_info(self.info, self.root)
+
     def update_video_info(self) -> None:
         """
         Warning: this function writes info from first episode videos, implicitly assuming that all videos have
@@ -327,6 +408,40 @@ class LeRobotDatasetMetadata:
         obj.revision = None
         return obj
 
+    @classmethod
+    def open_for_append(cls, repo_id: str, root: str | Path | None = None) -> "LeRobotDatasetMetadata":
+        """Loads the metadata of a local dataset in order to record more episodes in it.
+
+        Only the info, the tasks and the last episode are loaded, so that it takes the same time whatever the
+        size of the dataset. `episodes` only contains the last episode and the episodes added afterwards, and
+        the stats are loaded from disk on their first access, like in the default constructor.
+        """
+        obj = cls.__new__(cls)
+        obj.repo_id = repo_id
+        obj.root = Path(root) if root is not None else HF_LEROBOT_HOME / repo_id
+        obj.revision = None
+
+        obj.info = load_info(obj.root)
+        check_version_compatibility(obj.repo_id, obj._version, CODEBASE_VERSION)
+        if obj._version < packaging.version.parse("v2.1"):
+            raise ValueError(
+                f"Episodes can only be appended to datasets of version v2.1 or later, got {obj._version}."
+            )
+        # Roll back the episode whose save was interrupted before being committed
+        remove_uncommitted_episodes(obj.root, obj.total_episodes)
+        obj.tasks, obj.task_to_task_index = load_tasks(obj.root)
+        obj.episodes = load_last_episode(obj.root)
+        obj._episodes_stats, obj._stats = None, None
+
+        last_episode_index = max(obj.episodes, default=-1)
+        if last_episode_index != obj.total_episodes - 1:
+            raise ValueError(
+                f"The last episode of '{obj.root / EPISODES_PATH}' is {last_episode_index} but "
+                f"'{obj.root / INFO_PATH}' has {obj.total_episodes} episodes. Load the dataset with "
+                "`LeRobotDataset` to check it."
+            )
+        return obj
+
 
 class LeRobotDataset(torch.utils.data.Dataset):
     def __init__(
@@ -342,6 +457,13 @@ class LeRobotDataset(torch.utils.data.Dataset):
         download_videos: bool = True,
         video_backend: str | None = None,
         batch_encoding_size: int = 1,
+        use_frame_table: bool = False,
+        frame_table_mmap: bool = False,
+        video_decoder_cache_size: int = 0,
+        use_frame_store: bool = False,
+        streaming_encoding: bool = False,
+        online_stats: bool = False,
+        frame_format: FrameFormat | None = None,
     ):
         """
         2 modes are available for instantiating this class, depending on 2 different use cases:
@@ -445,6 +567,29 @@ class LeRobotDataset(torch.utils.data.Dataset):
                 You can also use the 'pyav' decoder used by Torchvision, which used to be the default option, or 'video_reader' which is another decoder of Torchvision.
             batch_encoding_size (int, optional): Number of episodes to accumulate before batch encoding videos.
                 Set to 1 for immediate encoding (default), or higher for batched encoding. Defaults to 1.
+            use_frame_table (bool, optional): Load all non-visual columns (state, action, timestamp, etc.) into
+                contiguous arrays once, so that `delta_timestamps` queries are served with a single gather
+                instead of a `hf_dataset.select`. Defaults to False.
+            frame_table_mmap (bool, optional): When using the frame table, store it on disk under
+                'root/cache/frame_table' and memory-map it, so that it is shared by all the dataloader workers
+                instead of being copied in each of them. Defaults to False.
+            video_decoder_cache_size (int, optional): Number of video decoders kept open by each process, so that
+                the video files are not re-opened for every sample. Only used with the 'torchcodec' backend.
+                Defaults to 0, which opens a new decoder for every query.
+            use_frame_store (bool, optional): Read video frames from the pre-decoded uint8 frame store in
+                'root/cache/frames' instead of decoding the videos. The store must have been built beforehand
+                with `lerobot/scripts/decode_dataset_videos.py`, otherwise a FileNotFoundError is raised.
+                Defaults to False.
+            streaming_encoding (bool, optional): When recording, encode the frames of the video keys while they
+                are added with `add_frame` instead of writing them as temporary PNG files and encoding them in
+                `save_episode`. Incompatible with `batch_encoding_size` > 1, which is then ignored. Defaults to
+                False.
+            online_stats (bool, optional): When recording, accumulate the episode stats in `add_frame`, from a
+                downsampled copy of every image, instead of computing them in `save_episode` from a subset of the
+                images read back from disk. Defaults to False.
+            frame_format (FrameFormat | None, optional): When recording, format of the temporary frames of the
+                video keys written before being encoded (e.g. faster JPEG or raw `.npy` frames instead of PNG).
+                The frames of the image keys are always written as PNG. Defaults to PNG.
         """
         super().__init__()
         self.repo_id = repo_id
@@ -458,6 +603,22 @@ class LeRobotDataset(torch.utils.data.Dataset):
         self.delta_indices = None
         self.batch_encoding_size = batch_encoding_size
         self.episodes_since_last_encoding = 0
+        self.use_frame_table = use_frame_table
+        self.frame_table_mmap = frame_table_mmap
+        self.frame_table = None
+        self.video_decoder_cache = (
+            VideoDecoderCache(video_decoder_cache_size) if video_decoder_cache_size > 0 else None
+        )
+        self.use_frame_store = use_frame_store
+        self.frame_store = None
+        self.streaming_encoding = streaming_encoding
+        self.video_encoders = {}
+        self.episode_finalizer = None
+        self._recording_lock = None
+        self._file_manifest = None
+        self.online_stats = online_stats
+        self.running_stats = {}
+        self.frame_format = frame_format if frame_format is not None else FrameFormat()
 
         # Unused attributes
         self.image_writer = None
@@ -469,6 +630,7 @@ class LeRobotDataset(torch.utils.data.Dataset):
         self.meta = LeRobotDatasetMetadata(
             self.repo_id, self.root, self.revision, force_cache_sync=force_cache_sync
         )
+
         if self.episodes is not None and self.meta._version >= packaging.version.parse("v2.1"):
             episodes_stats = [self.meta.episodes_stats[ep_idx] for ep_idx in self.episodes]
             self.stats = aggregate_stats(episodes_stats)
@@ -484,6 +646,12 @@ class LeRobotDataset(torch.utils.data.Dataset):
             self.download_episodes(download_videos)
             self.hf_dataset = self.load_hf_dataset()
 
+        if self.use_frame_table:
+            self.frame_table = self.load_frame_table()
+
+        if self.use_frame_store and len(self.meta.video_keys) > 0:
+            self.frame_store = self.load_frame_store()
+
         self.episode_data_index = get_episode_data_index(self.meta.episodes, self.episodes)
 
         # Check timestamps
@@ -509,7 +677,9 @@ class LeRobotDataset(torch.utils.data.Dataset):
         upload_large_folder: bool = False,
         **card_kwargs,
     ) -> None:
-        ignore_patterns = ["images/"]
+        # Timings of the recording loop and caches (frame table, frame store, pending episodes) are only useful
+        # locally
+        ignore_patterns = ["images/", "timings/", "cache/"]
         if not push_videos:
             ignore_patterns.append("videos/")
 
@@ -597,17 +767,59 @@ class LeRobotDataset(torch.utils.data.Dataset):
 
     def load_hf_dataset(self) -> datasets.Dataset:
         """hf_dataset contains all the observations, states, actions, rewards, etc."""
-        if self.episodes is None:
+        episodes = self.episodes
+        pending_dir = (self.root / DEFAULT_PENDING_EPISODE_PATH).parent
+        if episodes is None and any(pending_dir.glob("episode_*.pkl")):
+            # The data files of the pending episodes may be written already, but they are not committed yet.
+            episodes = list(range(self.meta.total_episodes))
+
+        if episodes is None:
             path = str(self.root / "data")
             hf_dataset = load_dataset("parquet", data_dir=path, split="train")
         else:
-            files = [str(self.root / self.meta.get_data_file_path(ep_idx)) for ep_idx in self.episodes]
+            files = [str(self.root / self.meta.get_data_file_path(ep_idx)) for ep_idx in episodes]
             hf_dataset = load_dataset("parquet", data_files=files, split="train")
 
         # TODO(aliberts): hf_dataset.set_format("torch")
         hf_dataset.set_transform(hf_transform_to_torch)
         return hf_dataset
 
+    def load_frame_table(self) -> FrameTable:
+        """frame_table contains the non-visual columns of hf_dataset as contiguous arrays."""
+        mmap_dir = None
+        if self.frame_table_mmap:
+            selection = (
+                "all" if self.episodes is None else hashlib.sha1(str(self.episodes).encode()).hexdigest()
+            )
+            mmap_dir = self.root / DEFAULT_FRAME_TABLE_PATH.format(selection=selection)
+        return FrameTable.from_hf_dataset(self.hf_dataset, mmap_dir=mmap_dir)
+
+    def load_frame_store(self) -> VideoFrameStore:
+        """frame_store contains the frames of the video keys, decoded once and stored as uint8 arrays."""
+        frame_store = VideoFrameStore(self.root / DEFAULT_FRAME_STORE_PATH)
+        episodes = self.episodes if self.episodes is not None else list(self.meta.episodes)
+        missing_episodes = sorted(set(episodes) - frame_store.episodes)
+        if missing_episodes:
+            # Decoding is not done implicitly, since the processes instantiating the dataset (e.g. the ranks of a
+            # distributed training) would all write the same store concurrently
+            raise FileNotFoundError(
+                f"Episodes {missing_episodes} of {self.repo_id} are missing from the frame store in "
+                f"'{frame_store.root}'. Build it first with `python -m lerobot.scripts.decode_dataset_videos "
+                f"--repo-id {self.repo_id} --root {self.root}`."
+            )
+        if frame_store.resolution is not None:
+            # The policies are built from the shapes of the features, which must match the resized frames. `info`
+            # is copied so that the shapes of the videos are only changed in memory (see `save_episode`).
+            self.meta.info = copy.deepcopy(self.meta.info)
+            height, width = frame_store.resolution
+            for key in self.meta.video_keys:
+                ft = self.meta.features[key]
+                shape = list(ft["shape"])
+                shape[ft["names"].index("height")] = height
+                shape[ft["names"].index("width")] = width
+                ft["shape"] = tuple(shape)
+        return frame_store
+
     def create_hf_dataset(self) -> datasets.Dataset:
         features = get_hf_features_from_features(self.features)
         ft_dict = {col: [] for col in features}
@@ -622,10 +834,56 @@ class LeRobotDataset(torch.utils.data.Dataset):
         """Frames per second used during data collection."""
         return self.meta.fps
 
+    @property
+    def hf_dataset(self) -> datasets.Dataset:
+        """hf_dataset contains all the observations, states, actions, rewards, etc.
+
+        The tables of the episodes saved while recording are only concatenated to it when it is accessed, so that
+        saving an episode doesn't copy the tables of all the previous ones.
+        """
+        if self._episode_datasets:
+            hf_dataset = concatenate_datasets([self._hf_dataset, *self._episode_datasets])
+            hf_dataset.set_transform(hf_transform_to_torch)
+            self.hf_dataset = hf_dataset
+        return self._hf_dataset
+
+    @hf_dataset.setter
+    def hf_dataset(self, hf_dataset: datasets.Dataset | None) -> None:
+        self._hf_dataset = hf_dataset
+        self._episode_datasets = []
+
+    def _append_episode_dataset(self, ep_dataset: datasets.Dataset) -> None:
+        if self._hf_dataset is None:
+            # Write-only dataset (see `open_for_append`)
+            return
+        self._episode_datasets.append(ep_dataset)
+        # The frame table is a snapshot of hf_dataset, queries fall back to hf_dataset until it is reloaded.
+        self.frame_table = None
+
+    @property
+    def file_manifest(self) -> dict[str, set[Path]]:
+        """Data and video files of the dataset, which are listed from the metadata the first time and then
+        updated as they are written, so that checking them doesn't require scanning the dataset directory."""
+        if self._file_manifest is None:
+            self._file_manifest = {"data": set(), "videos": set()}
+            for ep_idx in self.meta.episodes:
+                self._add_to_file_manifest("data", self.root / self.meta.get_data_file_path(ep_idx))
+                for key in self.meta.video_keys:
+                    self._add_to_file_manifest(
+                        "videos", self.root / self.meta.get_video_file_path(ep_idx, key)
+                    )
+        return self._file_manifest
+
+    def _add_to_file_manifest(self, kind: str, path: Path) -> None:
+        if path.is_file():
+            self.file_manifest[kind].add(path)
+
     @property
     def num_frames(self) -> int:
         """Number of frames in selected episodes."""
-        return len(self.hf_dataset) if self.hf_dataset is not None else self.meta.total_frames
+        if self._hf_dataset is None:
+            return self.meta.total_frames
+        return len(self._hf_dataset) + sum(len(ep_dataset) for ep_dataset in self._episode_datasets)
 
     @property
     def num_episodes(self) -> int:
@@ -639,8 +897,8 @@ class LeRobotDataset(torch.utils.data.Dataset):
     @property
     def hf_features(self) -> datasets.Features:
         """Features of the hf_dataset."""
-        if self.hf_dataset is not None:
-            return self.hf_dataset.features
+        if self._hf_dataset is not None:
+            return self._hf_dataset.features
         else:
             return get_hf_features_from_features(self.features)
 
@@ -659,6 +917,20 @@ class LeRobotDataset(torch.utils.data.Dataset):
         }
         return query_indices, padding
 
+    def _get_query_indices_batch(
+        self, indices: np.ndarray, ep_indices: np.ndarray
+    ) -> tuple[dict[str, np.ndarray], dict[str, torch.Tensor]]:
+        """Batched version of `_get_query_indices`, computed for all (B, T) queries at once."""
+        ep_start = self.episode_data_index["from"].numpy()[ep_indices][:, None]
+        ep_end = self.episode_data_index["to"].numpy()[ep_indices][:, None]
+        query_indices = {}
+        padding = {}
+        for key, delta_idx in self.delta_indices.items():
+            unclipped = indices[:, None] + np.asarray(delta_idx)[None, :]
+            query_indices[key] = np.clip(unclipped, ep_start, ep_end - 1)
+            padding[f"{key}_is_pad"] = torch.from_numpy((unclipped < ep_start) | (unclipped >= ep_end))
+        return query_indices, padding
+
     def _get_query_timestamps(
         self,
         current_ts: float,
@@ -667,16 +939,39 @@ class LeRobotDataset(torch.utils.data.Dataset):
         query_timestamps = {}
         for key in self.meta.video_keys:
             if query_indices is not None and key in query_indices:
-                timestamps = self.hf_dataset.select(query_indices[key])["timestamp"]
-                query_timestamps[key] = torch.stack(timestamps).tolist()
+                if self.frame_table is not None:
+                    timestamps = self.frame_table.gather("timestamp", query_indices[key])
+                else:
+                    timestamps = torch.stack(self.hf_dataset.select(query_indices[key])["timestamp"])
+                query_timestamps[key] = timestamps.tolist()
             else:
                 query_timestamps[key] = [current_ts]
 
         return query_timestamps
 
     def _query_hf_dataset(self, query_indices: dict[str, list[int]]) -> dict:
+        result = {}
+        for key, q_idx in query_indices.items():
+            if key in self.meta.video_keys:
+                continue
+            if self.frame_table is not None and key in self.frame_table:
+                result[key] = self.frame_table.gather(key, q_idx)
+            else:
+                result[key] = torch.stack(self.hf_dataset.select(q_idx)[key])
+        return result
+
+    def _gather_column(self, key: str, indices: np.ndarray) -> torch.Tensor:
+        """Gathers the rows of column 'key' at 'indices' (of any shape) with a single lookup."""
+        flat_indices = indices.reshape(-1)
+        if self.frame_table is not None and key in self.frame_table:
+            values = self.frame_table.gather(key, flat_indices)
+        else:
+            values = torch.stack(self.hf_dataset.select(flat_indices)[key])
+        return values.reshape(*indices.shape, *values.shape[1:])
+
+    def _query_hf_dataset_batch(self, query_indices: dict[str, np.ndarray]) -> dict[str, torch.Tensor]:
         return {
-            key: torch.stack(self.hf_dataset.select(q_idx)[key])
+            key: self._gather_column(key, q_idx)
             for key, q_idx in query_indices.items()
             if key not in self.meta.video_keys
         }
@@ -689,12 +984,54 @@ class LeRobotDataset(torch.utils.data.Dataset):
         """
         item = {}
         for vid_key, query_ts in query_timestamps.items():
+            if self.frame_store is not None:
+                frames = self.frame_store.query(vid_key, ep_idx, query_ts, self.tolerance_s)
+                item[vid_key] = frames.squeeze(0)
+                continue
             video_path = self.root / self.meta.get_video_file_path(ep_idx, vid_key)
-            frames = decode_video_frames(video_path, query_ts, self.tolerance_s, self.video_backend)
+            frames = decode_video_frames(
+                video_path, query_ts, self.tolerance_s, self.video_backend, self.video_decoder_cache
+            )
             item[vid_key] = frames.squeeze(0)
 
         return item
 
+    def _query_videos_batch(
+        self, query_timestamps: dict[str, list[list[float]]], ep_indices: np.ndarray
+    ) -> dict[str, list[torch.Tensor]]:
+        """Batched version of `_query_videos`.
+
+        With the frame store or the torchcodec backend, which seek to each frame, the frames of all the samples
+        of an episode are queried at once per (episode, camera) video file. The other backends decode every frame
+        between the first and the last timestamps, so their samples are still decoded one by one, as far apart
+        as they may be in the episode.
+        """
+        group_by_episode = self.frame_store is not None or self.video_backend == "torchcodec"
+        items = {}
+        for vid_key, batch_ts in query_timestamps.items():
+            items[vid_key] = [None] * len(ep_indices)
+            for ep_idx in np.unique(ep_indices):
+                samples = np.flatnonzero(ep_indices == ep_idx)
+                groups = [samples] if group_by_episode else [[i] for i in samples]
+                for group in groups:
+                    timestamps = [ts for i in group for ts in batch_ts[i]]
+                    if self.frame_store is not None:
+                        frames = self.frame_store.query(vid_key, int(ep_idx), timestamps, self.tolerance_s)
+                    else:
+                        video_path = self.root / self.meta.get_video_file_path(int(ep_idx), vid_key)
+                        frames = decode_video_frames(
+                            video_path,
+                            timestamps,
+                            self.tolerance_s,
+                            self.video_backend,
+                            self.video_decoder_cache,
+                        )
+                    split_sizes = [len(batch_ts[i]) for i in group]
+                    for i, sample_frames in zip(group, frames.split(split_sizes), strict=True):
+                        items[vid_key][i] = sample_frames.squeeze(0)
+
+        return items
+
     def _add_padding_keys(self, item: dict, padding: dict[str, list[bool]]) -> dict:
         for key, val in padding.items():
             item[key] = torch.BoolTensor(val)
@@ -732,6 +1069,47 @@ class LeRobotDataset(torch.utils.data.Dataset):
 
         return item
 
+    def __getitems__(self, indices: list[int]) -> list[dict]:
+        """Batched version of `__getitem__`, called by the DataLoader with all the indices of a batch.
+
+        Instead of one lookup per sample, the padding of `delta_timestamps` queries is computed for the
+        whole batch at once, each column is gathered with a single lookup and video frames are decoded once
+        per (episode, camera) file.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        batch = self.hf_dataset[indices.tolist()]
+        items = [{key: values[i] for key, values in batch.items()} for i in range(len(indices))]
+        ep_indices = torch.stack(batch["episode_index"]).numpy()
+
+        query_indices = None
+        if self.delta_indices is not None:
+            query_indices, padding = self._get_query_indices_batch(indices, ep_indices)
+            query_result = self._query_hf_dataset_batch(query_indices)
+            for i, item in enumerate(items):
+                item.update({key: val[i] for key, val in padding.items()})
+                item.update({key: val[i] for key, val in query_result.items()})
+
+        if len(self.meta.video_keys) > 0:
+            query_timestamps = {}
+            for key in self.meta.video_keys:
+                if query_indices is not None and key in query_indices:
+                    query_timestamps[key] = self._gather_column("timestamp", query_indices[key]).tolist()
+                else:
+                    query_timestamps[key] = [[item["timestamp"].item()] for item in items]
+            video_frames = self._query_videos_batch(query_timestamps, ep_indices)
+            for i, item in enumerate(items):
+                items[i] = {**{key: frames[i] for key, frames in video_frames.items()}, **item}
+
+        for item in items:
+            if self.image_transforms is not None:
+                for cam in self.meta.camera_keys:
+                    item[cam] = self.image_transforms(item[cam])
+
+            # Add task as a string
+            item["task"] = self.meta.tasks[item["task_index"].item()]
+
+        return items
+
     def __repr__(self):
         feature_keys = list(self.features)
         return (
@@ -743,8 +1121,14 @@ class LeRobotDataset(torch.utils.data.Dataset):
             "})',\n"
         )
 
+    @property
+    def num_pending_episodes(self) -> int:
+        """Number of saved episodes being finalized in the background, which are not in the metadata yet."""
+        return self.episode_finalizer.backlog if self.episode_finalizer is not None else 0
+
     def create_episode_buffer(self, episode_index: int | None = None) -> dict:
-        current_ep_idx = self.meta.total_episodes if episode_index is None else episode_index
+        next_ep_idx = self.meta.total_episodes + self.num_pending_episodes
+        current_ep_idx = next_ep_idx if episode_index is None else episode_index
         ep_buffer = {}
         # size and task are special cases that are not in self.features
         ep_buffer["size"] = 0
@@ -754,16 +1138,18 @@ class LeRobotDataset(torch.utils.data.Dataset):
         return ep_buffer
 
     def _get_image_file_path(self, episode_index: int, image_key: str, frame_index: int) -> Path:
-        fpath = DEFAULT_IMAGE_PATH.format(
+        fpath = self.root / DEFAULT_IMAGE_PATH.format(
             image_key=image_key, episode_index=episode_index, frame_index=frame_index
         )
-        return self.root / fpath
+        if image_key in self.meta.video_keys:
+            fpath = fpath.with_suffix(self.frame_format.suffix)
+        return fpath
 
     def _save_image(self, image: torch.Tensor | np.ndarray | PIL.Image.Image, fpath: Path) -> None:
         if self.image_writer is None:
             if isinstance(image, torch.Tensor):
                 image = image.cpu().numpy()
-            write_image(image, fpath)
+            write_image(image, fpath, self.frame_format)
         else:
             self.image_writer.save_image(image=image, fpath=fpath)
 
@@ -798,7 +1184,9 @@ class LeRobotDataset(torch.utils.data.Dataset):
                     f"An element of the frame is not in the features. '{key}' not in '{self.features.keys()}'."
                 )
 
-            if self.features[key]["dtype"] in ["image", "video"]:
+            if self.features[key]["dtype"] == "video" and self.streaming_encoding:
+                self._add_video_frame(key, frame[key])
+            elif self.features[key]["dtype"] in ["image", "video"]:
                 img_path = self._get_image_file_path(
                     episode_index=self.episode_buffer["episode_index"], image_key=key, frame_index=frame_index
                 )
@@ -809,8 +1197,54 @@ class LeRobotDataset(torch.utils.data.Dataset):
             else:
                 self.episode_buffer[key].append(frame[key])
 
+        if self.online_stats:
+            self._update_running_stats(frame, frame_index, timestamp)
+
         self.episode_buffer["size"] += 1
 
+    def _update_running_stats(self, frame: dict, frame_index: int, timestamp: float) -> None:
+        if not self.running_stats:
+            self.running_stats = get_running_stats(self.features)
+        values = {**frame, "frame_index": frame_index, "timestamp": timestamp}
+        for key, stats in self.running_stats.items():
+            value = values[key]
+            if self.features[key]["dtype"] in ["image", "video"]:
+                value = auto_downsample_height_width(_image_to_uint8_hwc(value).transpose(2, 0, 1))
+            stats.update(value)
+
+    def _compute_episode_stats(self, episode_buffer: dict) -> dict:
+        ep_stats = get_running_episode_stats(self.running_stats, self.features)
+        missing_data = {key: data for key, data in episode_buffer.items() if key not in ep_stats}
+        ep_stats.update(compute_episode_stats(missing_data, self.features))
+        return {key: ep_stats[key] for key in episode_buffer if key in ep_stats}
+
+    def _add_video_frame(self, key: str, image: np.ndarray | PIL.Image.Image) -> None:
+        if key not in self.video_encoders:
+            video_path = self.root / self.meta.get_video_file_path(self.episode_buffer["episode_index"], key)
+            # The encoder keeps frames to compute the episode stats, unless they are accumulated in `add_frame`
+            max_sampled_frames = 0 if self.online_stats else 1000
+            self.video_encoders[key] = StreamingVideoEncoder(
+                video_path, self.fps, max_sampled_frames=max_sampled_frames
+            )
+        self.video_encoders[key].add_frame(_image_to_uint8_hwc(image))
+
+    def _finish_video_encoders(self, episode_buffer: dict) -> None:
+        """Finalizes the videos of the episode and replaces their frames in 'episode_buffer' by the frames
+        sampled by the encoders, which are used to compute the episode stats."""
+        try:
+            for key, encoder in self.video_encoders.items():
+                self._add_to_file_manifest("videos", encoder.finish())
+                episode_buffer[key] = encoder.sampled_frames
+        except Exception:
+            self._abort_video_encoders()
+            raise
+        self.video_encoders = {}
+
+    def _abort_video_encoders(self) -> None:
+        for encoder in self.video_encoders.values():
+            encoder.abort()
+        self.video_encoders = {}
+
     def save_episode(self, episode_data: dict | None = None) -> None:
         """
         This will save to disk the current episode in self.episode_buffer.
@@ -818,16 +1252,27 @@ class LeRobotDataset(torch.utils.data.Dataset):
         Video encoding is handled automatically based on batch_encoding_size:
         - If batch_encoding_size == 1: Videos are encoded immediately after each episode
         - If batch_encoding_size > 1: Videos are encoded in batches.
+        - If streaming_encoding is True: Videos are encoded while the frames are added, and are only finalized.
+
+        When an episode finalizer is started (see `start_episode_finalizer`), the episode is only snapshotted and
+        its parquet file, stats and videos are written in the background.
 
         Args:
             episode_data (dict | None, optional): Dict containing the episode data to save. If None, this will
                 save the current episode in self.episode_buffer, which is filled with 'add_frame'. Defaults to
                 None.
         """
+        if self.frame_store is not None and self.frame_store.resolution is not None:
+            raise RuntimeError(
+                "Episodes can't be saved to a dataset read from a resized frame store, since the shapes of its "
+                "video features were changed to the resolution of the store."
+            )
         if not episode_data:
             episode_buffer = self.episode_buffer
 
-        validate_episode_buffer(episode_buffer, self.meta.total_episodes, self.features)
+        validate_episode_buffer(
+            episode_buffer, self.meta.total_episodes + self.num_pending_episodes, self.features
+        )
 
         # size and task are special cases that won't be added to hf_dataset
         episode_length = episode_buffer.pop("size")
@@ -835,7 +1280,10 @@ class LeRobotDataset(torch.utils.data.Dataset):
         episode_tasks = list(set(tasks))
         episode_index = episode_buffer["episode_index"]
 
-        episode_buffer["index"] = np.arange(self.meta.total_frames, self.meta.total_frames + episode_length)
+        start_index = self.meta.total_frames
+        if self.episode_finalizer is not None:
+            start_index += self.episode_finalizer.num_pending_frames
+        episode_buffer["index"] = np.arange(start_index, start_index + episode_length)
         episode_buffer["episode_index"] = np.full((episode_length,), episode_index)
 
         # Add new tasks to the tasks dictionary
@@ -855,11 +1303,21 @@ class LeRobotDataset(torch.utils.data.Dataset):
             episode_buffer[key] = np.stack(episode_buffer[key])
 
         self._wait_image_writer()
+        self._finish_video_encoders(episode_buffer)
+
+        if self.episode_finalizer is not None:
+            self._submit_episode(episode_buffer, episode_index, episode_length, episode_tasks)
+            self.running_stats = {}
+            if not episode_data:  # Reset the buffer
+                self.episode_buffer = self.create_episode_buffer()
+            return
+
         self._save_episode_table(episode_buffer, episode_index)
-        ep_stats = compute_episode_stats(episode_buffer, self.features)
+        ep_stats = self._compute_episode_stats(episode_buffer)
+        self.running_stats = {}
 
         has_video_keys = len(self.meta.video_keys) > 0
-        use_batched_encoding = self.batch_encoding_size > 1
+        use_batched_encoding = self.batch_encoding_size > 1 and not self.streaming_encoding
 
         if has_video_keys and not use_batched_encoding:
             self.encode_episode_videos(episode_index)
@@ -880,40 +1338,155 @@ class LeRobotDataset(torch.utils.data.Dataset):
                 self.episodes_since_last_encoding = 0
 
         # Episode data index and timestamp checking
-        ep_data_index = get_episode_data_index(self.meta.episodes, [episode_index])
-        ep_data_index_np = {k: t.numpy() for k, t in ep_data_index.items()}
         check_timestamps_sync(
             episode_buffer["timestamp"],
             episode_buffer["episode_index"],
-            ep_data_index_np,
+            {"from": np.array([0]), "to": np.array([episode_length])},
             self.fps,
             self.tolerance_s,
         )
 
         # Verify that we have one parquet file per episode and the number of video files matches the number of encoded episodes
-        parquet_files = list(self.root.rglob("*.parquet"))
-        assert len(parquet_files) == self.num_episodes
-        video_files = list(self.root.rglob("*.mp4"))
-        assert len(video_files) == (self.num_episodes - self.episodes_since_last_encoding) * len(
-            self.meta.video_keys
-        )
+        # (only the episodes of the metadata are checked, i.e. the last ones when opened with `open_for_append`)
+        assert len(self.file_manifest["data"]) == len(self.meta.episodes)
+        assert len(self.file_manifest["videos"]) == (
+            len(self.meta.episodes) - self.episodes_since_last_encoding
+        ) * len(self.meta.video_keys)
 
         if not episode_data:  # Reset the buffer
             self.episode_buffer = self.create_episode_buffer()
 
+    def _get_finalize_kwargs(self, episode_index: int) -> dict:
+        return {
+            "root": self.root,
+            "features": self.features,
+            "fps": self.fps,
+            "tolerance_s": self.tolerance_s,
+            "data_path": self.meta.get_data_file_path(episode_index),
+            "video_paths": {
+                key: self.meta.get_video_file_path(episode_index, key) for key in self.meta.video_keys
+            },
+        }
+
+    def _submit_episode(
+        self, episode_buffer: dict, episode_index: int, episode_length: int, episode_tasks: list[str]
+    ) -> None:
+        # The frames sampled from the videos encoded while recording are not kept in the snapshot, only their stats.
+        streamed_keys = self.meta.video_keys if self.streaming_encoding else []
+        stats = get_running_episode_stats(self.running_stats, self.features)
+        stats.update(
+            compute_episode_stats(
+                {key: episode_buffer[key] for key in streamed_keys if key not in stats}, self.features
+            )
+        )
+        snapshot = {
+            "episode_index": episode_index,
+            "episode_length": episode_length,
+            "episode_tasks": episode_tasks,
+            "episode_buffer": {
+                key: value for key, value in episode_buffer.items() if key not in streamed_keys
+            },
+            "stats": stats,
+        }
+        snapshot_path = self.root / DEFAULT_PENDING_EPISODE_PATH.format(episode_index=episode_index)
+        write_episode_snapshot(snapshot, snapshot_path)
+        self.episode_finalizer.submit(snapshot, snapshot_path, **self._get_finalize_kwargs(episode_index))
+
+    def _commit_episode(self, episode: dict, ep_stats: dict) -> None:
+        """Adds an episode finalized by `finalize_episode` to the metadata and deletes its snapshot."""
+        episode_index = episode["episode_index"]
+        # Update video info (only needed when first episode is encoded since it reads from episode 0). Done
+        # before `meta.save_episode`, which writes the info of the dataset last.
+        if len(self.meta.video_keys) > 0 and episode_index == 0:
+            self.meta.update_video_info()
+        self.meta.save_episode(episode_index, episode["episode_length"], episode["episode_tasks"], ep_stats)
+
+        for key in self.meta.video_keys:
+            img_dir = self._get_image_file_path(
+                episode_index=episode_index, image_key=key, frame_index=0
+            ).parent
+            if img_dir.is_dir():
+                shutil.rmtree(img_dir)
+
+        self._add_to_file_manifest("data", self.root / self.meta.get_data_file_path(episode_index))
+        for key in self.meta.video_keys:
+            self._add_to_file_manifest(
+                "videos", self.root / self.meta.get_video_file_path(episode_index, key)
+            )
+
+        (self.root / DEFAULT_PENDING_EPISODE_PATH.format(episode_index=episode_index)).unlink()
+
+    def _on_episode_finalized(self, episode: dict, ep_stats: dict) -> None:
+        self._commit_episode(episode, ep_stats)
+        if self._hf_dataset is None:
+            # Write-only dataset (see `open_for_append`), the data of the episode is not read back
+            return
+        ep_data_path = self.root / self.meta.get_data_file_path(episode["episode_index"])
+        self._append_episode_dataset(datasets.Dataset(pq.read_table(ep_data_path)))
+
+    def _acquire_recording_lock(self) -> None:
+        """Takes the lock of the process recording in the dataset, which owns its pending episodes.
+
+        Readers of the dataset (e.g. training jobs) never take it, and leave the pending episodes alone.
+        """
+        if self._recording_lock is None:
+            lock_path = self.root / RECORDING_LOCK_PATH
+            lock_path.parent.mkdir(parents=True, exist_ok=True)
+            self._recording_lock = FileLock(lock_path)
+        try:
+            self._recording_lock.acquire(timeout=0)
+        except Timeout:
+            raise RuntimeError(
+                f"Another process is recording in '{self.root}', its pending episodes can't be finalized here."
+            ) from None
+
+    def _release_recording_lock(self) -> None:
+        if self._recording_lock is not None:
+            self._recording_lock.release()
+
+    def recover_pending_episodes(self) -> None:
+        """Finalizes the episodes saved with an episode finalizer which were not committed to the metadata
+        before the recording was interrupted, so that no recorded episode is lost.
+
+        Raises a RuntimeError if another process is recording in the dataset, since it may still be finalizing
+        them.
+        """
+        self._acquire_recording_lock()
+        try:
+            self._recover_pending_episodes()
+        finally:
+            self._release_recording_lock()
+
+    def _recover_pending_episodes(self) -> None:
+        pending_dir = (self.root / DEFAULT_PENDING_EPISODE_PATH).parent
+        for snapshot_path in sorted(pending_dir.glob("episode_*.pkl")):
+            snapshot = load_episode_snapshot(snapshot_path)
+            episode_index = snapshot["episode_index"]
+            if episode_index < self.meta.total_episodes:
+                # Committed right before the interruption
+                snapshot_path.unlink()
+                continue
+            logging.info(f"Finalizing episode {episode_index}, which was interrupted")
+            ep_stats = finalize_episode(snapshot_path, **self._get_finalize_kwargs(episode_index))
+            self._commit_episode(snapshot, ep_stats)
+
     def _save_episode_table(self, episode_buffer: dict, episode_index: int) -> None:
         episode_dict = {key: episode_buffer[key] for key in self.hf_features}
         ep_dataset = datasets.Dataset.from_dict(episode_dict, features=self.hf_features, split="train")
         ep_dataset = embed_images(ep_dataset)
-        self.hf_dataset = concatenate_datasets([self.hf_dataset, ep_dataset])
-        self.hf_dataset.set_transform(hf_transform_to_torch)
+        self._append_episode_dataset(ep_dataset)
         ep_data_path = self.root / self.meta.get_data_file_path(ep_index=episode_index)
         ep_data_path.parent.mkdir(parents=True, exist_ok=True)
         ep_dataset.to_parquet(ep_data_path)
+        self._add_to_file_manifest("data", ep_data_path)
 
     def clear_episode_buffer(self) -> None:
         episode_index = self.episode_buffer["episode_index"]
 
+        # Stop encoding the videos of the current episode
+        self._abort_video_encoders()
+        self.running_stats = {}
+
         # Clean up image files for the current episode buffer
         if self.image_writer is not None:
             for cam_key in self.meta.camera_keys:
@@ -935,6 +1508,7 @@ class LeRobotDataset(torch.utils.data.Dataset):
         self.image_writer = AsyncImageWriter(
             num_processes=num_processes,
             num_threads=num_threads,
+            frame_format=self.frame_format,
         )
 
     def stop_image_writer(self) -> None:
@@ -946,16 +1520,50 @@ class LeRobotDataset(torch.utils.data.Dataset):
             self.image_writer.stop()
             self.image_writer = None
 
+    def start_episode_finalizer(self, num_workers: int = 1, max_backlog: int = 2) -> None:
+        """Finalizes the episodes passed to `save_episode` in 'num_workers' background processes. `save_episode`
+        only blocks when more than 'max_backlog' episodes are waiting to be committed."""
+        if self.episode_finalizer is not None:
+            logging.warning("Stopping the current episode finalizer before starting a new one.")
+            self.stop_episode_finalizer()
+
+        # Held until the finalizer is stopped, so that no other process recovers the pending episodes meanwhile.
+        self._acquire_recording_lock()
+        self.episode_finalizer = EpisodeFinalizer(
+            self._on_episode_finalized, num_workers=num_workers, max_backlog=max_backlog
+        )
+
+    def stop_episode_finalizer(self) -> None:
+        """Waits for the episodes being finalized to be committed, then stops the worker processes."""
+        if self.episode_finalizer is not None:
+            episode_finalizer, self.episode_finalizer = self.episode_finalizer, None
+            try:
+                episode_finalizer.stop()
+            finally:
+                self._release_recording_lock()
+
     def _wait_image_writer(self) -> None:
         """Wait for asynchronous image writer to finish."""
         if self.image_writer is not None:
             self.image_writer.wait_until_done()
 
+    def _get_video_encoding_jobs(self, start_episode: int, end_episode: int) -> list[VideoEncodingJob]:
+        jobs = []
+        for ep_idx in range(start_episode, end_episode):
+            for key in self.meta.video_keys:
+                video_path = self.root / self.meta.get_video_file_path(ep_idx, key)
+                if video_path.is_file():
+                    # Skip if video is already encoded. Could be the case when resuming data recording.
+                    continue
+                img_dir = self._get_image_file_path(episode_index=ep_idx, image_key=key, frame_index=0).parent
+                jobs.append(VideoEncodingJob(img_dir, video_path, self.fps))
+        return jobs
+
     def encode_episode_videos(self, episode_index: int) -> None:
         """
-        Use ffmpeg to convert frames stored as png into mp4 videos.
-        Note: `encode_video_frames` is a blocking call. Making it asynchronous shouldn't speedup encoding,
-        since video encoding with ffmpeg is already using multithreading.
+        Use ffmpeg to convert the frames written on disk into mp4 videos.
+        The cameras are encoded concurrently in threads, since `encode_video_frames` mostly runs without the
+        GIL and a single encoder doesn't use all the cores.
 
         This method handles video encoding steps:
         - Video encoding via ffmpeg
@@ -965,39 +1573,48 @@ class LeRobotDataset(torch.utils.data.Dataset):
         Args:
             episode_index (int): Index of the episode to encode.
         """
-        for key in self.meta.video_keys:
-            video_path = self.root / self.meta.get_video_file_path(episode_index, key)
-            if video_path.is_file():
-                # Skip if video is already encoded. Could be the case when resuming data recording.
-                continue
-            img_dir = self._get_image_file_path(
-                episode_index=episode_index, image_key=key, frame_index=0
-            ).parent
-            encode_video_frames(img_dir, video_path, self.fps, overwrite=True)
-            shutil.rmtree(img_dir)
+        jobs = self._get_video_encoding_jobs(episode_index, episode_index + 1)
+        threads_per_job = max(1, (os.cpu_count() or 1) // max(len(jobs), 1))
+        for job in encode_videos(jobs, len(jobs), threads_per_job, use_processes=False):
+            shutil.rmtree(job.imgs_dir)
+            self._add_to_file_manifest("videos", job.video_path)
 
         # Update video info (only needed when first episode is encoded since it reads from episode 0)
         if len(self.meta.video_keys) > 0 and episode_index == 0:
             self.meta.update_video_info()
             write_info(self.meta.info, self.meta.root)  # ensure video info always written properly
 
-    def batch_encode_videos(self, start_episode: int = 0, end_episode: int | None = None) -> None:
+    def batch_encode_videos(
+        self,
+        start_episode: int = 0,
+        end_episode: int | None = None,
+        num_workers: int | None = None,
+        threads_per_job: int | None = 4,
+    ) -> None:
         """
-        Batch encode videos for multiple episodes.
+        Batch encode videos for multiple episodes. The (episode, camera) pairs are encoded concurrently in a
+        pool of processes (see `encode_videos`).
 
         Args:
             start_episode: Starting episode index (inclusive)
             end_episode: Ending episode index (exclusive). If None, encodes all episodes from start_episode
+            num_workers: Number of videos encoded at the same time. If None, the cores of the machine are
+                divided between encoders of 'threads_per_job' threads.
+            threads_per_job: Number of threads used by each encoder.
         """
         if end_episode is None:
             end_episode = self.meta.total_episodes
 
         logging.info(f"Starting batch video encoding for episodes {start_episode} to {end_episode - 1}")
 
-        # Encode all episodes with cleanup enabled for individual episodes
-        for ep_idx in range(start_episode, end_episode):
-            logging.info(f"Encoding videos for episode {ep_idx}")
-            self.encode_episode_videos(ep_idx)
+        jobs = self._get_video_encoding_jobs(start_episode, end_episode)
+        for job in encode_videos(jobs, num_workers=num_workers, threads_per_job=threads_per_job):
+            shutil.rmtree(job.imgs_dir)
+            self._add_to_file_manifest("videos", job.video_path)
+
+        if len(self.meta.video_keys) > 0 and start_episode == 0:
+            self.meta.update_video_info()
+            write_info(self.meta.info, self.meta.root)
 
         logging.info("Batch video encoding completed")
 
@@ -1015,10 +1632,12 @@ class LeRobotDataset(torch.utils.data.Dataset):
         image_writer_threads: int = 0,
         video_backend: str | None = None,
         batch_encoding_size: int = 1,
+        streaming_encoding: bool = False,
+        online_stats: bool = False,
+        frame_format: FrameFormat | None = None,
     ) -> "LeRobotDataset":
         """Create a LeRobot Dataset from scratch in order to record data."""
-        obj = cls.__new__(cls)
-        obj.meta = LeRobotDatasetMetadata.create(
+        meta = LeRobotDatasetMetadata.create(
             repo_id=repo_id,
             fps=fps,
             robot_type=robot_type,
@@ -1026,6 +1645,79 @@ class LeRobotDataset(torch.utils.data.Dataset):
             root=root,
             use_videos=use_videos,
         )
+        obj = cls._from_metadata_for_recording(
+            meta,
+            tolerance_s=tolerance_s,
+            image_writer_processes=image_writer_processes,
+            image_writer_threads=image_writer_threads,
+            video_backend=video_backend,
+            batch_encoding_size=batch_encoding_size,
+            streaming_encoding=streaming_encoding,
+            online_stats=online_stats,
+            frame_format=frame_format,
+        )
+        obj.hf_dataset = obj.create_hf_dataset()
+        return obj
+
+    @classmethod
+    def open_for_append(
+        cls,
+        repo_id: str,
+        root: str | Path | None = None,
+        tolerance_s: float = 1e-4,
+        image_writer_processes: int = 0,
+        image_writer_threads: int = 0,
+        video_backend: str | None = None,
+        batch_encoding_size: int = 1,
+        streaming_encoding: bool = False,
+        online_stats: bool = False,
+        frame_format: FrameFormat | None = None,
+    ) -> "LeRobotDataset":
+        """Open a local LeRobot Dataset in order to record more episodes in it.
+
+        Unlike the default constructor, neither the data of the episodes nor their stats are loaded (see
+        `LeRobotDatasetMetadata.open_for_append`), so that it takes the same time whatever the size of the
+        dataset. The returned dataset is write-only: frames are added with `add_frame` and `save_episode`, but
+        can't be queried.
+
+        Episodes left pending by an interrupted recording with an episode finalizer are finalized and committed
+        first (see `recover_pending_episodes`).
+        """
+        meta = LeRobotDatasetMetadata.open_for_append(repo_id, root)
+        obj = cls._from_metadata_for_recording(
+            meta,
+            tolerance_s=tolerance_s,
+            image_writer_processes=image_writer_processes,
+            image_writer_threads=image_writer_threads,
+            video_backend=video_backend,
+            batch_encoding_size=batch_encoding_size,
+            streaming_encoding=streaming_encoding,
+            online_stats=online_stats,
+            frame_format=frame_format,
+        )
+        obj.hf_dataset = None
+
+        # Finalize the episodes which were saved but not committed before the recording was interrupted
+        if (obj.root / DEFAULT_PENDING_EPISODE_PATH).parent.is_dir():
+            obj.recover_pending_episodes()
+            obj.episode_buffer = obj.create_episode_buffer()
+        return obj
+
+    @classmethod
+    def _from_metadata_for_recording(
+        cls,
+        meta: LeRobotDatasetMetadata,
+        tolerance_s: float,
+        image_writer_processes: int,
+        image_writer_threads: int,
+        video_backend: str | None,
+        batch_encoding_size: int,
+        streaming_encoding: bool,
+        online_stats: bool,
+        frame_format: FrameFormat | None,
+    ) -> "LeRobotDataset":
+        obj = cls.__new__(cls)
+        obj.meta = meta
         obj.repo_id = obj.meta.repo_id
         obj.root = obj.meta.root
         obj.revision = None
@@ -1033,6 +1725,20 @@ class LeRobotDataset(torch.utils.data.Dataset):
         obj.image_writer = None
         obj.batch_encoding_size = batch_encoding_size
         obj.episodes_since_last_encoding = 0
+        obj.use_frame_table = False
+        obj.frame_table_mmap = False
+        obj.frame_table = None
+        obj.video_decoder_cache = None
+        obj.use_frame_store = False
+        obj.frame_store = None
+        obj.streaming_encoding = streaming_encoding
+        obj.video_encoders = {}
+        obj.episode_finalizer = None
+        obj._recording_lock = None
+        obj._file_manifest = None
+        obj.online_stats = online_stats
+        obj.running_stats = {}
+        obj.frame_format = frame_format if frame_format is not None else FrameFormat()
 
         if image_writer_processes or image_writer_threads:
             obj.start_image_writer(image_writer_processes, image_writer_threads)
@@ -1041,7 +1747,6 @@ class LeRobotDataset(torch.utils.data.Dataset):
         obj.episode_buffer = obj.create_episode_buffer()
 
         obj.episodes = None
-        obj.hf_dataset = obj.create_hf_dataset()
         obj.image_transforms = None
         obj.delta_timestamps = None
         obj.delta_indices = None
@@ -1050,11 +1755,50 @@ class LeRobotDataset(torch.utils.data.Dataset):
         return obj
 
 
+def _image_to_uint8_hwc(image: np.ndarray | PIL.Image.Image) -> np.ndarray:
+    if isinstance(image, PIL.Image.Image):
+        return np.asarray(image.convert("RGB"))
+    return image_array_to_uint8_hwc(image)
+
+
+class _MergedEpisodesStats(Mapping):
+    """Episodes stats of several datasets, with the episodes of each dataset numbered after those of the
+    previous ones. The stats of the datasets are only loaded and merged on first access.
+    """
+
+    def __init__(self, metas: list[LeRobotDatasetMetadata]):
+        self._metas = metas
+        self._merged = None
+
+    def _get_merged(self) -> dict[int, dict]:
+        if self._merged is None:
+            self._merged = {}
+            offset = 0
+            for meta in self._metas:
+                for ep_idx, stats in meta.episodes_stats.items():
+                    self._merged[offset + ep_idx] = stats
+                offset += len(meta.episodes_stats)
+        return self._merged
+
+    def __getitem__(self, ep_idx: int) -> dict:
+        return self._get_merged()[ep_idx]
+
+    def __iter__(self):
+        return iter(self._get_merged())
+
+    def __len__(self) -> int:
+        return len(self._get_merged())
+
+
 class MultiLeRobotDataset(torch.utils.data.Dataset):
     """A dataset consisting of multiple underlying `LeRobotDataset`s.
 
     The underlying `LeRobotDataset`s are effectively concatenated, and this class adopts much of the API
     structure of `LeRobotDataset`.
+
+    The underlying datasets are instantiated concurrently by 'num_load_workers' threads. Their aggregated
+    stats are cached in 'root/cache/merged_stats' when 'cache_stats' is True, so that the stats of every
+    episode of every dataset are only parsed the first time a given combination of datasets is loaded.
     """
 
     def __init__(
@@ -1067,26 +1811,42 @@ class MultiLeRobotDataset(torch.utils.data.Dataset):
         tolerances_s: dict | None = None,
         download_videos: bool = True,
         video_backend: str | None = None,
+        use_frame_table: bool = False,
+        frame_table_mmap: bool = False,
+        video_decoder_cache_size: int = 0,
+        use_frame_store: bool = False,
+        num_load_workers: int = 8,
+        cache_stats: bool = True,
     ):
         super().__init__()
         self.repo_ids = repo_ids
         self.root = Path(root) if root else HF_LEROBOT_HOME
         self.tolerances_s = tolerances_s if tolerances_s else dict.fromkeys(repo_ids, 0.0001)
+
         # Construct the underlying datasets passing everything but `transform` and `delta_timestamps` which
-        # are handled by this class.
-        self._datasets = [
-            LeRobotDataset(
+        # are handled by this class. Loading is mostly file I/O and parquet decoding, which release the GIL,
+        # so the datasets are instantiated concurrently.
+        def make_dataset(repo_id: str) -> LeRobotDataset:
+            return LeRobotDataset(
                 repo_id,
                 root=self.root / repo_id,
-                episodes=episodes[repo_id] if episodes else None,
+                episodes=episodes.get(repo_id) if episodes else None,
                 image_transforms=image_transforms,
                 delta_timestamps=delta_timestamps,
                 tolerance_s=self.tolerances_s[repo_id],
                 download_videos=download_videos,
                 video_backend=video_backend,
+                use_frame_table=use_frame_table,
+                frame_table_mmap=frame_table_mmap,
+                video_decoder_cache_size=video_decoder_cache_size,
+                use_frame_store=use_frame_store,
             )
-            for repo_id in repo_ids
-        ]
+
+        if num_load_workers > 1 and len(repo_ids) > 1:
+            with ThreadPoolExecutor(max_workers=min(num_load_workers, len(repo_ids))) as executor:
+                self._datasets = list(executor.map(make_dataset, repo_ids))
+        else:
+            self._datasets = [make_dataset(repo_id) for repo_id in repo_ids]
 
         # Disable any data keys that are not common across all of the datasets. Note: we may relax this
         # restriction in future iterations of this class. For now, this is necessary at least for being able
@@ -1114,7 +1874,7 @@ class MultiLeRobotDataset(torch.utils.data.Dataset):
         # with multiple robots of different ranges. Instead we should have one normalization
         # per robot.
         self._common_feature_keys = intersection_features
-        self.stats = aggregate_stats([dataset.meta.stats for dataset in self._datasets])
+        self.stats = self._load_merged_stats() if cache_stats else self._merge_stats()
         # Expose a metadata object so downstream code can keep working with the same API as LeRobotDataset.
         primary_meta = copy.deepcopy(self._datasets[0].meta)
         if isinstance(primary_meta.info, dict) and "features" in primary_meta.info:
@@ -1125,15 +1885,8 @@ class MultiLeRobotDataset(torch.utils.data.Dataset):
         primary_meta.repo_id = "multi:" + ",".join(self.repo_ids)
         primary_meta.root = self.root
         # episodes_stats is a dict[int, stats_dict]; merge all episodes with offset keys to avoid collisions.
-        if hasattr(primary_meta, "episodes_stats") and primary_meta.episodes_stats is not None:
-            merged_episode_stats = {}
-            offset = 0
-            for dataset in self._datasets:
-                for ep_idx, stats in dataset.meta.episodes_stats.items():
-                    merged_episode_stats[offset + ep_idx] = stats
-                offset += len(dataset.meta.episodes_stats)
-            primary_meta.episodes_stats = merged_episode_stats
-        
+        primary_meta.episodes_stats = _MergedEpisodesStats([dataset.meta for dataset in self._datasets])
+
         # Merge episodes from all datasets with renumbered episode indices starting from 0
         merged_episodes = {}
         new_episode_idx = 0
@@ -1144,19 +1897,69 @@ class MultiLeRobotDataset(torch.utils.data.Dataset):
                 new_ep_dict["episode_index"] = new_episode_idx
                 merged_episodes[new_episode_idx] = new_ep_dict
                 new_episode_idx += 1
-        
+
         # Update the meta episodes with merged episodes
         primary_meta.episodes = merged_episodes
-        
+
         self.meta = primary_meta
-        
-        # Compute episode_data_index for training
-        from lerobot.datasets.utils import get_episode_data_index
-        self.episode_data_index = get_episode_data_index(merged_episodes)
-        
+
+        # Cumulative offsets of the sub-datasets in the concatenated frame and episode indexing, used to route
+        # a global index to its sub-dataset with a binary search. Episode offsets follow the renumbering of
+        # `meta.episodes` above, so that a selection of episodes keeps their original indices.
+        self._frame_offsets = np.cumsum([0] + [ds.num_frames for ds in self._datasets])
+        self._episode_offsets = np.cumsum([0] + [len(ds.meta.episodes) for ds in self._datasets])
+
+        # Compute episode_data_index for training over the frames actually loaded by the sub-datasets.
+        self.episode_data_index = {
+            key: torch.cat(
+                [
+                    ds.episode_data_index[key] + int(offset)
+                    for ds, offset in zip(self._datasets, self._frame_offsets, strict=False)
+                ]
+            )
+            for key in ("from", "to")
+        }
+
         # Store episodes list for compatibility - use None to indicate all episodes are used
         self.episodes = None
 
+    def _merge_stats(self) -> dict[str, dict]:
+        return aggregate_stats([dataset.meta.stats for dataset in self._datasets])
+
+    def _stats_cache_key(self) -> str:
+        """Identifies the stats of the sub-datasets by their revision, size and stats modification time."""
+        entries = []
+        for dataset in self._datasets:
+            is_v21 = dataset.meta._version >= packaging.version.parse("v2.1")
+            stats_path = dataset.root / (EPISODES_STATS_PATH if is_v21 else STATS_PATH)
+            stats_mtime = stats_path.stat().st_mtime_ns if stats_path.is_file() else None
+            entries.append(
+                [
+                    dataset.repo_id,
+                    dataset.revision,
+                    dataset.meta.total_episodes,
+                    dataset.meta.total_frames,
+                    stats_mtime,
+                ]
+            )
+        return hashlib.sha1(json.dumps(entries).encode()).hexdigest()
+
+    def _load_merged_stats(self) -> dict[str, dict]:
+        """Returns the aggregated stats of the sub-datasets from the cache in 'root/cache/merged_stats', which
+        avoids parsing the stats of every episode of every sub-dataset. They are computed and cached on a
+        miss.
+        """
+        cache_path = self.root / DEFAULT_MERGED_STATS_PATH.format(key=self._stats_cache_key())
+        if cache_path.is_file():
+            return cast_stats_to_numpy(load_json(cache_path))
+
+        stats = self._merge_stats()
+        # Written atomically since several processes may build the same MultiLeRobotDataset concurrently.
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        write_json(serialize_dict(stats), tmp_path)
+        os.replace(tmp_path, cache_path)
+        return stats
+
     @property
     def repo_id_to_index(self):
         """Return a mapping from dataset repo_id to a dataset index automatically created by this class.
@@ -1221,7 +2024,12 @@ class MultiLeRobotDataset(torch.utils.data.Dataset):
     @property
     def num_frames(self) -> int:
         """Number of samples/frames."""
-        return sum(d.num_frames for d in self._datasets)
+        return int(self._frame_offsets[-1])
+
+    @property
+    def dataset_frame_offsets(self) -> list[int]:
+        """Index of the first frame of each underlying dataset, followed by the total number of frames."""
+        return self._frame_offsets.tolist()
 
     @property
     def num_episodes(self) -> int:
@@ -1240,35 +2048,25 @@ class MultiLeRobotDataset(torch.utils.data.Dataset):
     def __len__(self):
         return self.num_frames
 
+    def _locate(self, idx: int) -> tuple[int, int]:
+        """Returns the sub-dataset holding the global frame 'idx' and the index of that frame within it."""
+        dataset_idx = bisect.bisect_right(self._frame_offsets, idx) - 1
+        return dataset_idx, idx - int(self._frame_offsets[dataset_idx])
+
     def __getitem__(self, idx: int) -> dict[str, torch.Tensor]:
         if idx >= len(self):
             raise IndexError(f"Index {idx} out of bounds.")
-        # Determine which dataset to get an item from based on the index.
-        start_idx = 0
-        dataset_idx = 0
-        for dataset in self._datasets:
-            if idx >= start_idx + dataset.num_frames:
-                start_idx += dataset.num_frames
-                dataset_idx += 1
-                continue
-            break
-        else:
-            raise AssertionError("We expect the loop to break out as long as the index is within bounds.")
-        
+        dataset_idx, local_idx = self._locate(idx)
         # Get item from the appropriate dataset
-        item = self._datasets[dataset_idx][idx - start_idx]
-        
+        item = self._datasets[dataset_idx][local_idx]
+
         # Remap episode_index to global episode indexing
-        original_episode_idx = item["episode_index"].item()
-        
-        # Calculate global episode index based on dataset offset
-        global_episode_offset = sum(ds.num_episodes for ds in self._datasets[:dataset_idx])
-        global_episode_idx = global_episode_offset + original_episode_idx
-        
+        global_episode_idx = int(self._episode_offsets[dataset_idx]) + item["episode_index"].item()
+
         # Update the episode_index to global indexing
         item["episode_index"] = torch.tensor(global_episode_idx)
         item["dataset_index"] = torch.tensor(dataset_idx)
-        
+
         # Remove disabled features
         for data_key in self.disabled_features:
             if data_key in item:
@@ -1276,6 +2074,32 @@ class MultiLeRobotDataset(torch.utils.data.Dataset):
 
         return item
 
+    def __getitems__(self, indices: list[int]) -> list[dict[str, torch.Tensor]]:
+        """Batched version of `__getitem__`: indices are grouped by sub-dataset and fetched with their
+        `__getitems__`, then returned in the requested order."""
+        indices = np.asarray(indices, dtype=np.int64)
+        if len(indices) > 0 and indices.max() >= len(self):
+            raise IndexError(f"Index {indices.max()} out of bounds.")
+        frame_offsets = self._frame_offsets
+        episode_offsets = self._episode_offsets
+        dataset_indices = np.searchsorted(frame_offsets, indices, side="right") - 1
+
+        items = [None] * len(indices)
+        for dataset_idx in np.unique(dataset_indices):
+            positions = np.flatnonzero(dataset_indices == dataset_idx)
+            sub_indices = (indices[positions] - frame_offsets[dataset_idx]).tolist()
+            sub_items = self._datasets[dataset_idx].__getitems__(sub_indices)
+            for pos, item in zip(positions, sub_items, strict=True):
+                global_episode_idx = int(episode_offsets[dataset_idx]) + item["episode_index"].item()
+                item["episode_index"] = torch.tensor(global_episode_idx)
+                item["dataset_index"] = torch.tensor(int(dataset_idx))
+                for data_key in self.disabled_features:
+                    if data_key in item:
+                        del item[data_key]
+                items[pos] = item
+
+        return items
+
     def __repr__(self):
         return (
             f"{self.__class__.__name__}(\n"
@@ -15,6 +15,7 @@
 # limitations under the License.
 from collections.abc import Iterator
 
+import numpy as np
 import torch
 
 
@@ -59,3 +60,74 @@ class EpisodeAwareSampler:
 
     def __len__(self) -> int:
         return len(self.indices)
+
+
+class WeightedMixtureSampler:
+    def __init__(
+        self,
+        episode_data_index: dict,
+        dataset_frame_offsets: list[int],
+        weights: list[float] | None = None,
+        temperature: float = 1.0,
+        drop_n_first_frames: int = 0,
+        drop_n_last_frames: int = 0,
+        num_samples: int | None = None,
+    ):
+        """Sampler drawing frames from a mixture of concatenated datasets (e.g. a `MultiLeRobotDataset`).
+
+        Each draw first picks a dataset with probability proportional to `weights[i] ** (1 / temperature)`, then
+        a frame uniformly among the frames of this dataset. Frames are sampled with replacement. The frames
+        kept for each dataset are precomputed once, so that each draw costs O(1).
+
+        Args:
+            episode_data_index: Dictionary with keys 'from' and 'to' containing the start and end indices of each episode.
+            dataset_frame_offsets: Index of the first frame of each dataset, followed by the total number of frames.
+            weights: Sampling weight of each dataset. If None, the number of frames of each dataset is used, which
+                     with a temperature of 1 samples all the frames uniformly.
+            temperature: Values above 1 flatten the mixture towards uniform sampling of the datasets, values below
+                         1 sharpen it towards the datasets with the largest weights.
+            drop_n_first_frames: Number of frames to drop from the start of each episode.
+            drop_n_last_frames: Number of frames to drop from the end of each episode.
+            num_samples: Number of frames drawn per iteration. If None, the total number of frames kept.
+        """
+        num_datasets = len(dataset_frame_offsets) - 1
+        if weights is not None and len(weights) != num_datasets:
+            raise ValueError(f"Expected {num_datasets} weights, one per dataset, got {len(weights)}.")
+        if temperature <= 0:
+            raise ValueError(f"temperature must be strictly positive, got {temperature}.")
+
+        starts = episode_data_index["from"].numpy()
+        ends = episode_data_index["to"].numpy()
+        episode_datasets = np.searchsorted(dataset_frame_offsets, starts, side="right") - 1
+        dataset_indices = [[] for _ in range(num_datasets)]
+        for dataset_idx, start_index, end_index in zip(episode_datasets, starts, ends, strict=True):
+            dataset_indices[dataset_idx].append(
+                np.arange(start_index + drop_n_first_frames, end_index - drop_n_last_frames)
+            )
+        dataset_indices = [
+            np.concatenate(indices) if indices else np.empty(0, dtype=np.int64) for indices in dataset_indices
+        ]
+
+        # Frames of all datasets are stored in a single array, so that a draw is a single lookup in it.
+        self.indices = torch.from_numpy(np.concatenate(dataset_indices).astype(np.int64))
+        self.dataset_sizes = torch.tensor([len(indices) for indices in dataset_indices])
+        self.dataset_starts = torch.cumsum(self.dataset_sizes, dim=0) - self.dataset_sizes
+
+        weights = (
+            self.dataset_sizes.double() if weights is None else torch.tensor(weights, dtype=torch.float64)
+        )
+        if (weights < 0).any() or weights.sum() == 0:
+            raise ValueError(f"weights must be non-negative and not all zero, got {weights.tolist()}.")
+        if ((weights > 0) & (self.dataset_sizes == 0)).any():
+            raise ValueError("A dataset with a non-zero weight has no frames to sample from.")
+        probabilities = weights ** (1 / temperature)
+        self.probabilities = probabilities / probabilities.sum()
+        self.num_samples = num_samples if num_samples is not None else len(self.indices)
+
+    def __iter__(self) -> Iterator[int]:
+        datasets = torch.multinomial(self.probabilities, self.num_samples, replacement=True)
+        offsets = (torch.rand(self.num_samples, dtype=torch.float64) * self.dataset_sizes[datasets]).long()
+        yield from self.indices[self.dataset_starts[datasets] + offsets].tolist()
+
+    def __len__(self) -> int:
+        return self.num_samples
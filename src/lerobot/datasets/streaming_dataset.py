@@ -0,0 +1,369 @@
+#!/usr/bin/env python
+
+# Copyright 2024 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Iterable version of LeRobotDataset which reads episodes sequentially instead of loading the whole dataset.
+
+`LeRobotDataset` memory-maps the full Arrow table and samples frames at random, which needs the dataset to fit
+in the page cache to be fast. `StreamingLeRobotDataset` instead walks the episode parquet files one after the
+other, reading them by row groups, and decodes the frames of their videos in order:
+
+- the stream of the (shuffled) episodes is split into contiguous shards of the same length, one per dataloader
+  worker and distributed rank, so that every rank runs the same number of steps,
+- frames are decoded before going through a bounded shuffle buffer, where they are kept as uint8, so that memory
+  usage doesn't depend on the dataset size,
+- `delta_timestamps` windows are built from a rolling buffer of the rows of the current episode,
+- the position in the stream can be restored with `set_position` to resume a training run.
+"""
+
+import math
+import random
+from collections import deque
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+import datasets
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import torch
+import torch.distributed
+
+from lerobot.constants import HF_LEROBOT_HOME
+from lerobot.datasets.lerobot_dataset import CODEBASE_VERSION, LeRobotDatasetMetadata
+from lerobot.datasets.utils import (
+    check_delta_timestamps,
+    get_delta_indices,
+    get_safe_version,
+    hf_transform_to_torch,
+)
+from lerobot.datasets.video_utils import VideoDecoderCache, decode_video_frames, get_safe_default_codec
+
+
+class StreamingLeRobotDataset(torch.utils.data.IterableDataset):
+    def __init__(
+        self,
+        repo_id: str,
+        root: str | Path | None = None,
+        episodes: list[int] | None = None,
+        image_transforms: Callable | None = None,
+        delta_timestamps: dict[list[float]] | None = None,
+        tolerance_s: float = 1e-4,
+        revision: str | None = None,
+        download_videos: bool = True,
+        video_backend: str | None = None,
+        shuffle: bool = True,
+        shuffle_buffer_size: int = 1000,
+        seed: int = 0,
+        rank: int | None = None,
+        world_size: int | None = None,
+        read_batch_size: int = 256,
+    ):
+        """Streaming counterpart of `LeRobotDataset`, yielding the same items.
+
+        At each epoch, the order of the episodes is shuffled with the same seed on every rank, and the frames
+        of the episodes in that order are split into contiguous shards, one per (rank, dataloader worker). As
+        with `DistributedSampler`, every rank gets `len(self)` frames, the first frames of the epoch being
+        repeated to make the split even. Call `set_epoch` before iterating over a new epoch.
+
+        Args:
+            repo_id (str): This is the repo id that will be used to fetch the dataset.
+            root (Path | None, optional): Local directory of the dataset. Defaults to '$HF_LEROBOT_HOME/repo_id'.
+            episodes (list[int] | None, optional): If specified, only these episodes will be streamed.
+                Defaults to None.
+            image_transforms (Callable | None, optional): Transform applied to the visual modalities.
+                Defaults to None.
+            delta_timestamps (dict[list[float]] | None, optional): Same as for `LeRobotDataset`. The largest
+                offsets define the size of the rolling buffer kept for the current episode. Defaults to None.
+            tolerance_s (float, optional): Tolerance in seconds used to check the `delta_timestamps` and the
+                timestamps of the decoded video frames. Defaults to 1e-4.
+            revision (str, optional): An optional Git revision id which can be a branch name, a tag, or a
+                commit hash. Defaults to current codebase version tag.
+            download_videos (bool, optional): Flag to download the videos. Defaults to True.
+            video_backend (str | None, optional): Video backend to use for decoding videos. Defaults to
+                torchcodec when available in the platform; otherwise, defaults to 'pyav'.
+            shuffle (bool, optional): Shuffle the order of the episodes and the frames. Defaults to True.
+            shuffle_buffer_size (int, optional): Number of frames held in the shuffle buffer. Larger buffers mix
+                frames from more episodes, at the cost of memory. Defaults to 1000.
+            seed (int, optional): Seed of the episode order and of the shuffle buffer. Defaults to 0.
+            rank (int | None, optional): Rank of this process. Defaults to the rank of the default process
+                group if torch.distributed is initialized, 0 otherwise.
+            world_size (int | None, optional): Number of processes. Defaults to the world size of the default
+                process group if torch.distributed is initialized, 1 otherwise.
+            read_batch_size (int, optional): Number of rows read at once from the parquet files.
+                Defaults to 256.
+        """
+        super().__init__()
+        self.repo_id = repo_id
+        self.root = Path(root) if root else HF_LEROBOT_HOME / repo_id
+        self.image_transforms = image_transforms
+        self.delta_timestamps = delta_timestamps
+        self.tolerance_s = tolerance_s
+        self.revision = revision if revision else CODEBASE_VERSION
+        self.video_backend = video_backend if video_backend else get_safe_default_codec()
+        self.shuffle = shuffle
+        self.shuffle_buffer_size = shuffle_buffer_size
+        self.seed = seed
+        self.read_batch_size = read_batch_size
+
+        is_distributed = torch.distributed.is_available() and torch.distributed.is_initialized()
+        self.rank = rank if rank is not None else (torch.distributed.get_rank() if is_distributed else 0)
+        self.world_size = (
+            world_size
+            if world_size is not None
+            else (torch.distributed.get_world_size() if is_distributed else 1)
+        )
+
+        self.epoch = 0
+        self._resume_num_batches = 0
+        self._resume_batch_size = 0
+
+        self.meta = LeRobotDatasetMetadata(self.repo_id, self.root, self.revision)
+        self.episodes = episodes if episodes is not None else list(self.meta.episodes)
+        self._download_missing_episodes(download_videos)
+
+        self.delta_indices = None
+        if self.delta_timestamps is not None:
+            check_delta_timestamps(self.delta_timestamps, self.fps, self.tolerance_s)
+            self.delta_indices = get_delta_indices(self.delta_timestamps, self.fps)
+
+        # Frames are decoded episode by episode and in order, so only the decoders of the current episode are
+        # kept open.
+        self.video_decoder_cache = (
+            VideoDecoderCache(capacity=len(self.meta.video_keys))
+            if len(self.meta.video_keys) > 0 and self.video_backend == "torchcodec"
+            else None
+        )
+
+    def _download_missing_episodes(self, download_videos: bool) -> None:
+        fpaths = [str(self.meta.get_data_file_path(ep_idx)) for ep_idx in self.episodes]
+        if download_videos:
+            fpaths += [
+                str(self.meta.get_video_file_path(ep_idx, vid_key))
+                for vid_key in self.meta.video_keys
+                for ep_idx in self.episodes
+            ]
+        missing = [fpath for fpath in fpaths if not (self.root / fpath).is_file()]
+        if missing:
+            self.revision = get_safe_version(self.repo_id, self.revision)
+            self.meta.revision = self.revision
+            self.meta.pull_from_repo(allow_patterns=missing)
+
+    @property
+    def fps(self) -> int:
+        """Frames per second used during data collection."""
+        return self.meta.fps
+
+    @property
+    def num_frames(self) -> int:
+        """Number of frames in selected episodes."""
+        return sum(self.meta.episodes[ep_idx]["length"] for ep_idx in self.episodes)
+
+    @property
+    def num_episodes(self) -> int:
+        """Number of episodes selected."""
+        return len(self.episodes)
+
+    @property
+    def features(self) -> dict[str, dict]:
+        return self.meta.features
+
+    def __len__(self) -> int:
+        """Number of frames yielded to this rank at each epoch."""
+        return math.ceil(self.num_frames / self.world_size)
+
+    def set_epoch(self, epoch: int) -> None:
+        """Sets the epoch used to shuffle the episodes and the frames of the next iteration."""
+        self.epoch = epoch
+        self._resume_num_batches = 0
+        self._resume_batch_size = 0
+
+    def set_position(self, epoch: int, num_batches: int, batch_size: int) -> None:
+        """Makes the next iteration resume epoch 'epoch' after its first 'num_batches' batches.
+
+        The stream of each shard is deterministic given the seed and the epoch, so the frames already consumed
+        are skipped without decoding their videos. Batches are assumed to be collated by a DataLoader, which
+        takes them from its workers in turn, with the same 'batch_size' as the one being resumed.
+        """
+        self.epoch = epoch
+        self._resume_num_batches = num_batches
+        self._resume_batch_size = batch_size
+
+    def _get_shard(self) -> tuple[int, int, int, int]:
+        """Returns the index of the worker and the number of workers, and the range of positions of the frames
+        of this worker in the stream of the epoch."""
+        worker_info = torch.utils.data.get_worker_info()
+        worker_id, num_workers = (0, 1) if worker_info is None else (worker_info.id, worker_info.num_workers)
+        # Same lengths on every rank, so that their workers yield the same number of batches.
+        rank_length = len(self)
+        start = self.rank * rank_length + rank_length * worker_id // num_workers
+        stop = self.rank * rank_length + rank_length * (worker_id + 1) // num_workers
+        return worker_id, num_workers, start, stop
+
+    def _get_epoch_episodes(self) -> list[int]:
+        episodes = list(self.episodes)
+        if self.shuffle:
+            # Same permutation on every shard, so that shards read disjoint sets of frames.
+            np.random.default_rng([self.seed, self.epoch]).shuffle(episodes)
+        return episodes
+
+    def _get_segments(self, episodes: list[int], start: int, stop: int) -> list[tuple[int, int, int]]:
+        """Returns the (episode index, first frame, stop frame) segments holding the frames 'start' to 'stop' of
+        the stream of 'episodes', which wraps around at its end."""
+        lengths = np.array([self.meta.episodes[ep_idx]["length"] for ep_idx in episodes], dtype=np.int64)
+        ends = np.cumsum(lengths)
+        total = int(ends[-1]) if len(ends) > 0 else 0
+        segments = []
+        pos = start
+        while pos < stop and total > 0:
+            i = int(np.searchsorted(ends, pos % total, side="right"))
+            first = pos % total - int(ends[i] - lengths[i])
+            last = min(int(lengths[i]), first + stop - pos)
+            segments.append((episodes[i], first, last))
+            pos += last - first
+        return segments
+
+    def _read_rows(self, ep_idx: int) -> Iterator[list[dict]]:
+        """Reads the parquet file of episode 'ep_idx' sequentially, yielding batches of rows."""
+        parquet_file = pq.ParquetFile(self.root / self.meta.get_data_file_path(ep_idx))
+        hf_features = datasets.Features.from_arrow_schema(parquet_file.schema_arrow)
+        for record_batch in parquet_file.iter_batches(batch_size=self.read_batch_size):
+            columns = hf_transform_to_torch(
+                hf_features.decode_batch(pa.Table.from_batches([record_batch]).to_pydict())
+            )
+            yield [{key: values[i] for key, values in columns.items()} for i in range(record_batch.num_rows)]
+
+    def _get_window(self, rows: deque, rows_start: int, frame_idx: int, ep_length: int) -> tuple[dict, dict]:
+        """Builds the item of frame 'frame_idx' from the rolling buffer 'rows', which holds the rows of its
+        episode starting at 'rows_start'. Also returns the timestamps of the video frames to decode."""
+        item = dict(rows[frame_idx - rows_start])
+        query_timestamps = dict.fromkeys(self.meta.video_keys, [item["timestamp"].item()])
+        if self.delta_indices is None:
+            return item, query_timestamps
+
+        for key, delta_idx in self.delta_indices.items():
+            query_indices = [frame_idx + delta for delta in delta_idx]
+            clipped = [max(0, min(ep_length - 1, idx)) - rows_start for idx in query_indices]
+            if key in self.meta.video_keys:
+                query_timestamps[key] = [rows[idx]["timestamp"].item() for idx in clipped]
+            else:
+                item[key] = torch.stack([rows[idx][key] for idx in clipped])
+            # Pad values outside of current episode range
+            item[f"{key}_is_pad"] = torch.BoolTensor([idx < 0 or idx >= ep_length for idx in query_indices])
+        return item, query_timestamps
+
+    def _iter_episode(self, ep_idx: int, first: int, stop: int) -> Iterator[tuple[int, dict, dict]]:
+        """Yields the frames 'first' to 'stop' of episode 'ep_idx' in order, keeping only the rows within reach
+        of the `delta_timestamps` windows of the next frames in memory."""
+        ep_length = self.meta.episodes[ep_idx]["length"]
+        deltas = [delta for delta_idx in (self.delta_indices or {}).values() for delta in delta_idx]
+        past = max(0, -min(deltas, default=0))
+        future = max(0, max(deltas, default=0))
+
+        rows = deque()
+        rows_start = 0
+        frame_idx = first
+        for batch in self._read_rows(ep_idx):
+            rows.extend(batch)
+            while rows_start < frame_idx - past and len(rows) > 0:
+                rows.popleft()
+                rows_start += 1
+            num_loaded = rows_start + len(rows)
+            while frame_idx < num_loaded and min(frame_idx + future, ep_length - 1) < num_loaded:
+                yield (ep_idx, *self._get_window(rows, rows_start, frame_idx, ep_length))
+                frame_idx += 1
+                if frame_idx == stop:
+                    return
+                while rows_start < frame_idx - past:
+                    rows.popleft()
+                    rows_start += 1
+
+    def _iter_shuffled(self, frames: Iterator, rng: random.Random) -> Iterator:
+        if not self.shuffle:
+            yield from frames
+            return
+
+        buffer = []
+        for frame in frames:
+            if len(buffer) < self.shuffle_buffer_size:
+                buffer.append(frame)
+                continue
+            idx = rng.randrange(len(buffer))
+            yield buffer[idx]
+            buffer[idx] = frame
+        rng.shuffle(buffer)
+        yield from buffer
+
+    def _query_videos(self, query_timestamps: dict[str, list[float]], ep_idx: int) -> dict[str, torch.Tensor]:
+        item = {}
+        for vid_key, query_ts in query_timestamps.items():
+            video_path = self.root / self.meta.get_video_file_path(ep_idx, vid_key)
+            frames = decode_video_frames(
+                video_path,
+                query_ts,
+                self.tolerance_s,
+                self.video_backend,
+                decoder_cache=self.video_decoder_cache,
+            )
+            # Frames wait in the shuffle buffer as uint8, which is how they were decoded.
+            item[vid_key] = (frames.squeeze(0) * 255).round().to(torch.uint8)
+
+        return item
+
+    def __iter__(self) -> Iterator[dict]:
+        worker_id, num_workers, start, stop = self._get_shard()
+        # Batches are taken from the workers in turn, starting with the first one.
+        num_skipped = len(range(worker_id, self._resume_num_batches, num_workers)) * self._resume_batch_size
+        rng_seed = f"{self.seed}-{self.epoch}-{self.rank}-{worker_id}"
+
+        # The shuffle only depends on the number of frames, so the positions of the frames already consumed are
+        # found by shuffling the positions alone, and these frames are then skipped without decoding their videos.
+        shuffled_positions = self._iter_shuffled(iter(range(stop - start)), random.Random(rng_seed))
+        skipped = {pos for pos, _ in zip(shuffled_positions, range(num_skipped), strict=False)}
+
+        segments = self._get_segments(self._get_epoch_episodes(), start, stop)
+        frames = (frame for segment in segments for frame in self._iter_episode(*segment))
+        # Videos are decoded in the order of the stream, before the frames are shuffled.
+        frames = (
+            {**self._query_videos(query_timestamps, ep_idx), **item}
+            if len(self.meta.video_keys) > 0 and pos not in skipped
+            else item
+            for pos, (ep_idx, item, query_timestamps) in enumerate(frames)
+        )
+        for i, item in enumerate(self._iter_shuffled(frames, random.Random(rng_seed))):
+            if i < num_skipped:
+                continue
+
+            for key in self.meta.video_keys:
+                item[key] = item[key].type(torch.float32) / 255
+
+            if self.image_transforms is not None:
+                for cam in self.meta.camera_keys:
+                    item[cam] = self.image_transforms(item[cam])
+
+            # Add task as a string
+            item["task"] = self.meta.tasks[item["task_index"].item()]
+            yield item
+
+    def __repr__(self):
+        feature_keys = list(self.features)
+        return (
+            f"{self.__class__.__name__}({{\n"
+            f"    Repository ID: '{self.repo_id}',\n"
+            f"    Number of selected episodes: '{self.num_episodes}',\n"
+            f"    Number of selected samples: '{self.num_frames}',\n"
+            f"    Features: '{feature_keys}',\n"
+            f"    Shuffle buffer size: '{self.shuffle_buffer_size if self.shuffle else None}',\n"
+            "})',\n"
+        )
@@ -179,6 +179,9 @@ class ImageTransformsConfig:
     # By default, transforms are applied in Torchvision's suggested order (shown below).
     # Set this to True to apply them in a random order.
     random_order: bool = False
+    # Set this to True to apply the transforms to whole batches on the training device in
+    # `lerobot/scripts/train.py` (see `BatchedImageTransforms`), instead of to each frame in the dataloader.
+    batched: bool = False
     tfs: dict[str, ImageTransformConfig] = field(
         default_factory=lambda: {
             "brightness": ImageTransformConfig(
@@ -250,3 +253,198 @@ class ImageTransforms(Transform):
 
     def forward(self, *inputs: Any) -> Any:
         return self.tf(*inputs)
+
+
+def _blend(images: torch.Tensor, other: torch.Tensor, ratio: torch.Tensor) -> torch.Tensor:
+    return images.mul(ratio).add_(other * (1.0 - ratio)).clamp_(0, 1)
+
+
+def _rgb_to_grayscale(images: torch.Tensor) -> torch.Tensor:
+    r, g, b = images.unbind(dim=-3)
+    return r.mul(0.2989).add_(g, alpha=0.587).add_(b, alpha=0.114).unsqueeze(dim=-3)
+
+
+def _rgb_to_hsv(images: torch.Tensor) -> torch.Tensor:
+    r, g, _ = images.unbind(dim=-3)
+    minc, maxc = torch.aminmax(images, dim=-3)
+    eqc = maxc == minc
+    channels_range = maxc - minc
+    ones = torch.ones_like(maxc)
+    s = channels_range / torch.where(eqc, ones, maxc)
+    channels_range_divisor = torch.where(eqc, ones, channels_range).unsqueeze(dim=-3)
+    rc, gc, bc = ((maxc.unsqueeze(dim=-3) - images) / channels_range_divisor).unbind(dim=-3)
+    mask_maxc_neq_r = maxc != r
+    mask_maxc_eq_g = maxc == g
+    hg = (rc + 2.0 - bc) * (mask_maxc_eq_g & mask_maxc_neq_r)
+    hr = (bc - gc) * ~mask_maxc_neq_r
+    hb = (gc + 4.0 - rc) * (mask_maxc_neq_r & ~mask_maxc_eq_g)
+    h = ((hr + hg + hb) / 6.0 + 1.0).fmod(1.0)
+    return torch.stack((h, s, maxc), dim=-3)
+
+
+def _hsv_to_rgb(images: torch.Tensor) -> torch.Tensor:
+    h, s, v = images.unbind(dim=-3)
+    h6 = h * 6
+    i = torch.floor(h6)
+    f = h6 - i
+    i = i.to(dtype=torch.long).remainder(6)
+    q = ((1.0 - s * f) * v).clamp(0.0, 1.0)
+    t = ((1.0 - s * (1.0 - f)) * v).clamp(0.0, 1.0)
+    p = ((1.0 - s) * v).clamp(0.0, 1.0)
+    vpqt = torch.stack((v, p, q, t), dim=-3)
+    select = torch.tensor([[0, 2, 1, 1, 3, 0], [3, 0, 0, 2, 1, 1], [1, 1, 3, 0, 0, 2]], device=images.device)
+    return vpqt.gather(-3, select[:, i].moveaxis(0, -3))
+
+
+def adjust_brightness(images: torch.Tensor, factors: torch.Tensor) -> torch.Tensor:
+    """Batched `F.adjust_brightness` of float images with one factor per image (first dimension)."""
+    return images.mul(factors).clamp_(0, 1)
+
+
+def adjust_contrast(images: torch.Tensor, factors: torch.Tensor) -> torch.Tensor:
+    """Batched `F.adjust_contrast` of float images with one factor per image (first dimension)."""
+    grayscale = _rgb_to_grayscale(images) if images.shape[-3] == 3 else images
+    return _blend(images, grayscale.mean(dim=(-3, -2, -1), keepdim=True), factors)
+
+
+def adjust_saturation(images: torch.Tensor, factors: torch.Tensor) -> torch.Tensor:
+    """Batched `F.adjust_saturation` of float images with one factor per image (first dimension)."""
+    if images.shape[-3] == 1:
+        return images
+    return _blend(images, _rgb_to_grayscale(images), factors)
+
+
+def adjust_hue(images: torch.Tensor, factors: torch.Tensor) -> torch.Tensor:
+    """Batched `F.adjust_hue` of float images with one factor per image (first dimension)."""
+    if images.shape[-3] == 1:
+        return images
+    h, s, v = _rgb_to_hsv(images).unbind(dim=-3)
+    h = (h + factors.squeeze(-3)).remainder(1.0)
+    return _hsv_to_rgb(torch.stack((h, s, v), dim=-3))
+
+
+def adjust_sharpness(images: torch.Tensor, factors: torch.Tensor) -> torch.Tensor:
+    """Batched `F.adjust_sharpness` of float images with one factor per image (first dimension)."""
+    num_channels, height, width = images.shape[-3:]
+    if images.numel() == 0 or height <= 2 or width <= 2:
+        return images
+
+    a, b = 1.0 / 13.0, 5.0 / 13.0
+    kernel = torch.tensor([[a, a, a], [a, b, a], [a, a, a]], dtype=images.dtype, device=images.device)
+    kernel = kernel.expand(num_channels, 1, 3, 3)
+    blurred = torch.nn.functional.conv2d(
+        images.reshape(-1, num_channels, height, width), kernel, groups=num_channels
+    ).reshape(*images.shape[:-2], height - 2, width - 2)
+
+    # Borders are kept as is, like in torchvision.
+    output = images.clone()
+    interior = output[..., 1:-1, 1:-1]
+    interior.add_((blurred - interior) * (1.0 - factors))
+    return output.clamp_(0, 1)
+
+
+class BatchedImageTransforms:
+    """Batched counterpart of `ImageTransforms`, applied to collated batches on the training device.
+
+    `ImageTransforms` runs in the dataloader workers on one frame at a time. This class applies the same
+    transforms to a whole (B, C, H, W) or (B, T, C, H, W) batch of float images in [0, 1], with parameters
+    sampled for each of the B samples at once: every sample of every camera gets its own random subset of
+    transforms and its own factors, as it would with `ImageTransforms`, and the T frames of a sample share them.
+    Parameters are drawn from a dedicated generator, so that the augmentations only depend on 'seed'.
+
+    Args:
+        cfg: same configuration as for `ImageTransforms`.
+        seed: seed of the generator of the parameters. If None, the generator is seeded randomly.
+        device: device of the batches.
+    """
+
+    def __init__(
+        self, cfg: ImageTransformsConfig, seed: int | None = None, device: str | torch.device = "cpu"
+    ):
+        self._cfg = cfg
+        self.device = torch.device(device)
+        self.generator = torch.Generator(device=self.device)
+        if seed is not None:
+            self.generator.manual_seed(seed)
+        else:
+            self.generator.seed()
+
+        weights = []
+        self.transforms = {}
+        for tf_name, tf_cfg in cfg.tfs.items():
+            if tf_cfg.weight <= 0.0:
+                continue
+
+            self.transforms[tf_name] = make_transform_from_config(tf_cfg)
+            weights.append(tf_cfg.weight)
+
+        self.n_subset = min(len(self.transforms), cfg.max_num_transforms)
+        self.enabled = cfg.enable and self.n_subset > 0
+        self.p = torch.tensor(weights, dtype=torch.float32, device=self.device)
+
+    def _uniform(self, num_samples: int, bounds: Sequence[float], ndim: int) -> torch.Tensor:
+        factors = torch.empty(num_samples, device=self.device).uniform_(*bounds, generator=self.generator)
+        return factors.view(num_samples, *[1] * (ndim - 1))
+
+    def _apply_in_order(self, images: torch.Tensor, order: torch.Tensor, fns: list[Callable]) -> torch.Tensor:
+        """Applies to each image i the functions fns[order[i, 0]], fns[order[i, 1]], etc."""
+        for position in range(order.shape[1]):
+            for fn_idx, fn in enumerate(fns):
+                mask = order[:, position] == fn_idx
+                if mask.any():
+                    images[mask] = fn(images[mask], mask)
+        return images
+
+    def _apply_transform(self, transform: Transform, images: torch.Tensor) -> torch.Tensor:
+        num_samples, ndim = images.shape[0], images.ndim
+        if isinstance(transform, v2.Identity):
+            return images
+        if isinstance(transform, SharpnessJitter):
+            return adjust_sharpness(images, self._uniform(num_samples, transform.sharpness, ndim))
+        if isinstance(transform, v2.ColorJitter):
+            # Like v2.ColorJitter, the adjustments are applied in a random order.
+            fns = []
+            for attr, adjust in [
+                ("brightness", adjust_brightness),
+                ("contrast", adjust_contrast),
+                ("saturation", adjust_saturation),
+                ("hue", adjust_hue),
+            ]:
+                bounds = getattr(transform, attr)
+                if bounds is not None:
+                    factors = self._uniform(num_samples, bounds, ndim)
+                    fns.append(lambda x, mask, adjust=adjust, factors=factors: adjust(x, factors[mask]))
+            order = torch.rand(num_samples, len(fns), device=self.device, generator=self.generator).argsort(1)
+            return self._apply_in_order(images, order, fns)
+        raise ValueError(f"Transform '{type(transform).__name__}' has no batched implementation.")
+
+    def transform_images(self, images: torch.Tensor) -> torch.Tensor:
+        """Transforms a (B, ..., C, H, W) batch of float images, each of the B samples independently."""
+        if not self.enabled:
+            return images
+
+        selected = torch.multinomial(
+            self.p.expand(images.shape[0], -1), self.n_subset, generator=self.generator
+        )
+        if not self._cfg.random_order:
+            selected = selected.sort(dim=1).values
+
+        fns = [
+            lambda x, mask, transform=transform: self._apply_transform(transform, x)
+            for transform in self.transforms.values()
+        ]
+        return self._apply_in_order(images.clone(), selected, fns)
+
+    def __call__(self, batch: dict, camera_keys: list[str]) -> dict:
+        """Transforms the images of 'camera_keys' in 'batch'. Cameras with the same image shape are
+        transformed together."""
+        keys_by_shape = collections.defaultdict(list)
+        for key in camera_keys:
+            if key in batch:
+                keys_by_shape[batch[key].shape].append(key)
+
+        for keys in keys_by_shape.values():
+            images = self.transform_images(torch.cat([batch[key] for key in keys]))
+            for key, key_images in zip(keys, images.chunk(len(keys)), strict=True):
+                batch[key] = key_images
+        return batch
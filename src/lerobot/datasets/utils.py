@@ -17,6 +17,7 @@ import contextlib
 import importlib.resources
 import json
 import logging
+import os
 from collections.abc import Iterator
 from itertools import accumulate
 from pathlib import Path
@@ -54,6 +55,12 @@ TASKS_PATH = "meta/tasks.jsonl"
 DEFAULT_VIDEO_PATH = "videos/chunk-{episode_chunk:03d}/{video_key}/episode_{episode_index:06d}.mp4"
 DEFAULT_PARQUET_PATH = "data/chunk-{episode_chunk:03d}/episode_{episode_index:06d}.parquet"
 DEFAULT_IMAGE_PATH = "images/{image_key}/episode_{episode_index:06d}/frame_{frame_index:06d}.png"
+DEFAULT_FRAME_TABLE_PATH = "cache/frame_table/{selection}"
+DEFAULT_FRAME_STORE_PATH = "cache/frames"
+DEFAULT_MERGED_STATS_PATH = "cache/merged_stats/{key}.json"
+DEFAULT_PENDING_EPISODE_PATH = "cache/pending_episodes/episode_{episode_index:06d}.pkl"
+RECORDING_LOCK_PATH = "cache/recording.lock"
+DEFAULT_TIMINGS_PATH = "timings/episode_{episode_index:06d}.json"
 
 DATASET_CARD_TEMPLATE = """
 ---
@@ -157,6 +164,21 @@ def load_jsonlines(fpath: Path) -> list[Any]:
         return list(reader)
 
 
+def load_last_jsonline(fpath: Path, block_size: int = 4096) -> Any | None:
+    """Loads the last line of a jsonlines file, reading it backwards from its end so that the time doesn't depend
+    on the size of the file. Returns None if the file is empty."""
+    with open(fpath, "rb") as f:
+        position = f.seek(0, os.SEEK_END)
+        tail = b""
+        while position > 0 and b"\n" not in tail.rstrip(b"\n"):
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            tail = f.read(step) + tail
+    last_line = tail.rstrip(b"\n").rsplit(b"\n", 1)[-1]
+    return json.loads(last_line) if last_line.strip() else None
+
+
 def write_jsonlines(data: dict, fpath: Path) -> None:
     fpath.parent.mkdir(exist_ok=True, parents=True)
     with jsonlines.open(fpath, "w") as writer:
@@ -221,6 +243,13 @@ def load_episodes(local_dir: Path) -> dict:
     return {item["episode_index"]: item for item in sorted(episodes, key=lambda x: x["episode_index"])}
 
 
+def load_last_episode(local_dir: Path) -> dict:
+    """Same as `load_episodes`, but only with the last episode written."""
+    fpath = local_dir / EPISODES_PATH
+    episode = load_last_jsonline(fpath) if fpath.is_file() else None
+    return {episode["episode_index"]: episode} if episode is not None else {}
+
+
 def write_episode_stats(episode_index: int, episode_stats: dict, local_dir: Path):
     # We wrap episode_stats in a dictionary since `episode_stats["episode_index"]`
     # is a dictionary of stats and not an integer.
@@ -228,6 +257,37 @@ def write_episode_stats(episode_index: int, episode_stats: dict, local_dir: Path
     append_jsonlines(episode_stats, local_dir / EPISODES_STATS_PATH)
 
 
+def remove_uncommitted_episodes(local_dir: Path, total_episodes: int) -> None:
+    """Removes the entries of the episodes not counted in info.json from the episodes and episodes stats files.
+
+    info.json is written last when an episode is saved, so these entries (including a truncated last line) were
+    left by a save interrupted before writing it.
+    """
+    for fpath in [local_dir / EPISODES_PATH, local_dir / EPISODES_STATS_PATH]:
+        if not fpath.is_file():
+            continue
+        try:
+            last_item = load_last_jsonline(fpath)
+            if last_item is None or last_item["episode_index"] < total_episodes:
+                continue
+        except json.JSONDecodeError:
+            pass
+
+        committed_lines = []
+        with open(fpath) as f:
+            for line in f:
+                try:
+                    item = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                if item["episode_index"] < total_episodes:
+                    committed_lines.append(line.rstrip("\n") + "\n")
+        tmp_path = fpath.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            f.writelines(committed_lines)
+        os.replace(tmp_path, fpath)
+
+
 def load_episodes_stats(local_dir: Path) -> dict:
     episodes_stats = load_jsonlines(local_dir / EPISODES_STATS_PATH)
     return {
@@ -245,8 +305,12 @@ def backward_compatible_episodes_stats(
 def load_image_as_numpy(
     fpath: str | Path, dtype: np.dtype = np.float32, channel_first: bool = True
 ) -> np.ndarray:
-    img = PILImage.open(fpath).convert("RGB")
-    img_array = np.array(img, dtype=dtype)
+    if Path(fpath).suffix == ".npy":
+        # Raw uint8 (H, W, C) frame written by the image writer
+        img_array = np.load(fpath, mmap_mode="r").astype(dtype)
+    else:
+        img = PILImage.open(fpath).convert("RGB")
+        img_array = np.array(img, dtype=dtype)
     if channel_first:  # (H, W, C) -> (C, H, W)
         img_array = np.transpose(img_array, (2, 0, 1))
     if np.issubdtype(dtype, np.floating):
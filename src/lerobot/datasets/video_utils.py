@@ -16,19 +16,31 @@
 import glob
 import importlib
 import logging
+import multiprocessing
+import os
+import queue
 import shutil
+import threading
+import time
 import warnings
+from collections import OrderedDict
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, ClassVar
 
 import av
+import numpy as np
 import pyarrow as pa
 import torch
 import torchvision
 from datasets.features.features import register_feature
 from PIL import Image
 
+from lerobot.datasets.image_writer import FRAME_CODECS
+from lerobot.datasets.utils import load_image_as_numpy
+
 
 def get_safe_default_codec():
     if importlib.util.find_spec("torchcodec"):
@@ -37,11 +49,89 @@ def get_safe_default_codec():
         raise ImportError("TorchCodec is not available in your environment. Please install torchcodec and ensure all dependencies are compatible.")
 
 
+class VideoDecoderCache:
+    """Bounded, per-process LRU pool of open torchcodec `VideoDecoder`s keyed by video path.
+
+    Opening a decoder parses the container header and builds its frame index, which costs more than
+    decoding a few frames when training with random access on many short episode files. Keeping the most
+    recently used decoders open avoids paying this cost on every sample.
+
+    Decoders can't be shared across processes: the pool is emptied when it is used in a new process (e.g. a
+    forked dataloader worker) and it is pickled without its decoders.
+
+    Args:
+        capacity (int): Maximum number of decoders kept open. The least recently used one is closed first.
+    """
+
+    def __init__(self, capacity: int = 16):
+        if capacity < 1:
+            raise ValueError(f"The capacity of the decoder cache should be at least 1 ({capacity=}).")
+        self.capacity = capacity
+        self._reset()
+
+    def _reset(self) -> None:
+        self._decoders = OrderedDict()
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self.hits = 0
+        self.misses = 0
+
+    def __getstate__(self) -> dict:
+        return {"capacity": self.capacity}
+
+    def __setstate__(self, state: dict) -> None:
+        self.capacity = state["capacity"]
+        self._reset()
+
+    def __len__(self) -> int:
+        return len(self._decoders)
+
+    def _open(self, video_path: str, device: str):
+        if importlib.util.find_spec("torchcodec"):
+            from torchcodec.decoders import VideoDecoder
+        else:
+            raise ImportError("torchcodec is required but not available.")
+
+        return VideoDecoder(video_path, device=device, seek_mode="approximate")
+
+    def get(self, video_path: Path | str, device: str = "cpu"):
+        """Returns an open decoder for 'video_path', opening it (and evicting the oldest one) if needed."""
+        if os.getpid() != self._pid:
+            # Decoders inherited from the parent process after a fork are not safe to use.
+            self._reset()
+
+        key = (str(video_path), device)
+        with self._lock:
+            decoder = self._decoders.get(key)
+            if decoder is not None:
+                self._decoders.move_to_end(key)
+                self.hits += 1
+                return decoder
+
+            self.misses += 1
+            decoder = self._open(str(video_path), device)
+            self._decoders[key] = decoder
+            if len(self._decoders) > self.capacity:
+                self._decoders.popitem(last=False)
+            return decoder
+
+    def clear(self) -> None:
+        with self._lock:
+            self._decoders.clear()
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(capacity={self.capacity}, size={len(self)}, "
+            f"hits={self.hits}, misses={self.misses})"
+        )
+
+
 def decode_video_frames(
     video_path: Path | str,
     timestamps: list[float],
     tolerance_s: float,
     backend: str | None = None,
+    decoder_cache: VideoDecoderCache | None = None,
 ) -> torch.Tensor:
     """
     Decodes video frames using the specified backend.
@@ -51,6 +141,8 @@ def decode_video_frames(
         timestamps (list[float]): List of timestamps to extract frames.
         tolerance_s (float): Allowed deviation in seconds for frame retrieval.
         backend (str, optional): Backend to use for decoding. Defaults to "torchcodec" when available in the platform; otherwise, defaults to "pyav"..
+        decoder_cache (VideoDecoderCache, optional): Pool of open decoders to reuse. Only used by the
+            "torchcodec" backend. Defaults to None, which opens a new decoder for every call.
 
     Returns:
         torch.Tensor: Decoded frames.
@@ -60,7 +152,9 @@ def decode_video_frames(
     if backend is None:
         backend = get_safe_default_codec()
     if backend == "torchcodec":
-        return decode_video_frames_torchcodec(video_path, timestamps, tolerance_s)
+        return decode_video_frames_torchcodec(
+            video_path, timestamps, tolerance_s, decoder_cache=decoder_cache
+        )
     elif backend in ["pyav", "video_reader"]:
         return decode_video_frames_torchvision(video_path, timestamps, tolerance_s, backend)
     else:
@@ -171,11 +265,19 @@ def decode_video_frames_torchcodec(
     tolerance_s: float,
     device: str = "cpu",
     log_loaded_timestamps: bool = False,
+    decoder_cache: VideoDecoderCache | None = None,
 ) -> torch.Tensor:
     """Loads frames associated with the requested timestamps of a video using torchcodec.
 
     Note: Setting device="cuda" outside the main process, e.g. in data loader workers, will lead to CUDA initialization errors.
 
+    Note: When 'decoder_cache' is provided, the decoder of 'video_path' is taken from it (and kept open for
+    the next calls) instead of being created for this call only.
+
+    Note: When the requested frames form a contiguous range (e.g. consecutive `delta_timestamps`), they are
+    decoded as a single clip, going forward once from the preceding key frame. Frames requested several times
+    are only decoded once.
+
     Note: Video benefits from inter-frame compression. Instead of storing every frame individually,
     the encoder stores a reference frame (or a key frame) and subsequent frames as differences relative to
     that key frame. As a consequence, to access a requested frame, we need to load the preceding key frame,
@@ -183,37 +285,43 @@ def decode_video_frames_torchcodec(
     can be adjusted during encoding to take into account decoding time and video size in bytes.
     """
 
-    if importlib.util.find_spec("torchcodec"):
+    # initialize video decoder
+    if decoder_cache is not None:
+        decoder = decoder_cache.get(video_path, device=device)
+    elif importlib.util.find_spec("torchcodec"):
         from torchcodec.decoders import VideoDecoder
+
+        decoder = VideoDecoder(video_path, device=device, seek_mode="approximate")
     else:
         raise ImportError("torchcodec is required but not available.")
 
-    # initialize video decoder
-    decoder = VideoDecoder(video_path, device=device, seek_mode="approximate")
-    loaded_frames = []
-    loaded_ts = []
     # get metadata for frame information
     metadata = decoder.metadata
     average_fps = metadata.average_fps
 
-    # convert timestamps to frame indices
+    # convert timestamps to frame indices, each frame being decoded only once even if queried several times
     frame_indices = [round(ts * average_fps) for ts in timestamps]
+    unique_indices = sorted(set(frame_indices))
+    position_in_loaded = {idx: i for i, idx in enumerate(unique_indices)}
+    query_to_loaded = torch.tensor([position_in_loaded[idx] for idx in frame_indices])
 
     # retrieve frames based on indices
-    frames_batch = decoder.get_frames_at(indices=frame_indices)
-
-    for frame, pts in zip(frames_batch.data, frames_batch.pts_seconds, strict=False):
-        loaded_frames.append(frame)
-        loaded_ts.append(pts.item())
-        if log_loaded_timestamps:
-            logging.info(f"Frame loaded at timestamp={pts:.4f}")
+    if unique_indices[-1] - unique_indices[0] + 1 == len(unique_indices):
+        # Contiguous clip (e.g. `n_obs_steps` consecutive frames): decode it in one forward pass from the
+        # nearest key frame instead of seeking for each frame.
+        frames_batch = decoder.get_frames_in_range(start=unique_indices[0], stop=unique_indices[-1] + 1)
+    else:
+        frames_batch = decoder.get_frames_at(indices=unique_indices)
 
     query_ts = torch.tensor(timestamps)
-    loaded_ts = torch.tensor(loaded_ts)
+    loaded_ts = frames_batch.pts_seconds
+    if log_loaded_timestamps:
+        for pts in loaded_ts:
+            logging.info(f"Frame loaded at timestamp={pts:.4f}")
 
-    # compute distances between each query timestamp and loaded timestamps
-    dist = torch.cdist(query_ts[:, None], loaded_ts[:, None], p=1)
-    min_, argmin_ = dist.min(1)
+    # each query timestamp maps to the frame at its own index
+    closest_ts = loaded_ts[query_to_loaded]
+    min_ = (closest_ts - query_ts).abs()
 
     is_within_tol = min_ < tolerance_s
     assert is_within_tol.all(), (
@@ -227,8 +335,7 @@ def decode_video_frames_torchcodec(
     )
 
     # get closest frames to the query timestamps
-    closest_frames = torch.stack([loaded_frames[idx] for idx in argmin_])
-    closest_ts = loaded_ts[argmin_]
+    closest_frames = frames_batch.data[query_to_loaded]
 
     if log_loaded_timestamps:
         logging.info(f"{closest_ts=}")
@@ -240,28 +347,19 @@ def decode_video_frames_torchcodec(
     return closest_frames
 
 
-def encode_video_frames(
-    imgs_dir: Path | str,
-    video_path: Path | str,
-    fps: int,
+def get_video_encoding_options(
     vcodec: str = "libsvtav1",
     pix_fmt: str = "yuv420p",
     g: int | None = 2,
     crf: int | None = 30,
     fast_decode: int = 0,
-    log_level: int | None = av.logging.ERROR,
-    overwrite: bool = False,
-) -> None:
-    """More info on ffmpeg arguments tuning on `benchmark/video/README.md`"""
+    num_threads: int | None = None,
+) -> tuple[str, dict[str, str]]:
+    """Returns the pixel format and the codec options used to encode videos with PyAV."""
     # Check encoder availability
     if vcodec not in ["h264", "hevc", "libsvtav1"]:
         raise ValueError(f"Unsupported video codec: {vcodec}. Supported codecs are: h264, hevc, libsvtav1.")
 
-    video_path = Path(video_path)
-    imgs_dir = Path(imgs_dir)
-
-    video_path.parent.mkdir(parents=True, exist_ok=overwrite)
-
     # Encoders/pixel formats incompatibility check
     if (vcodec == "libsvtav1" or vcodec == "hevc") and pix_fmt == "yuv444p":
         logging.warning(
@@ -269,18 +367,6 @@ def encode_video_frames(
         )
         pix_fmt = "yuv420p"
 
-    # Get input frames
-    template = "frame_" + ("[0-9]" * 6) + ".png"
-    input_list = sorted(
-        glob.glob(str(imgs_dir / template)), key=lambda x: int(x.split("_")[-1].split(".")[0])
-    )
-
-    # Define video output frame size (assuming all input frames are the same size)
-    if len(input_list) == 0:
-        raise FileNotFoundError(f"No images found in {imgs_dir}.")
-    dummy_image = Image.open(input_list[0])
-    width, height = dummy_image.size
-
     # Define video codec options
     video_options = {}
 
@@ -295,6 +381,56 @@ def encode_video_frames(
         value = f"fast-decode={fast_decode}" if vcodec == "libsvtav1" else "fastdecode"
         video_options[key] = value
 
+    if num_threads is not None:
+        if vcodec == "libsvtav1":
+            # SVT-AV1 ignores the generic 'threads' option and uses all the cores by default
+            params = [video_options["svtav1-params"]] if "svtav1-params" in video_options else []
+            video_options["svtav1-params"] = ":".join([*params, f"lp={num_threads}"])
+        else:
+            video_options["threads"] = str(num_threads)
+
+    return pix_fmt, video_options
+
+
+def get_frame_paths(imgs_dir: Path | str) -> list[str]:
+    """Returns the frames written in 'imgs_dir' by the image writer, in any `FrameFormat`, sorted by index."""
+    template = "frame_" + ("[0-9]" * 6) + ".*"
+    suffixes = tuple(FRAME_CODECS.values())
+    return sorted(
+        (path for path in glob.glob(str(Path(imgs_dir) / template)) if path.endswith(suffixes)),
+        key=lambda x: int(x.split("_")[-1].split(".")[0]),
+    )
+
+
+def encode_video_frames(
+    imgs_dir: Path | str,
+    video_path: Path | str,
+    fps: int,
+    vcodec: str = "libsvtav1",
+    pix_fmt: str = "yuv420p",
+    g: int | None = 2,
+    crf: int | None = 30,
+    fast_decode: int = 0,
+    log_level: int | None = av.logging.ERROR,
+    overwrite: bool = False,
+    num_threads: int | None = None,
+) -> None:
+    """More info on ffmpeg arguments tuning on `benchmark/video/README.md`"""
+    pix_fmt, video_options = get_video_encoding_options(vcodec, pix_fmt, g, crf, fast_decode, num_threads)
+
+    video_path = Path(video_path)
+    imgs_dir = Path(imgs_dir)
+
+    video_path.parent.mkdir(parents=True, exist_ok=overwrite)
+
+    # Get input frames
+    input_list = get_frame_paths(imgs_dir)
+
+    # Define video output frame size (assuming all input frames are the same size)
+    if len(input_list) == 0:
+        raise FileNotFoundError(f"No images found in {imgs_dir}.")
+    height, width = load_image_as_numpy(input_list[0], dtype=np.uint8, channel_first=False).shape[:2]
+
     # Set logging level
     if log_level is not None:
         # "While less efficient, it is generally preferable to modify logging with Python’s logging"
@@ -309,8 +445,8 @@ def encode_video_frames(
 
         # Loop through input frames and encode them
         for input_data in input_list:
-            input_image = Image.open(input_data).convert("RGB")
-            input_frame = av.VideoFrame.from_image(input_image)
+            input_image = load_image_as_numpy(input_data, dtype=np.uint8, channel_first=False)
+            input_frame = av.VideoFrame.from_ndarray(input_image, format="rgb24")
             packet = output_stream.encode(input_frame)
             if packet:
                 output.mux(packet)
@@ -328,6 +464,202 @@ def encode_video_frames(
         raise OSError(f"Video encoding did not work. File not found: {video_path}.")
 
 
+@dataclass
+class VideoEncodingJob:
+    """Frames of one (episode, camera) pair to encode with `encode_video_frames`."""
+
+    imgs_dir: Path
+    video_path: Path
+    fps: int
+
+
+def _encode_video_job(job: VideoEncodingJob, num_threads: int | None) -> tuple[int, float]:
+    start = time.perf_counter()
+    encode_video_frames(job.imgs_dir, job.video_path, job.fps, overwrite=True, num_threads=num_threads)
+    num_frames = len(get_frame_paths(job.imgs_dir))
+    return num_frames, time.perf_counter() - start
+
+
+def encode_videos(
+    jobs: list[VideoEncodingJob],
+    num_workers: int | None = None,
+    threads_per_job: int | None = 4,
+    use_processes: bool = True,
+) -> Iterator[VideoEncodingJob]:
+    """Encodes several videos concurrently, and yields each job as soon as its video is written.
+
+    A single encoder doesn't use all the cores of a large machine at the resolutions of our cameras, so the
+    cores are shared between 'num_workers' encoders using 'threads_per_job' threads each.
+
+    Args:
+        jobs (list[VideoEncodingJob]): Videos to encode, e.g. one per (episode, camera) pair.
+        num_workers (int | None, optional): Number of videos encoded at the same time. Defaults to None, which
+            divides the cores of the machine between jobs of 'threads_per_job' threads.
+        threads_per_job (int | None, optional): Number of threads used by each encoder. None lets the encoder
+            use all the cores. Defaults to 4.
+        use_processes (bool, optional): Encode in a pool of processes rather than of threads. A process pool is
+            slower to start, so threads are preferable to encode the few videos of a single episode. Defaults
+            to True.
+    """
+    if num_workers is None:
+        num_workers = max(1, (os.cpu_count() or 1) // (threads_per_job or os.cpu_count() or 1))
+    num_workers = min(num_workers, len(jobs))
+
+    def log_progress(i: int, job: VideoEncodingJob, num_frames: int, elapsed: float) -> None:
+        logging.info(
+            f"Encoded video {i}/{len(jobs)} '{job.video_path}': {num_frames} frames in {elapsed:.1f}s "
+            f"({num_frames / elapsed:.1f} frames/s)"
+        )
+
+    if num_workers <= 1:
+        for i, job in enumerate(jobs, 1):
+            log_progress(i, job, *_encode_video_job(job, threads_per_job))
+            yield job
+        return
+
+    if use_processes:
+        # Forking a process which runs threads (e.g. the image writer) is unsafe.
+        executor = ProcessPoolExecutor(num_workers, mp_context=multiprocessing.get_context("spawn"))
+    else:
+        executor = ThreadPoolExecutor(num_workers)
+    with executor:
+        futures = {executor.submit(_encode_video_job, job, threads_per_job): job for job in jobs}
+        for i, future in enumerate(as_completed(futures), 1):
+            log_progress(i, futures[future], *future.result())
+            yield futures[future]
+
+
+class StreamingVideoEncoder:
+    """Encodes the frames of one camera into an mp4 file while they are being recorded.
+
+    Frames are handed over through a bounded queue to a background thread which owns the PyAV container, so
+    that recording never writes intermediate PNG files and the video is ready as soon as the episode ends. The
+    video is written to a temporary file which is only moved to 'video_path' by `finish`, so that an aborted
+    or crashed episode never leaves a truncated video behind.
+
+    A strided subset of the frames, downsampled like in `compute_stats.sample_images`, is kept in
+    `sampled_frames` to compute the episode statistics without decoding the video.
+
+    Args:
+        video_path (Path | str): Path of the encoded video.
+        fps (int): Frame rate of the video.
+        queue_size (int, optional): Maximum number of frames waiting to be encoded. `add_frame` blocks when the
+            encoder falls behind by more frames than this. Defaults to 64.
+        max_sampled_frames (int, optional): Maximum number of frames kept for the statistics, or 0 to keep none.
+            Defaults to 1000.
+        The other arguments are the same as in `encode_video_frames`.
+    """
+
+    def __init__(
+        self,
+        video_path: Path | str,
+        fps: int,
+        vcodec: str = "libsvtav1",
+        pix_fmt: str = "yuv420p",
+        g: int | None = 2,
+        crf: int | None = 30,
+        fast_decode: int = 0,
+        queue_size: int = 64,
+        max_sampled_frames: int = 1000,
+    ):
+        self.video_path = Path(video_path)
+        self.tmp_path = self.video_path.with_name(f"{self.video_path.stem}.tmp{self.video_path.suffix}")
+        self.fps = fps
+        self.vcodec = vcodec
+        self.pix_fmt, self.video_options = get_video_encoding_options(vcodec, pix_fmt, g, crf, fast_decode)
+        self.max_sampled_frames = max_sampled_frames
+
+        self.num_frames = 0
+        self.sampled_frames = []
+        self._sampling_stride = 1
+        self._error = None
+        self._aborted = False
+        self._closed = False
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+        self._thread.start()
+
+    def _worker(self) -> None:
+        output = None
+        stream = None
+        while True:
+            frame = self._queue.get()
+            if frame is None:
+                break
+            if self._error is not None or self._aborted:
+                # Keep draining the queue so that producers never block.
+                continue
+            try:
+                if output is None:
+                    self.video_path.parent.mkdir(parents=True, exist_ok=True)
+                    output = av.open(str(self.tmp_path), "w")
+                    stream = output.add_stream(self.vcodec, self.fps, options=self.video_options)
+                    stream.pix_fmt = self.pix_fmt
+                    stream.height, stream.width = frame.shape[:2]
+                packet = stream.encode(av.VideoFrame.from_ndarray(frame, format="rgb24"))
+                if packet:
+                    output.mux(packet)
+            except Exception as e:
+                self._error = e
+
+        if output is None:
+            return
+        try:
+            if self._error is None and not self._aborted:
+                # Flush the encoder
+                packet = stream.encode()
+                if packet:
+                    output.mux(packet)
+            output.close()
+        except Exception as e:
+            self._error = self._error or e
+
+    def _sample(self, frame: np.ndarray) -> None:
+        if self.max_sampled_frames == 0 or self.num_frames % self._sampling_stride != 0:
+            return
+        height, width = frame.shape[:2]
+        # Same downsampling as `compute_stats.auto_downsample_height_width`
+        factor = max(height, width) // 150 if max(height, width) >= 300 else 1
+        self.sampled_frames.append(np.ascontiguousarray(frame[::factor, ::factor].transpose(2, 0, 1)))
+        if len(self.sampled_frames) >= self.max_sampled_frames:
+            # Keep every other sample and halve the sampling rate of the upcoming frames.
+            self.sampled_frames = self.sampled_frames[::2]
+            self._sampling_stride *= 2
+
+    def add_frame(self, frame: np.ndarray) -> None:
+        """Queues a (height, width, 3) uint8 RGB frame for encoding."""
+        if self._closed:
+            raise RuntimeError(f"The encoder of '{self.video_path}' is already closed.")
+        if self._error is not None:
+            raise RuntimeError(f"Video encoding of '{self.video_path}' failed.") from self._error
+        self._sample(frame)
+        self.num_frames += 1
+        self._queue.put(frame)
+
+    def _close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+        self._thread.join()
+
+    def finish(self) -> Path:
+        """Waits for all the queued frames to be encoded and moves the video to its final path."""
+        self._close()
+        if self._error is not None:
+            self.tmp_path.unlink(missing_ok=True)
+            raise RuntimeError(f"Video encoding of '{self.video_path}' failed.") from self._error
+        if self.num_frames == 0:
+            raise RuntimeError(f"No frames were added to the encoder of '{self.video_path}'.")
+        os.replace(self.tmp_path, self.video_path)
+        return self.video_path
+
+    def abort(self) -> None:
+        """Stops encoding and removes the partially encoded video."""
+        self._aborted = True
+        self._close()
+        self.tmp_path.unlink(missing_ok=True)
+
+
 @dataclass
 class VideoFrame:
     # TODO(rcadene, lhoestq): move to Hugging Face `datasets` repo
@@ -456,8 +788,9 @@ class VideoEncodingManager:
     Context manager that ensures proper video encoding and data cleanup even if exceptions occur.
 
     This manager handles:
+    - Waiting for the episodes being finalized in the background
     - Batch encoding for any remaining episodes when recording interrupted
-    - Cleaning up temporary image files from interrupted episodes
+    - Cleaning up temporary image files and partially encoded videos from interrupted episodes
     - Removing empty image directories
 
     Args:
@@ -471,6 +804,11 @@ class VideoEncodingManager:
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        # Commit the episodes which are still being finalized in the background
+        if self.dataset.episode_finalizer is not None:
+            logging.info(f"Waiting for {self.dataset.num_pending_episodes} episodes to be finalized...")
+            self.dataset.stop_episode_finalizer()
+
         # Handle any remaining episodes that haven't been batch encoded
         if self.dataset.episodes_since_last_encoding > 0:
             if exc_type is not None:
@@ -486,8 +824,11 @@ class VideoEncodingManager:
             )
             self.dataset.batch_encode_videos(start_ep, end_ep)
 
-        # Clean up episode images if recording was interrupted
+        # Clean up episode images and partially encoded videos if recording was interrupted
         if exc_type is not None:
+            for encoder in self.dataset.video_encoders.values():
+                encoder.abort()
+            self.dataset.video_encoders = {}
             interrupted_episode_index = self.dataset.num_episodes
             for key in self.dataset.meta.video_keys:
                 img_dir = self.dataset._get_image_file_path(
@@ -501,14 +842,14 @@ class VideoEncodingManager:
 
         # Clean up any remaining images directory if it's empty
         img_dir = self.dataset.root / "images"
-        # Check for any remaining PNG files
-        png_files = list(img_dir.rglob("*.png"))
-        if len(png_files) == 0:
-            # Only remove the images directory if no PNG files remain
+        # Check for any remaining frame files
+        frame_files = list(img_dir.rglob("frame_*"))
+        if len(frame_files) == 0:
+            # Only remove the images directory if no frame files remain
             if img_dir.exists():
                 shutil.rmtree(img_dir)
                 logging.debug("Cleaned up empty images directory")
         else:
-            logging.debug(f"Images directory is not empty, containing {len(png_files)} PNG files")
+            logging.debug(f"Images directory is not empty, containing {len(frame_files)} frame files")
 
         return False  # Don't suppress the original exception
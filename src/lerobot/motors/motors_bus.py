@@ -21,13 +21,16 @@
 
 import abc
 import logging
+import time
 from contextlib import contextmanager
 from dataclasses import dataclass
 from enum import Enum
 from functools import cached_property
 from pprint import pformat
+from threading import Event, Lock, Thread
 from typing import Protocol, TypeAlias
 
+import numpy as np
 import serial
 from deepdiff import DeepDiff
 from tqdm import tqdm
@@ -99,6 +102,48 @@ class Motor:
     norm_mode: MotorNormMode
 
 
+@dataclass
+class CalibrationArrays:
+    """Calibration of a selection of motors compiled into arrays, so that their values are normalized and
+    unnormalized with a few vectorized operations instead of a loop over the motors.
+
+    The operations of `MotorsBus._normalize` and `MotorsBus._unnormalize` are applied in the same order on
+    float64 arrays, so that the results are the same as with Python floats, bit for bit.
+    """
+
+    range_min: np.ndarray
+    range_max: np.ndarray
+    range_span: np.ndarray
+    mid: np.ndarray
+    max_res: np.ndarray
+    # RANGE_M100_100: ((x - min) / span) * 200 - 100, RANGE_0_100: ((x - min) / span) * 100 - 0
+    norm_scale: np.ndarray
+    norm_offset: np.ndarray
+    # Bounds of the normalized values, infinite for DEGREES
+    norm_min: np.ndarray
+    norm_max: np.ndarray
+    # Inversions of the drive mode: RANGE_M100_100 values are negated, RANGE_0_100 values are reflected (100 - x)
+    negate: np.ndarray
+    reflect: np.ndarray
+    degrees: np.ndarray
+    has_negate: bool
+    has_reflect: bool
+    has_degrees: bool
+
+
+@dataclass(frozen=True)
+class PolledState:
+    """Values of the registers polled by the background thread of a `MotorsBus`, read at 'timestamp'
+    (`time.perf_counter()` when the read was sent)."""
+
+    values: dict[str, dict[str, Value]]
+    timestamp: float
+
+    @property
+    def age_s(self) -> float:
+        return time.perf_counter() - self.timestamp
+
+
 class JointOutOfRangeError(Exception):
     def __init__(self, message="Joint is out of range"):
         self.message = message
@@ -268,12 +313,13 @@ class MotorsBus(abc.ABC):
     ):
         self.port = port
         self.motors = motors
-        self.calibration = calibration if calibration else {}
 
         self.port_handler: PortHandler
         self.packet_handler: PacketHandler
         self.sync_reader: GroupSyncRead
         self.sync_writer: GroupSyncWrite
+        self._sync_readers: dict[tuple[tuple[int, ...], int, int], GroupSyncRead] = {}
+        self._sync_writers: dict[tuple[tuple[int, ...], int, int], GroupSyncWrite] = {}
         self._comm_success: int
         self._no_error: int
 
@@ -283,6 +329,17 @@ class MotorsBus(abc.ABC):
 
         self._validate_motors()
 
+        self._calibration_arrays: dict[tuple[int, ...], CalibrationArrays] = {}
+        self.calibration = calibration if calibration else {}
+
+        self.poll_thread: Thread | None = None
+        self.poll_stop_event: Event | None = None
+        self.new_state_event: Event = Event()
+        self.latest_state: PolledState | None = None
+        self._poll_data_names: list[str] = []
+        self._pending_writes: dict[tuple[str, bool], dict[str, Value]] = {}
+        self._pending_writes_lock: Lock = Lock()
+
     def __len__(self):
         return len(self.motors)
 
@@ -294,6 +351,25 @@ class MotorsBus(abc.ABC):
             ")',\n"
         )
 
+    @property
+    def calibration(self) -> dict[str, MotorCalibration]:
+        """Calibration of the motors, used to normalize their values.
+
+        It has to be set again after modifying it in place, so that its compiled arrays are updated.
+        """
+        return self._calibration
+
+    @calibration.setter
+    def calibration(self, calibration: dict[str, MotorCalibration]) -> None:
+        self._calibration = calibration
+        self._calibration_arrays = {}
+        if calibration:
+            try:
+                self._get_calibration_arrays(tuple(self.ids))
+            except (KeyError, ValueError, NotImplementedError):
+                # Partial or invalid calibrations only raise when the motors concerned are (un)normalized.
+                pass
+
     @cached_property
     def _has_different_ctrl_tables(self) -> bool:
         if len(self.models) < 2:
@@ -466,6 +542,9 @@ class MotorsBus(abc.ABC):
                 f"{self.__class__.__name__}('{self.port}') is not connected. Try running `{self.__class__.__name__}.connect()` first."
             )
 
+        if self.is_polling:
+            self.stop_polling()
+
         if disable_torque:
             self.port_handler.clearPort()
             self.port_handler.is_using = False
@@ -773,64 +852,84 @@ class MotorsBus(abc.ABC):
 
         return mins, maxes
 
-    def _normalize(self, ids_values: dict[int, int]) -> dict[int, float]:
-        if not self.calibration:
-            raise RuntimeError(f"{self} has no calibration registered.")
+    def _get_calibration_arrays(self, ids: tuple[int, ...]) -> CalibrationArrays:
+        """Calibration of the motors 'ids' compiled into arrays, cached until the calibration is set again."""
+        arrays = self._calibration_arrays.get(ids)
+        if arrays is not None:
+            return arrays
 
-        normalized_values = {}
-        for id_, val in ids_values.items():
+        rows = []
+        for id_ in ids:
             motor = self._id_to_name(id_)
-            min_ = self.calibration[motor].range_min
-            max_ = self.calibration[motor].range_max
-            drive_mode = self.apply_drive_mode and self.calibration[motor].drive_mode
+            calibration = self.calibration[motor]
+            min_, max_ = calibration.range_min, calibration.range_max
             if max_ == min_:
                 raise ValueError(f"Invalid calibration for motor '{motor}': min and max are equal.")
-
-            bounded_val = min(max_, max(min_, val))
-            if self.motors[motor].norm_mode is MotorNormMode.RANGE_M100_100:
-                norm = (((bounded_val - min_) / (max_ - min_)) * 200) - 100
-                normalized_values[id_] = -norm if drive_mode else norm
-            elif self.motors[motor].norm_mode is MotorNormMode.RANGE_0_100:
-                norm = ((bounded_val - min_) / (max_ - min_)) * 100
-                normalized_values[id_] = 100 - norm if drive_mode else norm
-            elif self.motors[motor].norm_mode is MotorNormMode.DEGREES:
-                mid = (min_ + max_) / 2
+            drive_mode = bool(self.apply_drive_mode and calibration.drive_mode)
+            norm_mode = self.motors[motor].norm_mode
+            max_res = np.nan
+            if norm_mode is MotorNormMode.RANGE_M100_100:
+                norm = (200.0, 100.0, -100.0, 100.0, drive_mode, False, False)
+            elif norm_mode is MotorNormMode.RANGE_0_100:
+                norm = (100.0, 0.0, 0.0, 100.0, False, drive_mode, False)
+            elif norm_mode is MotorNormMode.DEGREES:
+                norm = (1.0, 0.0, -np.inf, np.inf, False, False, True)
                 max_res = self.model_resolution_table[self._id_to_model(id_)] - 1
-                normalized_values[id_] = (val - mid) * 360 / max_res
             else:
                 raise NotImplementedError
+            rows.append((min_, max_, max_ - min_, (min_ + max_) / 2, max_res, *norm))
+
+        columns = [np.array(column, dtype=np.float64) for column in zip(*rows, strict=True)]
+        negate, reflect, degrees = (column.astype(bool) for column in columns[-3:])
+        arrays = CalibrationArrays(
+            *columns[:-3],
+            negate=negate,
+            reflect=reflect,
+            degrees=degrees,
+            has_negate=bool(negate.any()),
+            has_reflect=bool(reflect.any()),
+            has_degrees=bool(degrees.any()),
+        )
+        self._calibration_arrays[ids] = arrays
+        return arrays
 
-        return normalized_values
-
-    def _unnormalize(self, ids_values: dict[int, float]) -> dict[int, int]:
+    def _normalize(self, ids_values: dict[int, int]) -> dict[int, float]:
         if not self.calibration:
             raise RuntimeError(f"{self} has no calibration registered.")
 
-        unnormalized_values = {}
-        for id_, val in ids_values.items():
-            motor = self._id_to_name(id_)
-            min_ = self.calibration[motor].range_min
-            max_ = self.calibration[motor].range_max
-            drive_mode = self.apply_drive_mode and self.calibration[motor].drive_mode
-            if max_ == min_:
-                raise ValueError(f"Invalid calibration for motor '{motor}': min and max are equal.")
+        cal = self._get_calibration_arrays(tuple(ids_values))
+        values = np.fromiter(ids_values.values(), dtype=np.float64, count=len(ids_values))
+        bounded = np.fmin(cal.range_max, np.fmax(cal.range_min, values))
+        normalized = ((bounded - cal.range_min) / cal.range_span) * cal.norm_scale - cal.norm_offset
+        if cal.has_negate:
+            np.negative(normalized, out=normalized, where=cal.negate)
+        if cal.has_reflect:
+            np.subtract(100.0, normalized, out=normalized, where=cal.reflect)
+        if cal.has_degrees:
+            np.copyto(normalized, (values - cal.mid) * 360 / cal.max_res, where=cal.degrees)
 
-            if self.motors[motor].norm_mode is MotorNormMode.RANGE_M100_100:
-                val = -val if drive_mode else val
-                bounded_val = min(100.0, max(-100.0, val))
-                unnormalized_values[id_] = int(((bounded_val + 100) / 200) * (max_ - min_) + min_)
-            elif self.motors[motor].norm_mode is MotorNormMode.RANGE_0_100:
-                val = 100 - val if drive_mode else val
-                bounded_val = min(100.0, max(0.0, val))
-                unnormalized_values[id_] = int((bounded_val / 100) * (max_ - min_) + min_)
-            elif self.motors[motor].norm_mode is MotorNormMode.DEGREES:
-                mid = (min_ + max_) / 2
-                max_res = self.model_resolution_table[self._id_to_model(id_)] - 1
-                unnormalized_values[id_] = int((val * max_res / 360) + mid)
-            else:
-                raise NotImplementedError
+        return dict(zip(ids_values, normalized.tolist(), strict=True))
 
-        return unnormalized_values
+    def _unnormalize(self, ids_values: dict[int, float]) -> dict[int, int]:
+        if not self.calibration:
+            raise RuntimeError(f"{self} has no calibration registered.")
+
+        cal = self._get_calibration_arrays(tuple(ids_values))
+        values = np.fromiter(ids_values.values(), dtype=np.float64, count=len(ids_values))
+        # The values of DEGREES motors are never inverted
+        if cal.has_negate:
+            np.negative(values, out=values, where=cal.negate)
+        if cal.has_reflect:
+            np.subtract(100.0, values, out=values, where=cal.reflect)
+        bounded = np.fmin(cal.norm_max, np.fmax(cal.norm_min, values))
+        unnormalized = ((bounded + cal.norm_offset) / cal.norm_scale) * cal.range_span + cal.range_min
+        if cal.has_degrees:
+            np.copyto(unnormalized, (values * cal.max_res / 360) + cal.mid, where=cal.degrees)
+            # Unlike the other values, they are not bounded
+            if not np.isfinite(unnormalized).all():
+                raise ValueError(f"Cannot unnormalize non-finite values: {ids_values}")
+
+        return dict(zip(ids_values, unnormalized.astype(np.int64).tolist(), strict=True))
 
     @abc.abstractmethod
     def _encode_sign(self, data_name: str, ids_values: dict[int, int]) -> dict[int, int]:
@@ -1098,6 +1197,62 @@ class MotorsBus(abc.ABC):
 
         return {self._id_to_name(id_): value for id_, value in ids_values.items()}
 
+    def sync_read_many(
+        self,
+        data_names: list[str],
+        motors: str | list[str] | None = None,
+        *,
+        normalize: bool = True,
+        num_retry: int = 0,
+    ) -> dict[str, dict[str, Value]]:
+        """Read several registers from several motors at once, in a single transaction.
+
+        The contiguous span of addresses covering all the registers is read, and the value of each register is
+        then extracted from it, so this is best suited to adjacent registers (e.g. 'Present_Position',
+        'Present_Velocity' and 'Present_Current').
+
+        Args:
+            data_names (list[str]): Register names.
+            motors (str | list[str] | None, optional): Motors to query. `None` (default) reads every motor.
+            normalize (bool, optional): Normalisation flag.  Defaults to `True`.
+            num_retry (int, optional): Retry attempts.  Defaults to `0`.
+
+        Returns:
+            dict[str, dict[str, Value]]: Mapping *register name → motor name → value*.
+        """
+        if not self.is_connected:
+            raise DeviceNotConnectedError(
+                f"{self.__class__.__name__}('{self.port}') is not connected. You need to run `{self.__class__.__name__}.connect()`."
+            )
+
+        self._assert_protocol_is_compatible("sync_read")
+
+        names = self._get_motors_list(motors)
+        ids = [self.motors[motor].id for motor in names]
+        models = [self.motors[motor].model for motor in names]
+        data_names = list(dict.fromkeys(data_names))
+
+        if self._has_different_ctrl_tables:
+            for data_name in data_names:
+                assert_same_address(self.model_ctrl_table, models, data_name)
+
+        model = next(iter(models))
+        addr_lengths = [get_address(self.model_ctrl_table, model, data_name) for data_name in data_names]
+
+        err_msg = f"Failed to sync read {data_names} on {ids=} after {num_retry + 1} tries."
+        registers_values, _ = self._sync_read_many(
+            addr_lengths, ids, num_retry=num_retry, raise_on_error=True, err_msg=err_msg
+        )
+
+        values = {}
+        for data_name, ids_values in zip(data_names, registers_values, strict=True):
+            ids_values = self._decode_sign(data_name, ids_values)
+            if normalize and data_name in self.normalized_data:
+                ids_values = self._normalize(ids_values)
+            values[data_name] = {self._id_to_name(id_): value for id_, value in ids_values.items()}
+
+        return values
+
     def _sync_read(
         self,
         addr: int,
@@ -1108,6 +1263,24 @@ class MotorsBus(abc.ABC):
         raise_on_error: bool = True,
         err_msg: str = "",
     ) -> tuple[dict[int, int], int]:
+        (values,), comm = self._sync_read_many(
+            [(addr, length)], motor_ids, num_retry=num_retry, raise_on_error=raise_on_error, err_msg=err_msg
+        )
+        return values, comm
+
+    def _sync_read_many(
+        self,
+        addr_lengths: list[tuple[int, int]],
+        motor_ids: list[int],
+        *,
+        num_retry: int = 0,
+        raise_on_error: bool = True,
+        err_msg: str = "",
+    ) -> tuple[list[dict[int, int]], int]:
+        """Reads the span of addresses covering all the (addr, length) registers in a single packet, and returns
+        the values of each register."""
+        addr = min(addr_ for addr_, _ in addr_lengths)
+        length = max(addr_ + length_ for addr_, length_ in addr_lengths) - addr
         self._setup_sync_reader(motor_ids, addr, length)
         for n_try in range(1 + num_retry):
             comm = self.sync_reader.txRxPacket()
@@ -1121,15 +1294,26 @@ class MotorsBus(abc.ABC):
         if not self._is_comm_success(comm) and raise_on_error:
             raise ConnectionError(f"{err_msg} {self.packet_handler.getTxRxResult(comm)}")
 
-        values = {id_: self.sync_reader.getData(id_, addr, length) for id_ in motor_ids}
+        values = [
+            {id_: self.sync_reader.getData(id_, addr_, length_) for id_ in motor_ids}
+            for addr_, length_ in addr_lengths
+        ]
         return values, comm
 
     def _setup_sync_reader(self, motor_ids: list[int], addr: int, length: int) -> None:
-        self.sync_reader.clearParam()
-        self.sync_reader.start_address = addr
-        self.sync_reader.data_length = length
-        for id_ in motor_ids:
-            self.sync_reader.addParam(id_)
+        """Selects the sync reader prepared for (motor_ids, addr, length), which is created on the first read.
+
+        The parameters of a sync reader only depend on this key, so the readers are kept for the following
+        reads instead of rebuilding their parameters every time.
+        """
+        key = (tuple(motor_ids), addr, length)
+        sync_reader = self._sync_readers.get(key)
+        if sync_reader is None:
+            sync_reader = type(self.sync_reader)(self.port_handler, self.packet_handler, addr, length)
+            for id_ in motor_ids:
+                sync_reader.addParam(id_)
+            self._sync_readers[key] = sync_reader
+        self.sync_reader = sync_reader
 
     # TODO(aliberts, pkooij): Implementing something like this could get even much faster read times if need be.
     # Would have to handle the logic of checking if a packet has been sent previously though but doable.
@@ -1212,9 +1396,201 @@ class MotorsBus(abc.ABC):
         return comm
 
     def _setup_sync_writer(self, ids_values: dict[int, int], addr: int, length: int) -> None:
-        self.sync_writer.clearParam()
-        self.sync_writer.start_address = addr
-        self.sync_writer.data_length = length
-        for id_, value in ids_values.items():
-            data = self._serialize_data(value, length)
-            self.sync_writer.addParam(id_, data)
+        """Selects the sync writer prepared for (ids, addr, length), which is created on the first write, and
+        changes the data of each motor in place."""
+        key = (tuple(ids_values), addr, length)
+        sync_writer = self._sync_writers.get(key)
+        if sync_writer is None:
+            sync_writer = type(self.sync_writer)(self.port_handler, self.packet_handler, addr, length)
+            for id_, value in ids_values.items():
+                sync_writer.addParam(id_, self._serialize_data(value, length))
+            self._sync_writers[key] = sync_writer
+        else:
+            for id_, value in ids_values.items():
+                sync_writer.changeParam(id_, self._serialize_data(value, length))
+        self.sync_writer = sync_writer
+
+    @property
+    def is_polling(self) -> bool:
+        """bool: `True` if the background thread started with :pymeth:`start_polling` is running."""
+        return self.poll_thread is not None and self.poll_thread.is_alive()
+
+    def start_polling(self, data_names: list[str], fps: int) -> None:
+        """Start a background thread which reads 'data_names' on every motor at 'fps'.
+
+        On each iteration, the thread sends the goals queued with :pymeth:`async_write` and then reads all the
+        registers in a single sync read (see :pymeth:`sync_read_many`). The values are published as a new
+        :class:`PolledState`, which is retrieved without waiting for the motors with :pymeth:`read_latest`.
+
+        While polling, the port belongs to the background thread: the registers should only be read and written
+        with :pymeth:`read_latest` and :pymeth:`async_write` until :pymeth:`stop_polling` is called.
+
+        Args:
+            data_names (list[str]): Registers to poll, normalized as with :pymeth:`sync_read`.
+            fps (int): Target frequency of the polling loop.
+        """
+        if not self.is_connected:
+            raise DeviceNotConnectedError(
+                f"{self.__class__.__name__}('{self.port}') is not connected. You need to run `{self.__class__.__name__}.connect()`."
+            )
+        if self.is_polling:
+            raise RuntimeError(f"{self.__class__.__name__}('{self.port}') is already polling.")
+
+        self._poll_data_names = list(data_names)
+        self.latest_state = None
+        self.new_state_event.clear()
+        self.poll_stop_event = Event()
+        self.poll_thread = Thread(
+            target=self._poll_loop,
+            args=(self.poll_stop_event, 1 / fps),
+            name=f"{self.__class__.__name__}_poll_loop",
+        )
+        self.poll_thread.daemon = True
+        self.poll_thread.start()
+
+    def stop_polling(self) -> None:
+        """Signal the background thread to stop, wait for it to join and send the goals still queued.
+
+        If the thread does not join within 2 seconds, the queued goals are discarded instead, since the thread may
+        still be using the port.
+        """
+        if self.poll_stop_event is not None:
+            self.poll_stop_event.set()
+
+        if self.poll_thread is not None and self.poll_thread.is_alive():
+            self.poll_thread.join(timeout=2.0)
+
+        if self.poll_thread is not None and self.poll_thread.is_alive():
+            # The thread may still be using the port, so the queued goals are dropped rather than sent concurrently
+            with self._pending_writes_lock:
+                self._pending_writes = {}
+            logger.warning(
+                f"The polling thread of {self.__class__.__name__}('{self.port}') did not stop in time. The goals "
+                "still queued were not sent."
+            )
+        elif self.is_connected:
+            self._send_pending_writes()
+
+        self.poll_thread = None
+        self.poll_stop_event = None
+
+    def _poll_loop(self, stop_event: Event, period_s: float) -> None:
+        """
+        Internal loop run by the background thread for polling.
+
+        On each iteration:
+        1. Sends the goals queued since the previous iteration
+        2. Reads the polled registers and stores them in latest_state
+        3. Sets new_state_event to notify listeners
+        4. Waits for the next period
+
+        Stops on DeviceNotConnectedError, logs other errors and continues. Consecutive failures are aggregated:
+        an error is only logged when it differs from the previous one, and their count once polling recovers.
+        """
+        num_failures = 0
+        last_error = None
+        while not stop_event.is_set():
+            start = time.perf_counter()
+            try:
+                self._send_pending_writes()
+                read_start = time.perf_counter()
+                values = self.sync_read_many(self._poll_data_names)
+                # Replacing the reference is atomic, so readers never need to lock
+                self.latest_state = PolledState(values, read_start)
+                self.new_state_event.set()
+                if num_failures > 0:
+                    logger.warning(
+                        f"Polling {self.__class__.__name__}('{self.port}') recovered after {num_failures} failed "
+                        "iterations."
+                    )
+                    num_failures, last_error = 0, None
+            except DeviceNotConnectedError:
+                break
+            except Exception as e:
+                num_failures += 1
+                if str(e) != last_error:
+                    logger.warning(
+                        f"Error polling {self.__class__.__name__}('{self.port}') in background thread: {e}. "
+                        "The same error is not logged again until polling recovers."
+                    )
+                    last_error = str(e)
+
+            stop_event.wait(max(0.0, period_s - (time.perf_counter() - start)))
+
+    def _send_pending_writes(self) -> None:
+        with self._pending_writes_lock:
+            pending_writes, self._pending_writes = self._pending_writes, {}
+
+        pending_writes = list(pending_writes.items())
+        for i, ((data_name, normalize), values) in enumerate(pending_writes):
+            try:
+                self.sync_write(data_name, values, normalize=normalize)
+            except Exception:
+                # The goals not sent are queued again, except where newer ones were queued in the meantime
+                with self._pending_writes_lock:
+                    for key, unsent_values in pending_writes[i:]:
+                        queued_values = self._pending_writes.setdefault(key, {})
+                        for motor, value in unsent_values.items():
+                            queued_values.setdefault(motor, value)
+                raise
+
+    def read_latest(self, timeout_ms: float = 200, max_age_s: float | None = None) -> PolledState:
+        """Return the latest state read by the background thread, without waiting for the motors.
+
+        Only the first call after :pymeth:`start_polling` may wait up to 'timeout_ms' for the first state. The
+        following ones return immediately, and the age of the values is given by :pyattr:`PolledState.age_s`.
+        Since the polling loop keeps running when its reads fail, 'max_age_s' should be set whenever stale
+        values are unsafe to use (e.g. to clamp goal positions).
+
+        Args:
+            timeout_ms (float, optional): Time to wait for the first state. Defaults to 200.
+            max_age_s (float | None, optional): Maximum age of the returned state. Defaults to None, which
+                returns the latest state however old it is.
+
+        Raises:
+            DeviceNotConnectedError: If the bus is not connected.
+            RuntimeError: If the bus is not polling.
+            TimeoutError: If no state becomes available within 'timeout_ms', or if the latest state is older
+                than 'max_age_s'.
+        """
+        if not self.is_connected:
+            raise DeviceNotConnectedError(
+                f"{self.__class__.__name__}('{self.port}') is not connected. You need to run `{self.__class__.__name__}.connect()`."
+            )
+        if not self.is_polling:
+            raise RuntimeError(
+                f"{self.__class__.__name__}('{self.port}') is not polling. You need to run `{self.__class__.__name__}.start_polling()`."
+            )
+
+        if not self.new_state_event.wait(timeout=timeout_ms / 1000.0):
+            raise TimeoutError(
+                f"Timed out waiting for the state of {self.__class__.__name__}('{self.port}') after {timeout_ms} ms."
+            )
+
+        state = self.latest_state
+        if max_age_s is not None and state.age_s > max_age_s:
+            raise TimeoutError(
+                f"The latest state of {self.__class__.__name__}('{self.port}') is {state.age_s * 1e3:.1f} ms old "
+                f"(max {max_age_s * 1e3:.1f} ms). The polling thread is failing to read the motors."
+            )
+
+        return state
+
+    def async_write(
+        self, data_name: str, values: Value | dict[str, Value], *, normalize: bool = True
+    ) -> None:
+        """Queue a write of the same register on multiple motors, sent by the background thread.
+
+        The writes are coalesced: only the newest value of each motor queued since the previous iteration of the
+        polling loop is sent. Arguments are the same as for :pymeth:`sync_write`.
+        """
+        if not self.is_polling:
+            raise RuntimeError(
+                f"{self.__class__.__name__}('{self.port}') is not polling. You need to run `{self.__class__.__name__}.start_polling()`."
+            )
+
+        if not isinstance(values, dict):
+            values = dict.fromkeys(self.motors, values)
+
+        with self._pending_writes_lock:
+            self._pending_writes.setdefault((data_name, normalize), {}).update(values)
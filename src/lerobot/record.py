@@ -58,8 +58,10 @@ python -m lerobot.record \
 """
 
 import logging
+import queue
+import threading
 import time
-from dataclasses import asdict, dataclass
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
 from pprint import pformat
 
@@ -70,9 +72,9 @@ from lerobot.cameras.opencv.configuration_opencv import OpenCVCameraConfig  # no
 from lerobot.cameras.realsense.configuration_realsense import RealSenseCameraConfig  # noqa: F401
 from lerobot.configs import parser
 from lerobot.configs.policies import PreTrainedConfig
-from lerobot.datasets.image_writer import safe_stop_image_writer
+from lerobot.datasets.image_writer import FrameFormat, safe_stop_image_writer
 from lerobot.datasets.lerobot_dataset import LeRobotDataset
-from lerobot.datasets.utils import build_dataset_frame, hw_to_dataset_features
+from lerobot.datasets.utils import DEFAULT_TIMINGS_PATH, build_dataset_frame, hw_to_dataset_features
 from lerobot.datasets.video_utils import VideoEncodingManager
 from lerobot.policies.factory import make_policy
 from lerobot.policies.pretrained import PreTrainedPolicy
@@ -105,6 +107,7 @@ from lerobot.utils.control_utils import (
     sanity_check_dataset_robot_compatibility,
 )
 from lerobot.utils.robot_utils import busy_wait
+from lerobot.utils.timing_utils import StageTimer
 from lerobot.utils.utils import (
     get_safe_torch_device,
     init_logging,
@@ -146,9 +149,27 @@ class DatasetRecordConfig:
     # Too many threads might cause unstable teleoperation fps due to main thread being blocked.
     # Not enough threads might cause low camera fps.
     num_image_writer_threads_per_camera: int = 4
+    # Format of the camera frames written on disk before being encoded into videos: "png" (lossless, with
+    # `png_compress_level` from 0 to 9), "jpeg" (lossy, with `jpeg_quality`) or "npy" (raw frames, no CPU cost
+    # but the most disk space). Lower the PNG compression or use another format if writing frames is too slow.
+    frame_format: FrameFormat = field(default_factory=FrameFormat)
     # Number of episodes to record before batch encoding videos
     # Set to 1 for immediate encoding (default behavior), or higher for batched encoding
     video_encoding_batch_size: int = 1
+    # Encode the camera frames into the episode videos while recording, instead of writing them as PNG images
+    # and encoding them at the end of each episode. Makes `video_encoding_batch_size` ineffective.
+    streaming_encoding: bool = False
+    # Accumulate the episode stats while recording, from a downsampled copy of every camera frame, instead of
+    # computing them when saving the episode from a subset of the frames read back from disk.
+    online_stats: bool = False
+    # Number of background processes finalizing the saved episodes (parquet file, stats and videos), so that the
+    # next episode can be recorded right away. Set to 0 to finalize each episode before recording the next one.
+    num_finalization_workers: int = 0
+    # Maximum number of saved episodes waiting to be finalized before saving an episode blocks.
+    max_finalization_backlog: int = 2
+    # Save the durations of the stages of the control loop (p50, p99 and max per stage, and missed deadlines)
+    # of every episode in 'timings/episode_XXXXXX.json' in the dataset directory. They are not pushed to the hub.
+    save_timings: bool = True
 
     def __post_init__(self):
         if self.single_task is None:
@@ -169,6 +190,10 @@ class RecordConfig:
     play_sounds: bool = True
     # Resume recording on an existing dataset.
     resume: bool = False
+    # Run the control loop as a pipeline: the observations are read, the policy is run and the frames are added
+    # to the dataset in separate threads, while the actions are sent on a strict timer, one period after the
+    # observation they were computed from was read.
+    pipelined_loop: bool = False
 
     def __post_init__(self):
         # HACK: We parse again the cli args here to get the pretrained path if there was one.
@@ -187,6 +212,188 @@ class RecordConfig:
         return ["policy"]
 
 
+def _put(q: queue.Queue, item, stop: threading.Event) -> bool:
+    """Puts 'item' in 'q', waiting for a free slot until 'stop' is set. Returns whether it was put."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _put_latest(q: queue.Queue, item) -> bool:
+    """Puts 'item' in 'q', of size 1 and with a single producer, replacing the item not consumed yet if any.
+    Returns False if an item was replaced."""
+    try:
+        q.get_nowait()
+        replaced = True
+    except queue.Empty:
+        replaced = False
+    q.put_nowait(item)
+    return not replaced
+
+
+def pipelined_record_loop(
+    robot: Robot,
+    events: dict,
+    fps: int,
+    dataset: LeRobotDataset | None = None,
+    teleop: Teleoperator | None = None,
+    policy: PreTrainedPolicy | None = None,
+    control_time_s: int | None = None,
+    single_task: str | None = None,
+    display_data: bool = False,
+    max_pending_frames: int | None = None,
+    timer: StageTimer | None = None,
+) -> StageTimer:
+    """Same as `record_loop`, but with its stages overlapping in threads.
+
+    - The observation thread reads an observation at the start of every period.
+    - With a policy, the inference thread computes the action of the latest observation. Observations which are
+      not consumed before the next one is read are dropped.
+    - The main thread sends the action computed from the observation of a period at the end of this period. If no
+      action is ready by then, the deadline is missed and no action is sent for this period.
+    - The recording thread adds the frames to the dataset and logs them to rerun, with up to
+      'max_pending_frames' frames waiting (one second by default) before the main thread blocks.
+
+    The robot is never read and written concurrently, since both usually go through the same bus. The durations
+    of the stages, missed deadlines and dropped observations are recorded in 'timer'.
+    """
+    period = 1 / fps
+    timer = timer if timer is not None else StageTimer(fps)
+    stop = threading.Event()
+    errors = []
+    robot_lock = threading.Lock()
+    observations = queue.Queue(maxsize=1)
+    actions = queue.Queue(maxsize=1)
+    frames = queue.Queue(maxsize=max_pending_frames or fps)
+
+    def read_observations():
+        tick = 0
+        while not stop.is_set():
+            busy_wait(start_episode_t + tick * period - time.perf_counter())
+            with timer.time("observation"), robot_lock:
+                observation = robot.get_observation()
+            if not _put_latest(observations, observation):
+                timer.increment("dropped_observations")
+            tick += 1
+
+    def infer_actions():
+        while not stop.is_set():
+            try:
+                observation = observations.get(timeout=period)
+            except queue.Empty:
+                continue
+            with timer.time("inference"):
+                observation_frame = build_dataset_frame(dataset.features, observation, prefix="observation")
+                action_values = predict_action(
+                    observation_frame,
+                    policy,
+                    get_safe_torch_device(policy.config.device),
+                    policy.config.use_amp,
+                    task=single_task,
+                    robot_type=robot.robot_type,
+                )
+                action = {key: action_values[i].item() for i, key in enumerate(robot.action_features)}
+            _put(actions, (observation, observation_frame, action), stop)
+
+    def record_frames():
+        while (item := frames.get()) is not None:
+            observation, observation_frame, action, sent_action = item
+            if dataset is not None:
+                with timer.time("dataset"):
+                    if observation_frame is None:
+                        observation_frame = build_dataset_frame(
+                            dataset.features, observation, prefix="observation"
+                        )
+                    action_frame = build_dataset_frame(dataset.features, sent_action, prefix="action")
+                    dataset.add_frame({**observation_frame, **action_frame}, task=single_task)
+            if display_data:
+                with timer.time("display"):
+                    log_rerun_data(observation, action)
+
+    def run(target):
+        def _run():
+            try:
+                target()
+            except Exception as e:
+                errors.append(e)
+                stop.set()
+
+        thread = threading.Thread(target=_run, daemon=True)
+        thread.start()
+        return thread
+
+    if policy is not None:
+        policy.reset()
+
+    start_episode_t = time.perf_counter()
+    producers = [run(read_observations)]
+    if policy is not None:
+        producers.append(run(infer_actions))
+    recorder = run(record_frames)
+
+    # The action of the observation read at the start of a period is sent at its end. Periods are counted rather
+    # than accumulated into the deadline, whose rounding errors could otherwise add a period
+    tick = 0
+    try:
+        # Same number of periods as `record_loop`: until an observation would be read after 'control_time_s'
+        while tick * period < control_time_s and not stop.is_set():
+            deadline = start_episode_t + (tick + 1) * period
+            if events["exit_early"]:
+                events["exit_early"] = False
+                break
+
+            # Skip the periods already over, e.g. after a slow action write
+            num_missed = int((time.perf_counter() - deadline) // period)
+            if num_missed > 0:
+                timer.increment("deadline_misses", num_missed)
+                tick += num_missed
+                deadline += num_missed * period
+
+            try:
+                timeout = max(deadline - time.perf_counter(), 0)
+                if policy is not None:
+                    observation, observation_frame, action = actions.get(timeout=timeout)
+                else:
+                    observation, observation_frame = observations.get(timeout=timeout), None
+                    with timer.time("teleop"):
+                        action = teleop.get_action()
+            except queue.Empty:
+                timer.increment("deadline_misses")
+                tick += 1
+                continue
+
+            busy_wait(deadline - time.perf_counter())
+            # Action can eventually be clipped using `max_relative_target`,
+            # so action actually sent is saved in the dataset.
+            with timer.time("action"), robot_lock:
+                sent_action = robot.send_action(action)
+            tick += 1
+
+            if dataset is not None or display_data:
+                with timer.time("frame_handoff"):
+                    _put(frames, (observation, observation_frame, action, sent_action), stop)
+    finally:
+        stop.set()
+        for thread in producers:
+            thread.join()
+        # The frames recorded so far are all added to the dataset before returning
+        while recorder.is_alive():
+            try:
+                frames.put(None, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        recorder.join()
+
+    if errors:
+        raise errors[0]
+    return timer
+
+
 @safe_stop_image_writer
 def record_loop(
     robot: Robot,
@@ -198,10 +405,28 @@ def record_loop(
     control_time_s: int | None = None,
     single_task: str | None = None,
     display_data: bool = False,
+    pipelined: bool = False,
+    timer: StageTimer | None = None,
 ):
     if dataset is not None and dataset.fps != fps:
         raise ValueError(f"The dataset fps should be equal to requested fps ({dataset.fps} != {fps}).")
 
+    timer = timer if timer is not None else StageTimer(fps)
+    if pipelined and (policy is not None or isinstance(teleop, Teleoperator)):
+        with timer.activate():
+            return pipelined_record_loop(
+                robot=robot,
+                events=events,
+                fps=fps,
+                dataset=dataset,
+                teleop=teleop,
+                policy=policy,
+                control_time_s=control_time_s,
+                single_task=single_task,
+                display_data=display_data,
+                timer=timer,
+            )
+
     teleop_arm = teleop_keyboard = None
     if isinstance(teleop, list):
         teleop_keyboard = next((t for t in teleop if isinstance(t, KeyboardTeleop)), None)
@@ -223,65 +448,75 @@ def record_loop(
     if policy is not None:
         policy.reset()
 
-    timestamp = 0
-    start_episode_t = time.perf_counter()
-    while timestamp < control_time_s:
-        start_loop_t = time.perf_counter()
-
-        if events["exit_early"]:
-            events["exit_early"] = False
-            break
-
-        observation = robot.get_observation()
-
-        if policy is not None or dataset is not None:
-            observation_frame = build_dataset_frame(dataset.features, observation, prefix="observation")
-
-        if policy is not None:
-            action_values = predict_action(
-                observation_frame,
-                policy,
-                get_safe_torch_device(policy.config.device),
-                policy.config.use_amp,
-                task=single_task,
-                robot_type=robot.robot_type,
-            )
-            action = {key: action_values[i].item() for i, key in enumerate(robot.action_features)}
-        elif policy is None and isinstance(teleop, Teleoperator):
-            action = teleop.get_action()
-        elif policy is None and isinstance(teleop, list):
-            # TODO(pepijn, steven): clean the record loop for use of multiple robots (possibly with pipeline)
-            arm_action = teleop_arm.get_action()
-            arm_action = {f"arm_{k}": v for k, v in arm_action.items()}
-
-            keyboard_action = teleop_keyboard.get_action()
-            base_action = robot._from_keyboard_to_base_action(keyboard_action)
-
-            action = {**arm_action, **base_action} if len(base_action) > 0 else arm_action
-        else:
-            logging.info(
-                "No policy or teleoperator provided, skipping action generation."
-                "This is likely to happen when resetting the environment without a teleop device."
-                "The robot won't be at its rest position at the start of the next episode."
-            )
-            continue
+    with timer.activate():
+        timestamp = 0
+        start_episode_t = time.perf_counter()
+        while timestamp < control_time_s:
+            start_loop_t = time.perf_counter()
 
-        # Action can eventually be clipped using `max_relative_target`,
-        # so action actually sent is saved in the dataset.
-        sent_action = robot.send_action(action)
+            if events["exit_early"]:
+                events["exit_early"] = False
+                break
+
+            with timer.time("observation"):
+                observation = robot.get_observation()
+
+            if policy is not None or dataset is not None:
+                observation_frame = build_dataset_frame(dataset.features, observation, prefix="observation")
+
+            if policy is not None:
+                with timer.time("inference"):
+                    action_values = predict_action(
+                        observation_frame,
+                        policy,
+                        get_safe_torch_device(policy.config.device),
+                        policy.config.use_amp,
+                        task=single_task,
+                        robot_type=robot.robot_type,
+                    )
+                action = {key: action_values[i].item() for i, key in enumerate(robot.action_features)}
+            elif policy is None and isinstance(teleop, Teleoperator):
+                with timer.time("teleop"):
+                    action = teleop.get_action()
+            elif policy is None and isinstance(teleop, list):
+                # TODO(pepijn, steven): clean the record loop for use of multiple robots (possibly with pipeline)
+                arm_action = teleop_arm.get_action()
+                arm_action = {f"arm_{k}": v for k, v in arm_action.items()}
+
+                keyboard_action = teleop_keyboard.get_action()
+                base_action = robot._from_keyboard_to_base_action(keyboard_action)
+
+                action = {**arm_action, **base_action} if len(base_action) > 0 else arm_action
+            else:
+                logging.info(
+                    "No policy or teleoperator provided, skipping action generation."
+                    "This is likely to happen when resetting the environment without a teleop device."
+                    "The robot won't be at its rest position at the start of the next episode."
+                )
+                continue
 
-        if dataset is not None:
-            action_frame = build_dataset_frame(dataset.features, sent_action, prefix="action")
-            frame = {**observation_frame, **action_frame}
-            dataset.add_frame(frame, task=single_task)
+            # Action can eventually be clipped using `max_relative_target`,
+            # so action actually sent is saved in the dataset.
+            with timer.time("action"):
+                sent_action = robot.send_action(action)
 
-        if display_data:
-            log_rerun_data(observation, action)
+            if dataset is not None:
+                with timer.time("dataset"):
+                    action_frame = build_dataset_frame(dataset.features, sent_action, prefix="action")
+                    frame = {**observation_frame, **action_frame}
+                    dataset.add_frame(frame, task=single_task)
 
-        dt_s = time.perf_counter() - start_loop_t
-        busy_wait(1 / fps - dt_s)
+            if display_data:
+                with timer.time("display"):
+                    log_rerun_data(observation, action)
 
-        timestamp = time.perf_counter() - start_episode_t
+            dt_s = time.perf_counter() - start_loop_t
+            timer.tick(dt_s)
+            busy_wait(1 / fps - dt_s)
+
+            timestamp = time.perf_counter() - start_episode_t
+
+    return timer
 
 
 @parser.wrap()
@@ -299,10 +534,14 @@ def record(cfg: RecordConfig) -> LeRobotDataset:
     dataset_features = {**action_features, **obs_features}
 
     if cfg.resume:
-        dataset = LeRobotDataset(
+        # Only the metadata needed to append episodes is loaded, whatever the size of the dataset
+        dataset = LeRobotDataset.open_for_append(
             cfg.dataset.repo_id,
             root=cfg.dataset.root,
             batch_encoding_size=cfg.dataset.video_encoding_batch_size,
+            streaming_encoding=cfg.dataset.streaming_encoding,
+            online_stats=cfg.dataset.online_stats,
+            frame_format=cfg.dataset.frame_format,
         )
 
         if hasattr(robot, "cameras") and len(robot.cameras) > 0:
@@ -324,6 +563,15 @@ def record(cfg: RecordConfig) -> LeRobotDataset:
             image_writer_processes=cfg.dataset.num_image_writer_processes,
             image_writer_threads=cfg.dataset.num_image_writer_threads_per_camera * len(robot.cameras),
             batch_encoding_size=cfg.dataset.video_encoding_batch_size,
+            streaming_encoding=cfg.dataset.streaming_encoding,
+            online_stats=cfg.dataset.online_stats,
+            frame_format=cfg.dataset.frame_format,
+        )
+
+    if cfg.dataset.num_finalization_workers > 0:
+        dataset.start_episode_finalizer(
+            num_workers=cfg.dataset.num_finalization_workers,
+            max_backlog=cfg.dataset.max_finalization_backlog,
         )
 
     # Load pretrained policy
@@ -335,10 +583,13 @@ def record(cfg: RecordConfig) -> LeRobotDataset:
 
     listener, events = init_keyboard_listener()
 
+    timer = StageTimer(cfg.dataset.fps)
     with VideoEncodingManager(dataset):
         recorded_episodes = 0
         while recorded_episodes < cfg.dataset.num_episodes and not events["stop_recording"]:
-            log_say(f"Recording episode {dataset.num_episodes}", cfg.play_sounds)
+            episode_index = dataset.num_episodes + dataset.num_pending_episodes
+            log_say(f"Recording episode {episode_index}", cfg.play_sounds)
+            timer.reset()
             record_loop(
                 robot=robot,
                 events=events,
@@ -349,6 +600,8 @@ def record(cfg: RecordConfig) -> LeRobotDataset:
                 control_time_s=cfg.dataset.episode_time_s,
                 single_task=cfg.dataset.single_task,
                 display_data=cfg.display_data,
+                pipelined=cfg.pipelined_loop,
+                timer=timer,
             )
 
             # Execute a few seconds without recording to give time to manually reset the environment
@@ -365,6 +618,7 @@ def record(cfg: RecordConfig) -> LeRobotDataset:
                     control_time_s=cfg.dataset.reset_time_s,
                     single_task=cfg.dataset.single_task,
                     display_data=cfg.display_data,
+                    pipelined=cfg.pipelined_loop,
                 )
 
             if events["rerecord_episode"]:
@@ -374,9 +628,14 @@ def record(cfg: RecordConfig) -> LeRobotDataset:
                 dataset.clear_episode_buffer()
                 continue
 
-            dataset.save_episode()
+            with timer.time("save_episode"):
+                dataset.save_episode()
             recorded_episodes += 1
 
+            timer.log_summary(prefix=f"Episode {episode_index} ")
+            if cfg.dataset.save_timings:
+                timer.save(dataset.root / DEFAULT_TIMINGS_PATH.format(episode_index=episode_index))
+
     log_say("Stop recording", cfg.play_sounds, blocking=True)
 
     robot.disconnect()
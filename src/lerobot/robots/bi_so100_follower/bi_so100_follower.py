@@ -20,8 +20,11 @@ from functools import cached_property
 from typing import Any
 
 from lerobot.cameras.utils import make_cameras_from_configs
+from lerobot.errors import DeviceNotConnectedError
 from lerobot.robots.so100_follower import SO100Follower
 from lerobot.robots.so100_follower.config_so100_follower import SO100FollowerConfig
+from lerobot.utils.robot_utils import make_arms_executor, run_on_arms
+from lerobot.utils.timing_utils import record_stage
 
 from ..robot import Robot
 from .config_bi_so100_follower import BiSO100FollowerConfig
@@ -65,6 +68,9 @@ class BiSO100Follower(Robot):
         self.left_arm = SO100Follower(left_arm_config)
         self.right_arm = SO100Follower(right_arm_config)
         self.cameras = make_cameras_from_configs(config.cameras)
+        # Runs the transactions of both arms concurrently, since they are on independent buses. Its threads only
+        # live between `connect` and `disconnect`.
+        self.arms_executor = None
 
     @property
     def _motors_ft(self) -> dict[str, type]:
@@ -97,6 +103,7 @@ class BiSO100Follower(Robot):
     def connect(self, calibrate: bool = True) -> None:
         self.left_arm.connect(calibrate)
         self.right_arm.connect(calibrate)
+        self.arms_executor = make_arms_executor(self.name)
 
         for cam in self.cameras.values():
             cam.connect()
@@ -118,14 +125,19 @@ class BiSO100Follower(Robot):
         self.right_arm.setup_motors()
 
     def get_observation(self) -> dict[str, Any]:
+        if not self.is_connected:
+            raise DeviceNotConnectedError(f"{self} is not connected.")
+
         obs_dict = {}
 
+        left_obs, right_obs = run_on_arms(
+            self.arms_executor, self.left_arm.get_observation, self.right_arm.get_observation, f"{self} read"
+        )
+
         # Add "left_" prefix
-        left_obs = self.left_arm.get_observation()
         obs_dict.update({f"left_{key}": value for key, value in left_obs.items()})
 
         # Add "right_" prefix
-        right_obs = self.right_arm.get_observation()
         obs_dict.update({f"right_{key}": value for key, value in right_obs.items()})
 
         for cam_key, cam in self.cameras.items():
@@ -133,10 +145,14 @@ class BiSO100Follower(Robot):
             obs_dict[cam_key] = cam.async_read()
             dt_ms = (time.perf_counter() - start) * 1e3
             logger.debug(f"{self} read {cam_key}: {dt_ms:.1f}ms")
+            record_stage(f"{self} read {cam_key}", dt_ms / 1e3)
 
         return obs_dict
 
     def send_action(self, action: dict[str, Any]) -> dict[str, Any]:
+        if not self.is_connected:
+            raise DeviceNotConnectedError(f"{self} is not connected.")
+
         # Remove "left_" prefix
         left_action = {
             key.removeprefix("left_"): value for key, value in action.items() if key.startswith("left_")
@@ -146,8 +162,12 @@ class BiSO100Follower(Robot):
             key.removeprefix("right_"): value for key, value in action.items() if key.startswith("right_")
         }
 
-        send_action_left = self.left_arm.send_action(left_action)
-        send_action_right = self.right_arm.send_action(right_action)
+        send_action_left, send_action_right = run_on_arms(
+            self.arms_executor,
+            lambda: self.left_arm.send_action(left_action),
+            lambda: self.right_arm.send_action(right_action),
+            f"{self} send",
+        )
 
         # Add prefixes back
         prefixed_send_action_left = {f"left_{key}": value for key, value in send_action_left.items()}
@@ -158,6 +178,9 @@ class BiSO100Follower(Robot):
     def disconnect(self):
         self.left_arm.disconnect()
         self.right_arm.disconnect()
+        if self.arms_executor is not None:
+            self.arms_executor.shutdown(wait=True)
+            self.arms_executor = None
 
         for cam in self.cameras.values():
             cam.disconnect()
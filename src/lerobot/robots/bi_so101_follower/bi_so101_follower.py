@@ -20,6 +20,7 @@ from typing import Any
 
 from lerobot.cameras.utils import make_cameras_from_configs
 from lerobot.errors import DeviceAlreadyConnectedError, DeviceNotConnectedError
+from lerobot.utils.robot_utils import make_arms_executor, run_on_arms
 
 from ..robot import Robot
 from ..so101_follower import SO101Follower, SO101FollowerConfig
@@ -48,6 +49,7 @@ class BiSO101Follower(Robot):
             disable_torque_on_disconnect=config.left_arm_disable_torque_on_disconnect,
             max_relative_target=config.left_arm_max_relative_target,
             use_degrees=config.left_arm_use_degrees,
+            polling_fps=config.left_arm_polling_fps,
             cameras={},
         )
 
@@ -58,12 +60,16 @@ class BiSO101Follower(Robot):
             disable_torque_on_disconnect=config.right_arm_disable_torque_on_disconnect,
             max_relative_target=config.right_arm_max_relative_target,
             use_degrees=config.right_arm_use_degrees,
+            polling_fps=config.right_arm_polling_fps,
             cameras={},
         )
 
         self.left_arm = SO101Follower(left_arm_config)
         self.right_arm = SO101Follower(right_arm_config)
         self.cameras = make_cameras_from_configs(config.cameras)
+        # Runs the transactions of both arms concurrently, since they are on independent buses. Its threads only
+        # live between `connect` and `disconnect`.
+        self.arms_executor = None
 
     @property
     def _motors_ft(self) -> dict[str, type]:
@@ -96,6 +102,7 @@ class BiSO101Follower(Robot):
     def connect(self, calibrate: bool = True) -> None:
         self.left_arm.connect(calibrate)
         self.right_arm.connect(calibrate)
+        self.arms_executor = make_arms_executor(self.name)
 
         for cam in self.cameras.values():
             cam.connect()
@@ -117,8 +124,15 @@ class BiSO101Follower(Robot):
         self.right_arm.setup_motors()
 
     def get_observation(self) -> dict[str, Any]:
-        left_observation = self.left_arm.get_observation()
-        right_observation = self.right_arm.get_observation()
+        if not self.is_connected:
+            raise DeviceNotConnectedError(f"{self} is not connected.")
+
+        left_observation, right_observation = run_on_arms(
+            self.arms_executor,
+            self.left_arm.get_observation,
+            self.right_arm.get_observation,
+            f"{self} read",
+        )
 
         # Prefix motor states with "left_" and "right_"
         observation = {}
@@ -151,15 +165,17 @@ class BiSO101Follower(Robot):
         sent_action = {}
 
         # Send actions to both arms
-        if left_action:
-            sent_left_action = self.left_arm.send_action(left_action)
-            for key, value in sent_left_action.items():
-                sent_action[f"left_{key}"] = value
+        sent_left_action, sent_right_action = run_on_arms(
+            self.arms_executor,
+            lambda: self.left_arm.send_action(left_action) if left_action else {},
+            lambda: self.right_arm.send_action(right_action) if right_action else {},
+            f"{self} send",
+        )
+        for key, value in sent_left_action.items():
+            sent_action[f"left_{key}"] = value
 
-        if right_action:
-            sent_right_action = self.right_arm.send_action(right_action)
-            for key, value in sent_right_action.items():
-                sent_action[f"right_{key}"] = value
+        for key, value in sent_right_action.items():
+            sent_action[f"right_{key}"] = value
 
         return sent_action
 
@@ -171,6 +187,9 @@ class BiSO101Follower(Robot):
 
         self.left_arm.disconnect()
         self.right_arm.disconnect()
+        if self.arms_executor is not None:
+            self.arms_executor.shutdown(wait=True)
+            self.arms_executor = None
 
         for cam in self.cameras.values():
             cam.disconnect()
@@ -36,6 +36,8 @@ class BiSO101FollowerConfig(RobotConfig):
     right_arm_disable_torque_on_disconnect: bool = True
     right_arm_max_relative_target: int | None = None
     right_arm_use_degrees: bool = False
+    left_arm_polling_fps: int | None = None
+    right_arm_polling_fps: int | None = None
 
     # Default camera configuration for bimanual setup:
     # 2 Intel RealSense cameras for context (external)
@@ -26,6 +26,7 @@ from lerobot.motors.calibration_gui import RangeFinderGUI
 from lerobot.motors.feetech import (
     FeetechMotorsBus,
 )
+from lerobot.utils.timing_utils import record_stage
 
 from ..robot import Robot
 from .config_hope_jr import HopeJrHandConfig
@@ -145,6 +146,8 @@ class HopeJrHand(Robot):
         self.calibration = RangeFinderGUI(self.bus, fingers).run()
         for motor in self.inverted_motors:
             self.calibration[motor].drive_mode = 1
+        # Set again so that the bus takes the drive modes changed in place into account
+        self.bus.calibration = self.calibration
         self._save_calibration()
         print("Calibration saved to", self.calibration_fpath)
 
@@ -171,6 +174,7 @@ class HopeJrHand(Robot):
             obs_dict[f"{motor}.pos"] = self.bus.read("Present_Position", motor)
         dt_ms = (time.perf_counter() - start) * 1e3
         logger.debug(f"{self} read state: {dt_ms:.1f}ms")
+        record_stage(f"{self} read state", dt_ms / 1e3)
 
         # Capture images from cameras
         for cam_key, cam in self.cameras.items():
@@ -178,6 +182,7 @@ class HopeJrHand(Robot):
             obs_dict[cam_key] = cam.async_read()
             dt_ms = (time.perf_counter() - start) * 1e3
             logger.debug(f"{self} read {cam_key}: {dt_ms:.1f}ms")
+            record_stage(f"{self} read {cam_key}", dt_ms / 1e3)
 
         return obs_dict
 
@@ -29,6 +29,7 @@ from lerobot.motors.feetech import (
     FeetechMotorsBus,
     OperatingMode,
 )
+from lerobot.utils.timing_utils import record_stage
 
 from ..robot import Robot
 from ..utils import ensure_safe_goal_position
@@ -359,6 +360,7 @@ class LeKiwi(Robot):
 
         dt_ms = (time.perf_counter() - start) * 1e3
         logger.debug(f"{self} read state: {dt_ms:.1f}ms")
+        record_stage(f"{self} read state", dt_ms / 1e3)
 
         # Capture images from cameras
         for cam_key, cam in self.cameras.items():
@@ -366,6 +368,7 @@ class LeKiwi(Robot):
             obs_dict[cam_key] = cam.async_read()
             dt_ms = (time.perf_counter() - start) * 1e3
             logger.debug(f"{self} read {cam_key}: {dt_ms:.1f}ms")
+            record_stage(f"{self} read {cam_key}", dt_ms / 1e3)
 
         return obs_dict
 
@@ -26,6 +26,7 @@ from lerobot.motors.feetech import (
     FeetechMotorsBus,
     OperatingMode,
 )
+from lerobot.utils.timing_utils import record_stage
 
 from ..robot import Robot
 from ..utils import ensure_safe_goal_position
@@ -177,6 +178,7 @@ class SO100Follower(Robot):
         obs_dict = {f"{motor}.pos": val for motor, val in obs_dict.items()}
         dt_ms = (time.perf_counter() - start) * 1e3
         logger.debug(f"{self} read state: {dt_ms:.1f}ms")
+        record_stage(f"{self} read state", dt_ms / 1e3)
 
         # Capture images from cameras
         for cam_key, cam in self.cameras.items():
@@ -184,6 +186,7 @@ class SO100Follower(Robot):
             obs_dict[cam_key] = cam.async_read()
             dt_ms = (time.perf_counter() - start) * 1e3
             logger.debug(f"{self} read {cam_key}: {dt_ms:.1f}ms")
+            record_stage(f"{self} read {cam_key}", dt_ms / 1e3)
 
         return obs_dict
 
@@ -39,3 +39,10 @@ class SO101FollowerConfig(RobotConfig):
 
     # Set to `True` for backward compatibility with previous policies/dataset
     use_degrees: bool = False
+
+    # Set this to poll the arm in a background thread at this frequency. `get_observation` then returns the latest
+    # positions without waiting for the motors, and goal positions are sent by the same thread.
+    polling_fps: int | None = None
+    # When polling, the positions are not used if they are older than this (e.g. because the reads keep failing):
+    # `get_observation` and `send_action` raise instead of returning stale positions or clamping against them.
+    polling_max_age_s: float = 0.1
@@ -26,6 +26,7 @@ from lerobot.motors.feetech import (
     FeetechMotorsBus,
     OperatingMode,
 )
+from lerobot.utils.timing_utils import record_stage
 
 from ..robot import Robot
 from ..utils import ensure_safe_goal_position
@@ -101,6 +102,8 @@ class SO101Follower(Robot):
             cam.connect()
 
         self.configure()
+        if self.config.polling_fps is not None:
+            self.bus.start_polling(["Present_Position"], self.config.polling_fps)
         logger.info(f"{self} connected.")
 
     @property
@@ -169,10 +172,17 @@ class SO101Follower(Robot):
 
         # Read arm position
         start = time.perf_counter()
-        obs_dict = self.bus.sync_read("Present_Position")
+        if self.bus.is_polling:
+            state = self.bus.read_latest(max_age_s=self.config.polling_max_age_s)
+            obs_dict = state.values["Present_Position"]
+            logger.debug(f"{self} state age: {state.age_s * 1e3:.1f}ms")
+            record_stage(f"{self} state age", state.age_s)
+        else:
+            obs_dict = self.bus.sync_read("Present_Position")
         obs_dict = {f"{motor}.pos": val for motor, val in obs_dict.items()}
         dt_ms = (time.perf_counter() - start) * 1e3
         logger.debug(f"{self} read state: {dt_ms:.1f}ms")
+        record_stage(f"{self} read state", dt_ms / 1e3)
 
         # Capture images from cameras
         for cam_key, cam in self.cameras.items():
@@ -180,6 +190,7 @@ class SO101Follower(Robot):
             obs_dict[cam_key] = cam.async_read()
             dt_ms = (time.perf_counter() - start) * 1e3
             logger.debug(f"{self} read {cam_key}: {dt_ms:.1f}ms")
+            record_stage(f"{self} read {cam_key}", dt_ms / 1e3)
 
         return obs_dict
 
@@ -204,12 +215,19 @@ class SO101Follower(Robot):
         # Cap goal position when too far away from present position.
         # /!\ Slower fps expected due to reading from the follower.
         if self.config.max_relative_target is not None:
-            present_pos = self.bus.sync_read("Present_Position")
+            if self.bus.is_polling:
+                state = self.bus.read_latest(max_age_s=self.config.polling_max_age_s)
+                present_pos = state.values["Present_Position"]
+            else:
+                present_pos = self.bus.sync_read("Present_Position")
             goal_present_pos = {key: (g_pos, present_pos[key]) for key, g_pos in goal_pos.items()}
             goal_pos = ensure_safe_goal_position(goal_present_pos, self.config.max_relative_target)
 
         # Send goal position to the arm
-        self.bus.sync_write("Goal_Position", goal_pos)
+        if self.bus.is_polling:
+            self.bus.async_write("Goal_Position", goal_pos)
+        else:
+            self.bus.sync_write("Goal_Position", goal_pos)
         return {f"{motor}.pos": val for motor, val in goal_pos.items()}
 
     def disconnect(self):
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+
+# Copyright 2024 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Decode the videos of a LeRobotDataset once into its pre-decoded frame store.
+
+Frames are stored as uint8 memory-mapped arrays in 'root/cache/frames' (one file per camera). Instantiate the
+dataset with `use_frame_store=True` (or train with `--dataset.use_frame_store=true`) to read frames from the store
+instead of decoding the videos at every epoch.
+
+Examples:
+
+- Decode all the episodes at the resolution of the videos:
+```
+python -m lerobot.scripts.decode_dataset_videos \
+    --repo-id lerobot/pusht
+```
+
+- Decode a few episodes of a local dataset, resized to 240x320:
+```
+python -m lerobot.scripts.decode_dataset_videos \
+    --repo-id your_name/bimanual_dataset \
+    --root data/bimanual_dataset \
+    --episodes 0 1 2 \
+    --height 240 \
+    --width 320
+```
+"""
+
+import argparse
+import logging
+from pathlib import Path
+
+from lerobot.datasets.frame_store import build_frame_store
+from lerobot.datasets.lerobot_dataset import LeRobotDataset
+from lerobot.utils.utils import init_logging
+
+
+def main():
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument(
+        "--repo-id",
+        type=str,
+        required=True,
+        help="Name of hugging face repository containing a LeRobotDataset dataset (e.g. `lerobot/pusht`).",
+    )
+    parser.add_argument(
+        "--root",
+        type=Path,
+        default=None,
+        help="Root directory for the dataset stored locally (e.g. `--root data`). By default, the dataset will be loaded from hugging face cache folder, or downloaded from the hub if available.",
+    )
+    parser.add_argument(
+        "--episodes",
+        type=int,
+        nargs="*",
+        default=None,
+        help="Episodes to decode. By default, all the episodes are decoded.",
+    )
+    parser.add_argument(
+        "--height",
+        type=int,
+        default=None,
+        help="Height of the stored frames. Must be set together with `--width`. Defaults to the height of the "
+        "existing frame store, or else the video height.",
+    )
+    parser.add_argument(
+        "--width",
+        type=int,
+        default=None,
+        help="Width of the stored frames. Must be set together with `--height`. Defaults to the width of the "
+        "existing frame store, or else the video width.",
+    )
+    parser.add_argument(
+        "--overwrite",
+        action="store_true",
+        help="Re-create the frame store from scratch instead of only decoding the missing episodes.",
+    )
+
+    args = parser.parse_args()
+    if (args.height is None) != (args.width is None):
+        parser.error("`--height` and `--width` must be provided together.")
+    resolution = (args.height, args.width) if args.height is not None else None
+
+    dataset = LeRobotDataset(args.repo_id, root=args.root, episodes=args.episodes)
+    store = build_frame_store(dataset, resolution=resolution, overwrite=args.overwrite)
+    logging.info(f"Frame store of {args.repo_id} written to {store.root} ({len(store.episodes)} episodes)")
+
+
+if __name__ == "__main__":
+    init_logging()
+    main()
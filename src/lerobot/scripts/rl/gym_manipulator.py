@@ -67,6 +67,7 @@ from lerobot.teleoperators import (
 from lerobot.teleoperators.gamepad.teleop_gamepad import GamepadTeleop
 from lerobot.teleoperators.keyboard.teleop_keyboard import KeyboardEndEffectorTeleop
 from lerobot.utils.robot_utils import busy_wait
+from lerobot.utils.timing_utils import StageTimer, record_stage
 from lerobot.utils.utils import log_say
 
 logging.basicConfig(level=logging.INFO)
@@ -228,6 +229,7 @@ class RobotEnv(gym.Env):
         robot,
         use_gripper: bool = False,
         display_cameras: bool = False,
+        extra_state_registers: list[str] | None = None,
     ):
         """
         Initialize the RobotEnv environment.
@@ -238,16 +240,29 @@ class RobotEnv(gym.Env):
         Args:
             robot: The robot interface object used to connect and interact with the physical robot.
             display_cameras: If True, the robot's camera feeds will be displayed during execution.
+            extra_state_registers: Motor registers (e.g. "Present_Current") read along with the joint positions in
+                a single bus transaction, instead of one transaction per register. Their values are stored in
+                `register_values` for the observation wrappers. Not supported when the bus of the robot is polled
+                in a background thread, which owns the port.
         """
         super().__init__()
 
         self.robot = robot
         self.display_cameras = display_cameras
+        self.extra_state_registers = extra_state_registers if extra_state_registers else []
+        self.register_values = {}
 
         # Connect to the robot if not already connected.
         if not self.robot.is_connected:
             self.robot.connect()
 
+        if self.extra_state_registers and self.robot.bus.is_polling:
+            raise ValueError(
+                f"The registers {self.extra_state_registers} can't be read along with the joint positions while "
+                f"{self.robot} polls its bus in a background thread. Disable the polling of the robot or the "
+                "wrappers reading these registers."
+            )
+
         # Episode tracking.
         self.current_step = 0
         self.episode_data = None
@@ -263,7 +278,21 @@ class RobotEnv(gym.Env):
 
     def _get_observation(self) -> dict[str, np.ndarray]:
         """Helper to convert a dictionary from bus.sync_read to an ordered numpy array."""
-        obs_dict = self.robot.get_observation()
+        if self.extra_state_registers:
+            # Same as `robot.get_observation`, with the extra registers read in the same transaction
+            start = time.perf_counter()
+            registers = ["Present_Position", *self.extra_state_registers]
+            self.register_values = self.robot.bus.sync_read_many(registers)
+            obs_dict = {
+                f"{motor}.pos": val for motor, val in self.register_values["Present_Position"].items()
+            }
+            record_stage(f"{self.robot} read state", time.perf_counter() - start)
+            for cam_key, cam in self.robot.cameras.items():
+                start = time.perf_counter()
+                obs_dict[cam_key] = cam.async_read()
+                record_stage(f"{self.robot} read {cam_key}", time.perf_counter() - start)
+        else:
+            obs_dict = self.robot.get_observation()
         joint_positions = np.array([obs_dict[name] for name in self._joint_names])
 
         images = {key: obs_dict[key] for key in self._image_keys}
@@ -517,7 +546,10 @@ class AddCurrentToObservation(gym.ObservationWrapper):
         Returns:
             The modified observation with current values.
         """
-        present_current_dict = self.env.unwrapped.robot.bus.sync_read("Present_Current")
+        robot_env = self.env.unwrapped
+        present_current_dict = robot_env.register_values.get("Present_Current")
+        if present_current_dict is None:
+            present_current_dict = robot_env.robot.bus.sync_read("Present_Current")
         present_current_observation = np.array(
             [present_current_dict[name] for name in self.env.unwrapped.robot.bus.motors]
         )
@@ -1883,6 +1915,10 @@ def make_robot_env(cfg: EnvConfig) -> gym.Env:
         robot=robot,
         use_gripper=cfg.wrapper.use_gripper,
         display_cameras=cfg.wrapper.display_cameras if cfg.wrapper else False,
+        # Read with the joint positions rather than in a separate transaction
+        extra_state_registers=(
+            ["Present_Current"] if cfg.wrapper and cfg.wrapper.add_current_to_observation else None
+        ),
     )
 
     # Add observation and image processing
@@ -2021,6 +2057,7 @@ def record_dataset(env, policy, cfg):
                                   more positive examples for reward classifier training.
     """
     from lerobot.datasets.lerobot_dataset import LeRobotDataset
+    from lerobot.datasets.utils import DEFAULT_TIMINGS_PATH
 
     # Setup initial action (zero action if using teleop)
     action = env.action_space.sample() * 0.0
@@ -2073,10 +2110,12 @@ def record_dataset(env, policy, cfg):
     # Record episodes
     episode_index = 0
     recorded_action = None
+    timer = StageTimer(cfg.fps)
     while episode_index < cfg.num_episodes:
         obs, _ = env.reset()
         start_episode_t = time.perf_counter()
         log_say(f"Recording episode {episode_index}", play_sounds=True)
+        timer.reset()
 
         # Track success state collection
         success_detected = False
@@ -2088,10 +2127,12 @@ def record_dataset(env, policy, cfg):
 
             # Get action from policy if available
             if cfg.pretrained_policy_name_or_path is not None:
-                action = policy.select_action(obs)
+                with timer.time("inference"):
+                    action = policy.select_action(obs)
 
             # Step environment
-            obs, reward, terminated, truncated, info = env.step(action)
+            with timer.time("env_step"), timer.activate():
+                obs, reward, terminated, truncated, info = env.step(action)
 
             # Check if episode needs to be rerecorded
             if info.get("rerecord_episode", False):
@@ -2129,11 +2170,13 @@ def record_dataset(env, policy, cfg):
             frame["complementary_info.discrete_penalty"] = torch.tensor(
                 [info.get("discrete_penalty", 0.0)], dtype=torch.float32
             )
-            dataset.add_frame(frame, task=cfg.task)
+            with timer.time("dataset"):
+                dataset.add_frame(frame, task=cfg.task)
 
             # Maintain consistent timing
             if cfg.fps:
                 dt_s = time.perf_counter() - start_loop_t
+                timer.tick(dt_s)
                 busy_wait(1 / cfg.fps - dt_s)
 
             # Check if we should end the episode
@@ -2152,6 +2195,8 @@ def record_dataset(env, policy, cfg):
             continue
 
         dataset.save_episode()
+        timer.log_summary(prefix=f"Episode {episode_index} ")
+        timer.save(dataset.root / DEFAULT_TIMINGS_PATH.format(episode_index=episode_index))
         episode_index += 1
 
     # Finalize dataset
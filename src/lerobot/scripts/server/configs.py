@@ -146,6 +146,12 @@ class RobotClientConfig:
         default=True, metadata={"help": "Verify that the robot cameras match the policy cameras"}
     )
 
+    # Timing configuration
+    timings_path: str | None = field(
+        default=None,
+        metadata={"help": "JSON file where the durations of the control loop stages are saved when it stops"},
+    )
+
     @property
     def environment_dt(self) -> float:
         """Environment time step, in seconds"""
@@ -77,6 +77,7 @@ from lerobot.transport import (
     services_pb2_grpc,  # type: ignore
 )
 from lerobot.transport.utils import grpc_channel_options, send_bytes_in_chunks
+from lerobot.utils.timing_utils import StageTimer
 
 
 class RobotClient:
@@ -136,6 +137,8 @@ class RobotClient:
 
         # FPS measurement
         self.fps_tracker = FPSTracker(target_fps=self.config.fps)
+        # Durations of the stages of the control loop
+        self.stage_timer = StageTimer(fps=self.config.fps)
 
         self.logger.info("Robot connected and ready")
 
@@ -461,19 +464,28 @@ class RobotClient:
         _performed_action = None
         _captured_observation = None
 
-        while self.running:
-            control_loop_start = time.perf_counter()
-            """Control loop: (1) Performing actions, when available"""
-            if self.actions_available():
-                _performed_action = self.control_loop_action(verbose)
-
-            """Control loop: (2) Streaming observations to the remote policy server"""
-            if self._ready_to_send_observation():
-                _captured_observation = self.control_loop_observation(task, verbose)
-
-            self.logger.info(f"Control loop (ms): {(time.perf_counter() - control_loop_start) * 1000:.2f}")
-            # Dynamically adjust sleep time to maintain the desired control frequency
-            time.sleep(max(0, self.config.environment_dt - (time.perf_counter() - control_loop_start)))
+        with self.stage_timer.activate():
+            while self.running:
+                control_loop_start = time.perf_counter()
+                """Control loop: (1) Performing actions, when available"""
+                if self.actions_available():
+                    with self.stage_timer.time("action"):
+                        _performed_action = self.control_loop_action(verbose)
+
+                """Control loop: (2) Streaming observations to the remote policy server"""
+                if self._ready_to_send_observation():
+                    with self.stage_timer.time("observation"):
+                        _captured_observation = self.control_loop_observation(task, verbose)
+
+                control_loop_dt = time.perf_counter() - control_loop_start
+                self.stage_timer.tick(control_loop_dt)
+                self.logger.info(f"Control loop (ms): {control_loop_dt * 1000:.2f}")
+                # Dynamically adjust sleep time to maintain the desired control frequency
+                time.sleep(max(0, self.config.environment_dt - (time.perf_counter() - control_loop_start)))
+
+        self.stage_timer.log_summary(prefix="Control loop ")
+        if self.config.timings_path is not None:
+            self.stage_timer.save(self.config.timings_path)
 
         return _captured_observation, _performed_action
 
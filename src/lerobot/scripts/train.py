@@ -27,7 +27,8 @@ from torch.optim import Optimizer
 from lerobot.configs import parser
 from lerobot.configs.train import TrainPipelineConfig
 from lerobot.datasets.factory import make_dataset
-from lerobot.datasets.sampler import EpisodeAwareSampler
+from lerobot.datasets.sampler import EpisodeAwareSampler, WeightedMixtureSampler
+from lerobot.datasets.transforms import BatchedImageTransforms
 from lerobot.datasets.utils import cycle
 from lerobot.envs.factory import make_env
 from lerobot.optim.factory import make_optimizer_and_scheduler
@@ -171,7 +172,17 @@ def train(cfg: TrainPipelineConfig):
     logging.info(f"{num_total_params=} ({format_big_number(num_total_params)})")
 
     # create dataloader for offline training
-    if hasattr(cfg.policy, "drop_n_last_frames"):
+    if cfg.use_mixture_sampling:
+        shuffle = False
+        sampler = WeightedMixtureSampler(
+            dataset.episode_data_index,
+            dataset.dataset_frame_offsets,
+            weights=cfg.dataset_weights,
+            temperature=cfg.dataset_sampling_temperature or 1.0,
+            drop_n_last_frames=getattr(cfg.policy, "drop_n_last_frames", 0),
+        )
+        logging.info(f"Dataset mixture probabilities: {sampler.probabilities.tolist()}")
+    elif hasattr(cfg.policy, "drop_n_last_frames"):
         shuffle = False
         sampler = EpisodeAwareSampler(
             dataset.episode_data_index,
@@ -193,6 +204,13 @@ def train(cfg: TrainPipelineConfig):
     )
     dl_iter = cycle(dataloader)
 
+    # Image transforms applied to whole batches on the training device instead of in the dataloader workers.
+    batch_image_transforms = None
+    if cfg.dataset.image_transforms.enable and cfg.dataset.image_transforms.batched:
+        batch_image_transforms = BatchedImageTransforms(
+            cfg.dataset.image_transforms, seed=cfg.seed, device=device
+        )
+
     policy.train()
 
     train_metrics = {
@@ -217,6 +235,9 @@ def train(cfg: TrainPipelineConfig):
             if isinstance(batch[key], torch.Tensor):
                 batch[key] = batch[key].to(device, non_blocking=device.type == "cuda")
 
+        if batch_image_transforms is not None:
+            batch = batch_image_transforms(batch, dataset.meta.camera_keys)
+
         train_tracker, output_dict = update_policy(
             train_tracker,
             policy,
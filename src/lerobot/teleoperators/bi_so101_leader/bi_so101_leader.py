@@ -18,6 +18,7 @@ import logging
 from functools import cached_property
 
 from lerobot.errors import DeviceAlreadyConnectedError, DeviceNotConnectedError
+from lerobot.utils.robot_utils import make_arms_executor, run_on_arms
 
 from ..so101_leader import SO101Leader, SO101LeaderConfig
 from ..teleoperator import Teleoperator
@@ -55,6 +56,9 @@ class BiSO101Leader(Teleoperator):
 
         self.left_arm = SO101Leader(left_arm_config)
         self.right_arm = SO101Leader(right_arm_config)
+        # Runs the transactions of both arms concurrently, since they are on independent buses. Its threads only
+        # live between `connect` and `disconnect`.
+        self.arms_executor = None
 
     @cached_property
     def action_features(self) -> dict[str, type]:
@@ -73,6 +77,7 @@ class BiSO101Leader(Teleoperator):
     def connect(self, calibrate: bool = True) -> None:
         self.left_arm.connect(calibrate)
         self.right_arm.connect(calibrate)
+        self.arms_executor = make_arms_executor(self.name)
 
     @property
     def is_calibrated(self) -> bool:
@@ -91,8 +96,12 @@ class BiSO101Leader(Teleoperator):
         self.right_arm.setup_motors()
 
     def get_action(self) -> dict[str, float]:
-        left_action = self.left_arm.get_action()
-        right_action = self.right_arm.get_action()
+        if not self.is_connected:
+            raise DeviceNotConnectedError(f"{self} is not connected.")
+
+        left_action, right_action = run_on_arms(
+            self.arms_executor, self.left_arm.get_action, self.right_arm.get_action, f"{self} read"
+        )
 
         # Prefix actions with "left_" and "right_"
         action = {}
@@ -122,3 +131,6 @@ class BiSO101Leader(Teleoperator):
     def disconnect(self) -> None:
         self.left_arm.disconnect()
         self.right_arm.disconnect()
+        if self.arms_executor is not None:
+            self.arms_executor.shutdown(wait=True)
+            self.arms_executor = None
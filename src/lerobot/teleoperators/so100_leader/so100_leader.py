@@ -23,6 +23,7 @@ from lerobot.motors.feetech import (
     FeetechMotorsBus,
     OperatingMode,
 )
+from lerobot.utils.timing_utils import record_stage
 
 from ..teleoperator import Teleoperator
 from .config_so100_leader import SO100LeaderConfig
@@ -145,6 +146,7 @@ class SO100Leader(Teleoperator):
         action = {f"{motor}.pos": val for motor, val in action.items()}
         dt_ms = (time.perf_counter() - start) * 1e3
         logger.debug(f"{self} read action: {dt_ms:.1f}ms")
+        record_stage(f"{self} read action", dt_ms / 1e3)
         return action
 
     def send_feedback(self, feedback: dict[str, float]) -> None:
@@ -14,6 +14,13 @@
 
 import platform
 import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import TypeVar
+
+from lerobot.utils.timing_utils import record_stage
+
+T = TypeVar("T")
 
 
 def busy_wait(seconds):
@@ -42,3 +49,32 @@ def safe_disconnect(func):
             raise e
 
     return wrapper
+
+
+def make_arms_executor(name: str) -> ThreadPoolExecutor:
+    """Persistent executor running the transactions of the left and right arms of a bimanual device."""
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix=f"{name}_arms")
+
+
+def run_on_arms(
+    executor: ThreadPoolExecutor, left_fn: Callable[[], T], right_fn: Callable[[], T], stage: str
+) -> tuple[T, T]:
+    """Runs 'left_fn' and 'right_fn' concurrently in 'executor' and returns their results in this order.
+
+    The arms of a bimanual device are on independent buses, so that the duration of their transactions is the
+    max instead of the sum of both. The duration of each one is recorded as the '{stage} left_arm' and
+    '{stage} right_arm' stages of the active `StageTimer`. If any of them raises, the first exception is raised
+    once both are done.
+    """
+
+    def timed(fn: Callable[[], T], side: str) -> T:
+        start = time.perf_counter()
+        try:
+            return fn()
+        finally:
+            record_stage(f"{stage} {side}_arm", time.perf_counter() - start)
+
+    left_future = executor.submit(timed, left_fn, "left")
+    right_future = executor.submit(timed, right_fn, "right")
+    wait([left_future, right_future])
+    return left_future.result(), right_future.result()
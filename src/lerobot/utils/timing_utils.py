@@ -0,0 +1,217 @@
+#!/usr/bin/env python
+
+# Copyright 2024 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Timing of the stages of a control loop (observation, camera and motor reads, inference, action write, ...).
+
+A `StageTimer` keeps a fixed-size `LatencyHistogram` per stage, so that it can run for a whole episode in a
+control loop without allocating, and summarizes them with their percentiles and the number of missed deadlines:
+
+```python
+timer = StageTimer(fps=30)
+with timer.activate():
+    for _ in range(num_steps):
+        start = time.perf_counter()
+        with timer.time("inference"):
+            action = policy.select_action(observation)
+        ...
+        timer.tick(time.perf_counter() - start)
+timer.log_summary()
+timer.save(dataset.root / "timings" / "episode_000000.json")
+```
+
+The durations of the stages timed deeper in the stack (e.g. the camera reads of a robot) are recorded with
+`record_stage` in the timer which is active, if any.
+"""
+
+import json
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+
+class LatencyHistogram:
+    """Histogram of durations with logarithmic buckets, in the spirit of HdrHistogram.
+
+    Durations from 'min_s' to 'max_s' are counted in buckets whose width grows with their value, so that the
+    percentiles have a relative error of at most `2 ** (1 / buckets_per_octave) - 1` (about 2% by default)
+    with a memory which doesn't depend on the number of recorded durations. Durations out of this range are
+    counted in the first or last bucket. The exact min, max and mean are kept apart.
+    """
+
+    def __init__(self, min_s: float = 1e-6, max_s: float = 100.0, buckets_per_octave: int = 32):
+        if not 0 < min_s < max_s:
+            raise ValueError(f"Expected 0 < min_s < max_s, got min_s={min_s} and max_s={max_s}.")
+        self.min_s = min_s
+        self.max_s = max_s
+        self.buckets_per_octave = buckets_per_octave
+        num_buckets = math.ceil(math.log2(max_s / min_s) * buckets_per_octave) + 1
+        self.counts = np.zeros(num_buckets, dtype=np.int64)
+        self.reset()
+
+    def reset(self) -> None:
+        self.counts[:] = 0
+        self.count = 0
+        self.total_s = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def _bucket_index(self, duration_s: float) -> int:
+        if duration_s <= self.min_s:
+            return 0
+        index = int(math.log2(duration_s / self.min_s) * self.buckets_per_octave) + 1
+        return min(index, len(self.counts) - 1)
+
+    def _bucket_value(self, index: int) -> float:
+        """Geometric middle of the bucket at 'index'."""
+        if index == 0:
+            return self.min_s
+        return self.min_s * 2 ** ((index - 0.5) / self.buckets_per_octave)
+
+    def record(self, duration_s: float) -> None:
+        self.counts[self._bucket_index(duration_s)] += 1
+        self.count += 1
+        self.total_s += duration_s
+        self.min = min(self.min, duration_s)
+        self.max = max(self.max, duration_s)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        if len(other.counts) != len(self.counts) or other.min_s != self.min_s:
+            raise ValueError("Only histograms with the same buckets can be merged.")
+        self.counts += other.counts
+        self.count += other.count
+        self.total_s += other.total_s
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self) -> float:
+        return self.total_s / self.count if self.count else math.nan
+
+    def percentile(self, q: float) -> float:
+        """Duration (s) below which 'q' percent of the recorded durations are."""
+        if self.count == 0:
+            return math.nan
+        rank = max(1, math.ceil(q / 100 * self.count))
+        index = int(np.searchsorted(np.cumsum(self.counts), rank))
+        if index == len(self.counts) - 1:
+            # The last bucket also counts the durations above 'max_s'
+            return self.max
+        return min(max(self._bucket_value(index), self.min), self.max)
+
+
+class StageTimer:
+    """Latency histograms of the stages of a control loop, and named counters (e.g. missed deadlines).
+
+    Thread-safe, so that the stages of a loop running in several threads are recorded in the same timer.
+
+    Args:
+        fps (int | None, optional): Frequency of the control loop. Loop durations reported with `tick` which
+            exceed its period are counted as missed deadlines. Defaults to None.
+    """
+
+    def __init__(self, fps: int | None = None):
+        self.fps = fps
+        self.histograms: dict[str, LatencyHistogram] = {}
+        self.counters: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, duration_s: float) -> None:
+        with self._lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = LatencyHistogram()
+            histogram.record(duration_s)
+
+    @contextmanager
+    def time(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def increment(self, counter: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + n
+
+    def tick(self, dt_s: float) -> None:
+        """Records the duration of a whole iteration of the loop, before waiting for the next one."""
+        self.record("loop", dt_s)
+        if self.fps is not None and dt_s > 1 / self.fps:
+            self.increment("deadline_misses")
+
+    def reset(self) -> None:
+        with self._lock:
+            self.histograms = {}
+            self.counters = {}
+
+    @contextmanager
+    def activate(self):
+        """Records the stages timed with `record_stage` in this timer, from any thread, until exiting."""
+        global _active_timer
+        previous_timer, _active_timer = _active_timer, self
+        try:
+            yield self
+        finally:
+            _active_timer = previous_timer
+
+    def summary(self) -> dict:
+        """Count, mean, p50, p99 and max (ms) of every stage, and the counters."""
+        with self._lock:
+            stages = {
+                stage: {
+                    "count": histogram.count,
+                    "mean_ms": 1e3 * histogram.mean,
+                    "p50_ms": 1e3 * histogram.percentile(50),
+                    "p99_ms": 1e3 * histogram.percentile(99),
+                    "max_ms": 1e3 * histogram.max,
+                }
+                for stage, histogram in self.histograms.items()
+            }
+            counters = dict(self.counters)
+        if self.fps is not None:
+            counters.setdefault("deadline_misses", 0)
+        return {"fps": self.fps, "stages": stages, "counters": counters}
+
+    def log_summary(self, prefix: str = "") -> None:
+        summary = self.summary()
+        for stage, stats in summary["stages"].items():
+            logging.info(
+                f"{prefix}{stage}: {stats['count']} calls, mean {stats['mean_ms']:.1f}ms, "
+                f"p50 {stats['p50_ms']:.1f}ms, p99 {stats['p99_ms']:.1f}ms, max {stats['max_ms']:.1f}ms"
+            )
+        if summary["counters"]:
+            logging.info(prefix + ", ".join(f"{name}: {n}" for name, n in summary["counters"].items()))
+
+    def save(self, path: Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=4)
+
+
+_active_timer: StageTimer | None = None
+
+
+def record_stage(stage: str, duration_s: float) -> None:
+    """Records the duration of 'stage' in the active `StageTimer`, if any."""
+    timer = _active_timer
+    if timer is not None:
+        timer.record(stage, duration_s)
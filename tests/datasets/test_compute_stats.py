@@ -19,6 +19,7 @@ import numpy as np
 import pytest
 
 from lerobot.datasets.compute_stats import (
+    RunningStats,
     _assert_type_and_shape,
     aggregate_feature_stats,
     aggregate_stats,
@@ -71,6 +72,17 @@ def test_sample_images(mock_load):
     assert len(images) == estimate_num_samples(100)
 
 
+def test_sample_images_npy(tmp_path):
+    image_paths = []
+    for i in range(10):
+        image_paths.append(str(tmp_path / f"frame_{i:06d}.npy"))
+        np.save(image_paths[-1], np.full((32, 32, 3), i, dtype=np.uint8))
+    images = sample_images(image_paths)
+    assert images.shape[1:] == (3, 32, 32)
+    assert images.dtype == np.uint8
+    np.testing.assert_array_equal(images[:, 0, 0, 0], sample_indices(10))
+
+
 def test_get_feature_stats_images():
     data = np.random.rand(100, 3, 32, 32)
     stats = get_feature_stats(data, axis=(0, 2, 3), keepdims=True)
@@ -307,3 +319,38 @@ def test_aggregate_stats():
             results[fkey]["std"], expected_agg_stats[fkey]["std"], atol=1e-04, rtol=1e-04
         )
         np.testing.assert_allclose(results[fkey]["count"], expected_agg_stats[fkey]["count"])
+
+
+@pytest.mark.parametrize(
+    "shape, reduce_axes, axis",
+    [
+        ((10,), (), 0),
+        ((2, 3), (), 0),
+        ((3, 8, 6), (1, 2), (0, 2, 3)),
+    ],
+)
+def test_running_stats_matches_get_feature_stats(shape, reduce_axes, axis):
+    frames = np.random.default_rng(0).integers(0, 256, (50, *shape)).astype(np.uint8)
+    running_stats = RunningStats(reduce_axes)
+    for frame in frames:
+        running_stats.update(frame)
+
+    result = running_stats.get_stats()
+    expected = get_feature_stats(frames, axis=axis, keepdims=bool(reduce_axes))
+    if reduce_axes:
+        expected = {k: v if k == "count" else v[0] for k, v in expected.items()}
+    for key in expected:
+        np.testing.assert_allclose(result[key], expected[key])
+        assert result[key].shape == expected[key].shape
+
+
+def test_running_stats_merge_is_exact():
+    data = np.random.default_rng(0).normal(5.0, 2.0, (120, 4))
+    chunks = [data[:10], data[10:70], data[70:]]
+    stats_list = [get_feature_stats(chunk, axis=0, keepdims=False) for chunk in chunks]
+
+    merged = aggregate_feature_stats(stats_list)
+
+    expected = get_feature_stats(data, axis=0, keepdims=False)
+    for key in expected:
+        np.testing.assert_allclose(merged[key], expected[key], rtol=1e-12)
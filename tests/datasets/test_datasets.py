@@ -15,11 +15,14 @@
 # limitations under the License.
 import json
 import logging
+import pickle
 import re
 from copy import deepcopy
 from itertools import chain
 from pathlib import Path
+from unittest.mock import patch
 
+import datasets
 import numpy as np
 import pytest
 import torch
@@ -31,7 +34,8 @@ import lerobot
 from lerobot.configs.default import DatasetConfig
 from lerobot.configs.train import TrainPipelineConfig
 from lerobot.datasets.factory import make_dataset
-from lerobot.datasets.image_writer import image_array_to_pil_image
+from lerobot.datasets.frame_table import FrameTable
+from lerobot.datasets.image_writer import FrameFormat, image_array_to_pil_image
 from lerobot.datasets.lerobot_dataset import (
     LeRobotDataset,
     MultiLeRobotDataset,
@@ -40,11 +44,12 @@ from lerobot.datasets.utils import (
     create_branch,
     flatten_dict,
     unflatten_dict,
+    write_info,
 )
 from lerobot.envs.factory import make_env_config
 from lerobot.policies.factory import make_policy_config
 from tests.fixtures.constants import DUMMY_CHW, DUMMY_HWC, DUMMY_REPO_ID
-from tests.utils import require_x86_64_kernel
+from tests.utils import pushed_files, require_x86_64_kernel
 
 
 @pytest.fixture
@@ -306,6 +311,148 @@ def test_add_frame_image_pil(image_dataset):
     assert dataset[0]["image"].shape == torch.Size(DUMMY_CHW)
 
 
+@pytest.fixture
+def streaming_video_dataset(tmp_path, empty_lerobot_dataset_factory):
+    features = {"cam": {"dtype": "video", "shape": DUMMY_CHW, "names": ["channels", "height", "width"]}}
+    return empty_lerobot_dataset_factory(
+        root=tmp_path / "test", features=features, streaming_encoding=True, batch_encoding_size=2
+    )
+
+
+def test_save_episode_streaming_encoding(streaming_video_dataset):
+    dataset = streaming_video_dataset
+    for _ in range(5):
+        dataset.add_frame({"cam": np.random.randint(0, 256, DUMMY_HWC, dtype=np.uint8)}, task="Dummy task")
+    dataset.add_frame({"cam": np.random.rand(*DUMMY_CHW)}, task="Dummy task")
+    dataset.save_episode()
+
+    video_path = dataset.root / dataset.meta.get_video_file_path(0, "cam")
+    assert list(dataset.root.rglob("*.mp4")) == [video_path]
+    assert not (dataset.root / "images").exists()
+    assert dataset.video_encoders == {}
+    assert dataset.meta.features["cam"]["info"]["video.height"] == DUMMY_CHW[1]
+    assert dataset.meta.episodes_stats[0]["cam"]["mean"].shape == (3, 1, 1)
+    assert dataset.meta.episodes_stats[0]["cam"]["count"] == np.array([6])
+
+
+def test_clear_episode_buffer_streaming_encoding(streaming_video_dataset):
+    dataset = streaming_video_dataset
+    dataset.add_frame({"cam": np.random.randint(0, 256, DUMMY_HWC, dtype=np.uint8)}, task="Dummy task")
+    dataset.clear_episode_buffer()
+
+    assert dataset.video_encoders == {}
+    assert list(dataset.root.rglob("*.mp4")) == []
+
+
+def test_save_episode_appends_lazily(tmp_path, empty_lerobot_dataset_factory):
+    features = {"state": {"dtype": "float32", "shape": (2,), "names": None}}
+    dataset = empty_lerobot_dataset_factory(root=tmp_path / "test", features=features)
+    with (
+        patch("lerobot.datasets.lerobot_dataset.concatenate_datasets") as concatenate_mock,
+        patch.object(Path, "rglob", side_effect=AssertionError("The dataset directory is scanned")),
+    ):
+        for ep_idx in range(3):
+            for _ in range(2):
+                dataset.add_frame({"state": np.full(2, ep_idx, dtype=np.float32)}, task="Dummy task")
+            dataset.save_episode()
+    concatenate_mock.assert_not_called()
+    assert dataset.num_frames == 6
+    assert len(dataset.file_manifest["data"]) == 3
+
+    assert len(dataset.hf_dataset) == 6
+    assert dataset._episode_datasets == []
+    assert dataset[5]["state"].tolist() == [2.0, 2.0]
+    assert dataset.hf_dataset["index"] == [torch.tensor(i) for i in range(6)]
+
+
+def test_open_for_append(tmp_path, empty_lerobot_dataset_factory):
+    features = {"state": {"dtype": "float32", "shape": (2,), "names": None}}
+    dataset = empty_lerobot_dataset_factory(root=tmp_path / "test", features=features)
+    for ep_idx in range(2):
+        for _ in range(2):
+            dataset.add_frame({"state": np.full(2, ep_idx, dtype=np.float32)}, task="Dummy task")
+        dataset.save_episode()
+
+    not_loaded = AssertionError("The whole dataset is loaded")
+    with (
+        patch("lerobot.datasets.lerobot_dataset.load_episodes", side_effect=not_loaded),
+        patch("lerobot.datasets.lerobot_dataset.load_episodes_stats", side_effect=not_loaded),
+        patch.object(LeRobotDataset, "load_hf_dataset", side_effect=not_loaded),
+    ):
+        appended = LeRobotDataset.open_for_append(dataset.repo_id, root=dataset.root)
+        assert list(appended.meta.episodes) == [1]
+        for _ in range(3):
+            appended.add_frame({"state": np.full(2, 2, dtype=np.float32)}, task="Other task")
+        appended.save_episode()
+    assert appended.hf_dataset is None
+    assert appended.num_episodes == 3
+    assert appended.num_frames == 7
+
+    reloaded = LeRobotDataset(dataset.repo_id, root=dataset.root)
+    assert reloaded.num_episodes == 3
+    assert reloaded.meta.total_tasks == 2
+    assert reloaded.hf_dataset["index"] == [torch.tensor(i) for i in range(7)]
+    assert reloaded.meta.episodes_stats[2]["state"]["mean"].tolist() == [2.0, 2.0]
+    assert reloaded.meta.stats["state"]["max"].tolist() == [2.0, 2.0]
+
+
+def test_open_for_append_inconsistent_metadata(tmp_path, empty_lerobot_dataset_factory):
+    features = {"state": {"dtype": "float32", "shape": (2,), "names": None}}
+    dataset = empty_lerobot_dataset_factory(root=tmp_path / "test", features=features)
+    dataset.add_frame({"state": np.zeros(2, dtype=np.float32)}, task="Dummy task")
+    dataset.save_episode()
+    dataset.meta.info["total_episodes"] += 1
+    write_info(dataset.meta.info, dataset.root)
+
+    with pytest.raises(ValueError, match="has 2 episodes"):
+        LeRobotDataset.open_for_append(dataset.repo_id, root=dataset.root)
+
+
+def test_save_episode_online_stats(tmp_path, empty_lerobot_dataset_factory):
+    features = {
+        "state": {"dtype": "float32", "shape": (2,), "names": None},
+        "image": {"dtype": "image", "shape": DUMMY_CHW, "names": ["channels", "height", "width"]},
+    }
+    recorded = [
+        empty_lerobot_dataset_factory(root=tmp_path / name, features=features, online_stats=online_stats)
+        for name, online_stats in [("offline", False), ("online", True)]
+    ]
+    rng = np.random.default_rng(0)
+    # Episode shorter than the number of images sampled by `compute_episode_stats`, which uses them all
+    frames = [{"state": rng.random(2, dtype=np.float32), "image": rng.random(DUMMY_CHW)} for _ in range(10)]
+    for dataset in recorded:
+        for frame in frames:
+            dataset.add_frame(dict(frame), task="Dummy task")
+        dataset.save_episode()
+        assert dataset.running_stats == {}
+
+    offline_stats, online_stats = (dataset.meta.episodes_stats[0] for dataset in recorded)
+    assert offline_stats.keys() == online_stats.keys()
+    for key in offline_stats:
+        for stat, value in offline_stats[key].items():
+            np.testing.assert_allclose(online_stats[key][stat], value, rtol=1e-6)
+
+
+@pytest.mark.parametrize("frame_format", [FrameFormat(), FrameFormat("jpeg"), FrameFormat("npy")])
+def test_batch_encode_videos(tmp_path, empty_lerobot_dataset_factory, frame_format):
+    features = {"cam": {"dtype": "video", "shape": DUMMY_CHW, "names": ["channels", "height", "width"]}}
+    dataset = empty_lerobot_dataset_factory(
+        root=tmp_path / "test", features=features, batch_encoding_size=3, frame_format=frame_format
+    )
+    for _ in range(2):
+        for _ in range(2):
+            dataset.add_frame({"cam": np.random.rand(*DUMMY_CHW)}, task="Dummy task")
+        dataset.save_episode()
+    assert list(dataset.root.rglob("*.mp4")) == []
+    assert len(list(dataset.root.rglob(f"frame_*{frame_format.suffix}"))) == 4
+
+    dataset.batch_encode_videos(0, 2, num_workers=2, threads_per_job=1)
+
+    assert len(list(dataset.root.rglob("*.mp4"))) == 2
+    assert list(dataset.root.rglob("frame_*")) == []
+    assert dataset.meta.features["cam"]["info"]["video.width"] == DUMMY_CHW[2]
+
+
 def test_image_array_to_pil_image_wrong_range_float_0_255():
     image = np.random.rand(*DUMMY_HWC) * 255
     with pytest.raises(ValueError):
@@ -393,6 +540,106 @@ def test_factory(env_name, repo_id, policy_name):
             assert key in item, f"{key}"
 
 
+@pytest.mark.parametrize("frame_table_mmap", [False, True])
+def test_frame_table_matches_hf_dataset(tmp_path, info_factory, lerobot_dataset_factory, frame_table_mmap):
+    info = info_factory(total_episodes=3, total_frames=150, total_tasks=1, camera_features={})
+    delta_timestamps = {"action": [i / info["fps"] for i in range(-2, 5)], "state": [-1 / info["fps"], 0]}
+    dataset = lerobot_dataset_factory(root=tmp_path / "test", info=info, delta_timestamps=delta_timestamps)
+    table_dataset = lerobot_dataset_factory(
+        root=tmp_path / "test",
+        info=info,
+        hf_dataset=dataset.hf_dataset,
+        delta_timestamps=delta_timestamps,
+        use_frame_table=True,
+        frame_table_mmap=frame_table_mmap,
+    )
+    assert table_dataset.frame_table is not None
+    assert (tmp_path / "test" / "cache" / "frame_table" / "all").is_dir() == frame_table_mmap
+
+    for idx in [0, 1, 49, 50, 99, 149]:
+        item, table_item = dataset[idx], table_dataset[idx]
+        assert item.keys() == table_item.keys()
+        for key in item:
+            if isinstance(item[key], torch.Tensor):
+                assert item[key].dtype == table_item[key].dtype, key
+                assert torch.equal(item[key], table_item[key]), key
+
+
+def test_frame_table_mmap_not_reused_for_other_data(tmp_path):
+    def load_parquet(values):
+        datasets.Dataset.from_dict({"value": values}).to_parquet(tmp_path / "data.parquet")
+        return datasets.load_dataset("parquet", data_files=str(tmp_path / "data.parquet"), split="train")
+
+    mmap_dir = tmp_path / "cache" / "frame_table" / "all"
+    old_table = FrameTable.from_hf_dataset(load_parquet([1.0, 2.0, 3.0]), mmap_dir=mmap_dir)
+    np.testing.assert_array_equal(old_table["value"], [1.0, 2.0, 3.0])
+
+    # Same columns and number of rows, e.g. after downloading another revision
+    table = FrameTable.from_hf_dataset(load_parquet([4.0, 5.0, 6.0]), mmap_dir=mmap_dir)
+    np.testing.assert_array_equal(table["value"], [4.0, 5.0, 6.0])
+    np.testing.assert_array_equal(FrameTable.load(mmap_dir)["value"], [4.0, 5.0, 6.0])
+
+    # Files already memory-mapped are not rewritten in place, and workers map the same data as their parent.
+    np.testing.assert_array_equal(old_table["value"], [1.0, 2.0, 3.0])
+    np.testing.assert_array_equal(pickle.loads(pickle.dumps(table))["value"], [4.0, 5.0, 6.0])
+
+
+def test_frame_table_mmap_not_pushed(tmp_path, info_factory, lerobot_dataset_factory):
+    info = info_factory(total_episodes=3, total_frames=150, total_tasks=1, camera_features={})
+    dataset = lerobot_dataset_factory(
+        root=tmp_path / "test", info=info, use_frame_table=True, frame_table_mmap=True
+    )
+    assert any((tmp_path / "test" / "cache" / "frame_table").rglob("*.npy"))
+
+    files = pushed_files(dataset)
+    assert "meta/info.json" in files
+    assert not [path for path in files if path.startswith("cache/")]
+
+
+@pytest.mark.parametrize("use_frame_table", [False, True])
+def test_getitems_matches_getitem(tmp_path, info_factory, lerobot_dataset_factory, use_frame_table):
+    info = info_factory(total_episodes=3, total_frames=150, total_tasks=1, camera_features={})
+    delta_timestamps = {"action": [i / info["fps"] for i in range(-2, 5)], "state": [-1 / info["fps"], 0]}
+    dataset = lerobot_dataset_factory(
+        root=tmp_path / "test", info=info, delta_timestamps=delta_timestamps, use_frame_table=use_frame_table
+    )
+
+    indices = [0, 149, 50, 1, 49, 99, 50]
+    items = dataset.__getitems__(indices)
+    assert len(items) == len(indices)
+    for idx, item in zip(indices, items, strict=True):
+        expected = dataset[idx]
+        assert item.keys() == expected.keys()
+        for key in expected:
+            if isinstance(expected[key], torch.Tensor):
+                assert item[key].dtype == expected[key].dtype, key
+                assert torch.equal(item[key], expected[key]), key
+            else:
+                assert item[key] == expected[key], key
+
+
+@pytest.mark.parametrize("video_backend, decodes_per_video", [("torchcodec", 1), ("pyav", 2)])
+def test_getitems_video_decodes(
+    tmp_path, monkeypatch, lerobot_dataset_factory, video_backend, decodes_per_video
+):
+    decoded_timestamps = []
+
+    def fake_decode_video_frames(video_path, timestamps, tolerance_s, backend=None, decoder_cache=None):
+        decoded_timestamps.append(list(timestamps))
+        return torch.zeros(len(timestamps), 3, 4, 5)
+
+    monkeypatch.setattr("lerobot.datasets.lerobot_dataset.decode_video_frames", fake_decode_video_frames)
+    dataset = lerobot_dataset_factory(root=tmp_path / "test", video_backend=video_backend)
+    assert dataset.meta.video_keys
+
+    # First and last frames of the first episode: only torchcodec seeks to them in a single decode, the other
+    # backends would decode the whole episode in between
+    ep_end = dataset.episode_data_index["to"][0].item()
+    items = dataset.__getitems__([0, ep_end - 1])
+    assert len(items) == 2
+    assert len(decoded_timestamps) == decodes_per_video * len(dataset.meta.video_keys)
+
+
 # TODO(alexander-soare): If you're hunting for savings on testing time, this takes about 5 seconds.
 @pytest.mark.skip("TODO after fix multidataset")
 def test_multidataset_frames():
@@ -427,6 +674,69 @@ def test_multidataset_frames():
             assert torch.equal(sub_dataset_item[k], dataset_item[k])
 
 
+def test_multidataset_routing(tmp_path, info_factory, lerobot_dataset_factory):
+    repo_ids = [f"{DUMMY_REPO_ID}_{i}" for i in range(3)]
+    for repo_id, (total_episodes, total_frames) in zip(repo_ids, [(3, 150), (2, 40), (4, 100)], strict=True):
+        info = info_factory(
+            total_episodes=total_episodes, total_frames=total_frames, total_tasks=1, camera_features={}
+        )
+        lerobot_dataset_factory(
+            root=tmp_path / repo_id,
+            repo_id=repo_id,
+            info=info,
+            total_episodes=total_episodes,
+            total_frames=total_frames,
+        )
+
+    dataset = MultiLeRobotDataset(repo_ids, root=tmp_path, episodes={repo_ids[0]: [0, 2]})
+    sub_datasets = dataset._datasets
+    assert [d.repo_id for d in sub_datasets] == repo_ids
+    assert len(dataset) == sum(len(d) for d in sub_datasets)
+    assert dataset.dataset_frame_offsets == [0, *np.cumsum([len(d) for d in sub_datasets]).tolist()]
+
+    # episode_data_index covers the concatenation of the loaded frames, episode after episode.
+    ep_from, ep_to = dataset.episode_data_index["from"], dataset.episode_data_index["to"]
+    assert len(ep_from) == sum(d.num_episodes for d in sub_datasets)
+    assert ep_from[0] == 0 and ep_to[-1] == len(dataset)
+    assert torch.equal(ep_from[1:], ep_to[:-1])
+
+    episode_offsets = [0, 3, 5]
+    indices = [0, len(dataset) - 1, *ep_from.tolist(), *(ep_to - 1).tolist()]
+    for idx, item in zip(indices, dataset.__getitems__(indices), strict=True):
+        dataset_idx = int(np.searchsorted(dataset._frame_offsets, idx, side="right") - 1)
+        expected = sub_datasets[dataset_idx][idx - int(dataset._frame_offsets[dataset_idx])]
+        for single_item in (dataset[idx], item):
+            assert single_item["dataset_index"] == dataset_idx
+            assert single_item["episode_index"] == episode_offsets[dataset_idx] + expected["episode_index"]
+            assert torch.equal(single_item["index"], expected["index"])
+            assert torch.equal(single_item["action"], expected["action"])
+
+
+def test_multidataset_stats_cache(tmp_path, info_factory, lerobot_dataset_factory):
+    repo_ids = [f"{DUMMY_REPO_ID}_{i}" for i in range(2)]
+    for repo_id in repo_ids:
+        info = info_factory(total_episodes=2, total_frames=60, total_tasks=1, camera_features={})
+        lerobot_dataset_factory(
+            root=tmp_path / repo_id, repo_id=repo_id, info=info, total_episodes=2, total_frames=60
+        )
+
+    dataset = MultiLeRobotDataset(repo_ids, root=tmp_path, cache_stats=False)
+    assert not (tmp_path / "cache").exists()
+    expected_stats = dataset.stats
+    assert len(dataset.meta.episodes_stats) == 4
+
+    MultiLeRobotDataset(repo_ids, root=tmp_path)
+    assert len(list((tmp_path / "cache/merged_stats").glob("*.json"))) == 1
+
+    # The episodes stats of the underlying datasets are not parsed when the merged stats are cached.
+    with patch("lerobot.datasets.lerobot_dataset.load_episodes_stats") as mock_load_episodes_stats:
+        cached_dataset = MultiLeRobotDataset(repo_ids, root=tmp_path)
+        mock_load_episodes_stats.assert_not_called()
+    for key, key_stats in expected_stats.items():
+        for stat, value in key_stats.items():
+            np.testing.assert_allclose(cached_dataset.stats[key][stat], value, err_msg=f"{key}/{stat}")
+
+
 # TODO(aliberts): Move to more appropriate location
 def test_flatten_unflatten_dict():
     d = {
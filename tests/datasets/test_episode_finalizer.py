@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+
+# Copyright 2024 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from lerobot.datasets.lerobot_dataset import LeRobotDataset
+from lerobot.datasets.utils import (
+    DEFAULT_PENDING_EPISODE_PATH,
+    EPISODES_STATS_PATH,
+    load_episodes,
+    load_jsonlines,
+    write_episode,
+    write_episode_stats,
+)
+from tests.fixtures.constants import DUMMY_CHW, DUMMY_HWC, DUMMY_REPO_ID
+from tests.utils import pushed_files
+
+FEATURES = {
+    "state": {"dtype": "float32", "shape": (2,), "names": None},
+    "cam": {"dtype": "video", "shape": DUMMY_CHW, "names": ["channels", "height", "width"]},
+}
+
+
+def record_episodes(dataset: LeRobotDataset, num_episodes: int = 2, num_frames: int = 4) -> None:
+    rng = np.random.default_rng(0)
+    for _ in range(num_episodes):
+        for _ in range(num_frames):
+            frame = {
+                "state": rng.random(2, dtype=np.float32),
+                "cam": rng.integers(0, 256, DUMMY_HWC, dtype=np.uint8),
+            }
+            dataset.add_frame(frame, task="Dummy task")
+        dataset.save_episode()
+
+
+@pytest.fixture
+def pending_dir(tmp_path):
+    return (tmp_path / "async" / DEFAULT_PENDING_EPISODE_PATH).parent
+
+
+def test_background_finalization_matches_save_episode(tmp_path, empty_lerobot_dataset_factory, pending_dir):
+    # Videos are only encoded in background threads or processes, since encoding them in the main thread of
+    # the test process disturbs the serial port mocks of the motors tests.
+    sync_dataset = empty_lerobot_dataset_factory(
+        root=tmp_path / "sync", features=FEATURES, streaming_encoding=True
+    )
+    record_episodes(sync_dataset)
+
+    dataset = empty_lerobot_dataset_factory(root=tmp_path / "async", features=FEATURES)
+    dataset.start_episode_finalizer(num_workers=1, max_backlog=2)
+    record_episodes(dataset)
+    assert dataset.num_episodes + dataset.num_pending_episodes == 2
+    dataset.stop_episode_finalizer()
+
+    assert dataset.episode_finalizer is None
+    assert dataset.num_episodes == 2
+    assert len(dataset.hf_dataset) == 8
+    assert dataset.hf_dataset["index"] == sync_dataset.hf_dataset["index"]
+    assert dataset.meta.features["cam"]["info"] == sync_dataset.meta.features["cam"]["info"]
+    assert len(list(dataset.root.rglob("*.mp4"))) == 2
+    assert list(dataset.root.rglob("*.png")) == []
+    assert list(pending_dir.iterdir()) == []
+    for ep_idx in range(2):
+        for key in FEATURES:
+            for stat, value in sync_dataset.meta.episodes_stats[ep_idx][key].items():
+                np.testing.assert_allclose(dataset.meta.episodes_stats[ep_idx][key][stat], value)
+
+
+def test_recover_pending_episodes(tmp_path, empty_lerobot_dataset_factory, pending_dir):
+    dataset = empty_lerobot_dataset_factory(
+        root=tmp_path / "async", features=FEATURES, streaming_encoding=True
+    )
+    dataset.start_episode_finalizer(num_workers=1, max_backlog=2)
+    record_episodes(dataset, num_episodes=1)
+    dataset.episode_finalizer.wait_until_done()
+    # Simulate a crash: the snapshots of the next episodes are saved but the episodes are never committed
+    dataset.episode_finalizer.on_finalized = lambda episode, ep_stats: None
+    record_episodes(dataset, num_episodes=2)
+    dataset.stop_episode_finalizer()
+    assert dataset.num_episodes == 1
+    assert len(list(pending_dir.glob("*.pkl"))) == 2
+
+    # Readers leave the pending episodes to the next recording
+    reader = LeRobotDataset(DUMMY_REPO_ID, root=tmp_path / "async")
+    assert reader.num_episodes == 1
+    assert len(list(pending_dir.glob("*.pkl"))) == 2
+
+    LeRobotDataset.open_for_append(DUMMY_REPO_ID, root=tmp_path / "async")
+    resumed = LeRobotDataset(DUMMY_REPO_ID, root=tmp_path / "async")
+    assert resumed.num_episodes == 3
+    assert len(resumed.hf_dataset) == 12
+    assert resumed.hf_dataset["index"] == list(range(12))
+    assert len(list(resumed.root.rglob("*.mp4"))) == 3
+    assert list(pending_dir.glob("*.pkl")) == []
+
+
+def test_write_only_dataset_does_not_read_back_episodes(tmp_path, empty_lerobot_dataset_factory):
+    dataset = empty_lerobot_dataset_factory(
+        root=tmp_path / "async", features=FEATURES, streaming_encoding=True
+    )
+    record_episodes(dataset, num_episodes=1)
+
+    appended = LeRobotDataset.open_for_append(DUMMY_REPO_ID, root=tmp_path / "async", streaming_encoding=True)
+    with patch("lerobot.datasets.lerobot_dataset.pq") as pq:
+        appended.start_episode_finalizer(num_workers=1, max_backlog=2)
+        record_episodes(appended, num_episodes=2)
+        appended.stop_episode_finalizer()
+    pq.read_table.assert_not_called()
+    assert appended.num_episodes == 3
+
+
+def test_recover_partially_committed_episode(tmp_path, empty_lerobot_dataset_factory, pending_dir):
+    dataset = empty_lerobot_dataset_factory(
+        root=tmp_path / "async", features=FEATURES, streaming_encoding=True
+    )
+    dataset.start_episode_finalizer(num_workers=1, max_backlog=2)
+    record_episodes(dataset, num_episodes=1)
+    dataset.episode_finalizer.wait_until_done()
+
+    # Simulate a crash while committing the next episode: its entries are appended but info.json isn't written
+    def interrupted_commit(episode, ep_stats):
+        write_episode_stats(episode["episode_index"], ep_stats, dataset.root)
+        write_episode({"episode_index": episode["episode_index"]}, dataset.root)
+        with open(dataset.root / EPISODES_STATS_PATH, "a") as f:
+            f.write('{"episode_index": ')
+
+    dataset.episode_finalizer.on_finalized = interrupted_commit
+    record_episodes(dataset, num_episodes=1)
+    dataset.stop_episode_finalizer()
+    assert dataset.meta.total_episodes == 1
+
+    LeRobotDataset.open_for_append(DUMMY_REPO_ID, root=tmp_path / "async")
+    assert list(pending_dir.glob("*.pkl")) == []
+    resumed = LeRobotDataset(DUMMY_REPO_ID, root=tmp_path / "async")
+    assert resumed.num_episodes == 2
+    assert list(load_episodes(resumed.root)) == [0, 1]
+    assert resumed.meta.episodes[1]["length"] == 4
+    assert len(load_jsonlines(resumed.root / EPISODES_STATS_PATH)) == 2
+
+
+def test_pending_episodes_not_recovered_while_recording(tmp_path, empty_lerobot_dataset_factory, pending_dir):
+    dataset = empty_lerobot_dataset_factory(root=tmp_path / "async", features=FEATURES)
+    dataset.start_episode_finalizer(num_workers=1, max_backlog=2)
+    try:
+        dataset.episode_finalizer.on_finalized = lambda episode, ep_stats: None
+        record_episodes(dataset, num_episodes=1)
+        dataset.episode_finalizer.wait_until_done()
+        assert len(list(pending_dir.glob("*.pkl"))) == 1
+
+        with pytest.raises(RuntimeError, match="Another process is recording"):
+            LeRobotDataset.open_for_append(DUMMY_REPO_ID, root=tmp_path / "async")
+        assert len(list(pending_dir.glob("*.pkl"))) == 1
+    finally:
+        dataset.stop_episode_finalizer()
+
+    LeRobotDataset.open_for_append(DUMMY_REPO_ID, root=tmp_path / "async")
+    assert list(pending_dir.glob("*.pkl")) == []
+
+
+def test_pending_episodes_not_pushed(tmp_path, empty_lerobot_dataset_factory, pending_dir):
+    dataset = empty_lerobot_dataset_factory(
+        root=tmp_path / "async", features=FEATURES, streaming_encoding=True
+    )
+    dataset.start_episode_finalizer(num_workers=1, max_backlog=2)
+    record_episodes(dataset, num_episodes=1)
+    dataset.episode_finalizer.wait_until_done()
+    dataset.episode_finalizer.on_finalized = lambda episode, ep_stats: None
+    record_episodes(dataset, num_episodes=1)
+    dataset.stop_episode_finalizer()
+    assert len(list(pending_dir.glob("*.pkl"))) == 1
+
+    files = pushed_files(dataset)
+    assert "meta/info.json" in files
+    assert [path for path in files if path.endswith(".pkl")] == []
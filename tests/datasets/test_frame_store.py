@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+
+# Copyright 2024 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import pickle
+
+import pytest
+import torch
+
+from lerobot.datasets.frame_store import VideoFrameStore, build_frame_store
+from lerobot.datasets.utils import INFO_PATH, dataset_to_policy_features
+from tests.fixtures.constants import DEFAULT_FPS
+from tests.utils import pushed_files
+
+
+def fake_decode_video_frames(video_path, timestamps, tolerance_s, backend=None, decoder_cache=None):
+    """Frames filled with their index in the episode, so that they can be told apart."""
+    frame_indices = torch.tensor([round(ts * DEFAULT_FPS) for ts in timestamps], dtype=torch.float32)
+    return frame_indices[:, None, None, None].expand(-1, 3, 4, 5) / 255
+
+
+def test_write_and_query(tmp_path):
+    store = VideoFrameStore.create(tmp_path / "frames", fps=DEFAULT_FPS, episode_lengths={0: 3, 1: 2})
+    store.write_frames("cam", 1, 0, torch.full((2, 3, 4, 5), 7, dtype=torch.uint8))
+    store.add_episode(1)
+
+    reloaded = VideoFrameStore(tmp_path / "frames")
+    assert reloaded.episodes == {1}
+    frames = reloaded.query("cam", 1, [0.0, 1 / DEFAULT_FPS], tolerance_s=1e-4)
+    assert frames.shape == (2, 3, 4, 5)
+    assert frames.dtype == torch.float32
+    assert torch.allclose(frames, torch.tensor(7 / 255))
+
+
+def test_query_outside_episode_raises(tmp_path):
+    store = VideoFrameStore.create(tmp_path / "frames", fps=DEFAULT_FPS, episode_lengths={0: 3})
+    store.write_frames("cam", 0, 0, torch.zeros((3, 3, 4, 5), dtype=torch.uint8))
+    with pytest.raises(AssertionError):
+        store.query("cam", 0, [3 / DEFAULT_FPS], tolerance_s=1e-4)
+
+
+def test_pickled_without_memmaps(tmp_path):
+    store = VideoFrameStore.create(tmp_path / "frames", fps=DEFAULT_FPS, episode_lengths={0: 3})
+    store.write_frames("cam", 0, 0, torch.ones((3, 3, 4, 5), dtype=torch.uint8))
+    store.add_episode(0)
+
+    unpickled = pickle.loads(pickle.dumps(store))
+    assert unpickled._frames == {}
+    assert torch.equal(unpickled.query("cam", 0, [0.0], 1e-4), store.query("cam", 0, [0.0], 1e-4))
+
+
+@pytest.mark.parametrize("resolution", [None, (2, 3)])
+def test_dataset_reads_frame_store(tmp_path, monkeypatch, lerobot_dataset_factory, resolution):
+    monkeypatch.setattr("lerobot.datasets.frame_store.decode_video_frames", fake_decode_video_frames)
+    dataset = lerobot_dataset_factory(root=tmp_path / "test")
+    store = build_frame_store(dataset, resolution=resolution, chunk_size=16)
+    assert store.episodes == set(range(dataset.num_episodes))
+    dataset.frame_store = store
+
+    ep_idx = 1
+    timestamps = [0.0, 20 / DEFAULT_FPS, 21 / DEFAULT_FPS]
+    item = dataset._query_videos(dict.fromkeys(dataset.meta.video_keys, timestamps), ep_idx)
+    for key in dataset.meta.video_keys:
+        expected_hw = resolution if resolution is not None else (4, 5)
+        assert item[key].shape == (3, 3, *expected_hw)
+        assert torch.allclose(item[key][:, 0, 0, 0], torch.tensor([0.0, 20.0, 21.0]) / 255)
+
+
+def test_build_frame_store_extends_existing_store(tmp_path, monkeypatch, lerobot_dataset_factory):
+    decoded_episodes = []
+
+    def decode_video_frames(video_path, *args, **kwargs):
+        decoded_episodes.append(video_path.stem)
+        return fake_decode_video_frames(video_path, *args, **kwargs)
+
+    monkeypatch.setattr("lerobot.datasets.frame_store.decode_video_frames", decode_video_frames)
+    dataset = lerobot_dataset_factory(root=tmp_path / "test")
+    num_episodes = dataset.num_episodes
+    store = build_frame_store(dataset, resolution=(2, 3), chunk_size=1000)
+    old_frames = store._get_frames(dataset.meta.video_keys[0])
+
+    # Record one more episode
+    dataset.meta.episodes[num_episodes] = {"episode_index": num_episodes, "tasks": [], "length": 7}
+    decoded_episodes.clear()
+    store = build_frame_store(dataset, chunk_size=1000)
+    assert store.episodes == set(range(num_episodes + 1))
+    assert store.resolution == (2, 3)
+    assert set(decoded_episodes) == {f"episode_{num_episodes:06d}"}
+    frames = store.query(dataset.meta.video_keys[0], num_episodes, [6 / DEFAULT_FPS], 1e-4)
+    assert frames.shape == (1, 3, 2, 3)
+    assert torch.allclose(frames[0, 0, 0, 0], torch.tensor(6 / 255))
+    # Frames memory-mapped before the store was extended are not modified
+    assert len(old_frames) == len(store._get_frames(dataset.meta.video_keys[0])) - 7
+
+    with pytest.raises(ValueError, match="resolution"):
+        build_frame_store(dataset, resolution=(4, 5))
+    dataset.meta.episodes[num_episodes]["length"] = 8
+    with pytest.raises(ValueError, match="don't match"):
+        build_frame_store(dataset)
+    assert build_frame_store(dataset, overwrite=True).resolution is None
+
+
+def test_load_frame_store_does_not_build(tmp_path, monkeypatch, lerobot_dataset_factory):
+    monkeypatch.setattr("lerobot.datasets.frame_store.decode_video_frames", fake_decode_video_frames)
+    dataset = lerobot_dataset_factory(root=tmp_path / "test")
+    with pytest.raises(FileNotFoundError, match="decode_dataset_videos"):
+        dataset.load_frame_store()
+    assert not (tmp_path / "test" / "cache" / "frames").exists()
+
+    build_frame_store(dataset, chunk_size=16)
+    assert dataset.load_frame_store().episodes == set(range(dataset.num_episodes))
+
+
+def test_load_resized_frame_store_updates_features(tmp_path, monkeypatch, lerobot_dataset_factory):
+    monkeypatch.setattr("lerobot.datasets.frame_store.decode_video_frames", fake_decode_video_frames)
+    dataset = lerobot_dataset_factory(root=tmp_path / "test")
+    info = json.loads((tmp_path / "test" / INFO_PATH).read_text())
+    build_frame_store(dataset, resolution=(2, 3), chunk_size=16)
+    dataset.frame_store = dataset.load_frame_store()
+
+    item = dataset._query_videos(dict.fromkeys(dataset.meta.video_keys, [0.0]), 0)
+    policy_features = dataset_to_policy_features(dataset.meta.features)
+    for key in dataset.meta.video_keys:
+        assert policy_features[key].shape == item[key].shape
+        assert dataset.meta.shapes[key] != tuple(info["features"][key]["shape"])
+
+    # The shapes of the videos are not written back to info.json
+    with pytest.raises(RuntimeError, match="frame store"):
+        dataset.save_episode()
+    assert json.loads((tmp_path / "test" / INFO_PATH).read_text()) == info
+
+
+def test_frame_store_not_pushed(tmp_path, monkeypatch, lerobot_dataset_factory):
+    monkeypatch.setattr("lerobot.datasets.frame_store.decode_video_frames", fake_decode_video_frames)
+    dataset = lerobot_dataset_factory(root=tmp_path / "test")
+    build_frame_store(dataset, chunk_size=16)
+    assert any((tmp_path / "test" / "cache" / "frames").rglob("*.npy"))
+
+    files = pushed_files(dataset)
+    assert "meta/info.json" in files
+    assert not [path for path in files if path.startswith("cache/")]
@@ -22,11 +22,17 @@ from torchvision.transforms import v2
 from torchvision.transforms.v2 import functional as F  # noqa: N812
 
 from lerobot.datasets.transforms import (
+    BatchedImageTransforms,
     ImageTransformConfig,
     ImageTransforms,
     ImageTransformsConfig,
     RandomSubsetApply,
     SharpnessJitter,
+    adjust_brightness,
+    adjust_contrast,
+    adjust_hue,
+    adjust_saturation,
+    adjust_sharpness,
     make_transform_from_config,
 )
 from lerobot.scripts.visualize_image_transforms import (
@@ -380,3 +386,69 @@ def test_save_each_transform(img_tensor_factory, tmp_path):
             assert (transform_dir / file_name).exists(), (
                 f"{file_name} was not found in {transform} directory."
             )
+
+
+@pytest.mark.parametrize(
+    "batched_fn, fn, factor_range",
+    [
+        (adjust_brightness, F.adjust_brightness, (0.5, 1.5)),
+        (adjust_contrast, F.adjust_contrast, (0.5, 1.5)),
+        (adjust_saturation, F.adjust_saturation, (0.5, 1.5)),
+        (adjust_hue, F.adjust_hue, (-0.1, 0.1)),
+        (adjust_sharpness, F.adjust_sharpness, (0.5, 1.5)),
+    ],
+)
+@pytest.mark.parametrize("shape", [(4, 3, 8, 10), (4, 2, 3, 8, 10)])
+def test_batched_adjust_matches_torchvision(batched_fn, fn, factor_range, shape):
+    torch.manual_seed(0)
+    images = torch.rand(shape)
+    factors = torch.empty(shape[0]).uniform_(*factor_range)
+
+    output = batched_fn(images.clone(), factors.view(-1, *[1] * (len(shape) - 1)))
+    for image, factor, image_output in zip(images, factors, output, strict=True):
+        torch.testing.assert_close(image_output, fn(image, factor.item()), atol=1e-5, rtol=0)
+
+
+@pytest.mark.parametrize(
+    "tf_cfg",
+    [
+        ImageTransformConfig(type="ColorJitter", kwargs={"brightness": (0.7, 0.7)}),
+        ImageTransformConfig(type="ColorJitter", kwargs={"contrast": (1.3, 1.3)}),
+        ImageTransformConfig(type="ColorJitter", kwargs={"saturation": (0.6, 0.6)}),
+        ImageTransformConfig(type="ColorJitter", kwargs={"hue": (0.05, 0.05)}),
+        ImageTransformConfig(type="SharpnessJitter", kwargs={"sharpness": (1.4, 1.4)}),
+    ],
+)
+def test_batched_image_transforms_match_per_item(tf_cfg):
+    cfg = ImageTransformsConfig(enable=True, batched=True, max_num_transforms=1, tfs={"tf": tf_cfg})
+    images = torch.rand(4, 2, 3, 8, 10)
+
+    per_item = ImageTransforms(cfg)
+    expected = torch.stack([per_item(image) for image in images])
+    output = BatchedImageTransforms(cfg, seed=0)({"cam": images}, ["cam"])["cam"]
+    torch.testing.assert_close(output, expected, atol=1e-5, rtol=0)
+
+
+def test_batched_image_transforms_seed():
+    cfg = ImageTransformsConfig(enable=True, batched=True, random_order=True)
+    batch = {
+        "cam_1": torch.rand(8, 3, 8, 10),
+        "cam_2": torch.rand(8, 3, 8, 10),
+        "cam_3": torch.rand(8, 3, 6, 6),
+    }
+    camera_keys = list(batch)
+
+    outputs = BatchedImageTransforms(cfg, seed=0)(dict(batch), camera_keys)
+    assert all(outputs[key].shape == batch[key].shape for key in camera_keys)
+    assert not torch.equal(outputs["cam_1"], batch["cam_1"])
+    assert all(outputs[key].min() >= 0 and outputs[key].max() <= 1 for key in camera_keys)
+
+    same_seed_outputs = BatchedImageTransforms(cfg, seed=0)(dict(batch), camera_keys)
+    assert all(torch.equal(outputs[key], same_seed_outputs[key]) for key in camera_keys)
+
+
+def test_batched_image_transforms_disabled():
+    cfg = ImageTransformsConfig(enable=False, batched=True)
+    images = torch.rand(2, 3, 8, 10)
+    output = BatchedImageTransforms(cfg, seed=0)({"cam": images}, ["cam"])
+    assert torch.equal(output["cam"], images)
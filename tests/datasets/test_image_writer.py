@@ -22,6 +22,7 @@ from PIL import Image
 
 from lerobot.datasets.image_writer import (
     AsyncImageWriter,
+    FrameFormat,
     image_array_to_pil_image,
     safe_stop_image_writer,
     write_image,
@@ -148,6 +149,35 @@ def test_write_image_exception(tmp_path):
         assert not fpath.exists()
 
 
+def test_write_image_npy(tmp_path, img_tensor_factory):
+    image_array = img_tensor_factory().numpy()
+    fpath = tmp_path / "frame_000000.npy"
+    write_image(image_array, fpath)
+    assert np.array_equal(np.load(fpath), (image_array.transpose(1, 2, 0) * 255).astype(np.uint8))
+
+
+def test_write_image_frame_format(tmp_path):
+    # Compressible gradient, unlike random images
+    image_array = np.broadcast_to(np.arange(100, dtype=np.uint8)[:, None, None], (100, 100, 3)).copy()
+    write_image(image_array, tmp_path / "fast.png", FrameFormat(png_compress_level=0))
+    write_image(image_array, tmp_path / "small.png", FrameFormat(png_compress_level=9))
+    write_image(image_array, tmp_path / "low.jpg", FrameFormat("jpeg", jpeg_quality=10))
+    write_image(image_array, tmp_path / "high.jpg", FrameFormat("jpeg", jpeg_quality=95))
+
+    assert (tmp_path / "fast.png").stat().st_size > (tmp_path / "small.png").stat().st_size
+    assert (tmp_path / "high.jpg").stat().st_size > (tmp_path / "low.jpg").stat().st_size
+    for lossless in ["fast.png", "small.png"]:
+        assert np.array_equal(np.array(Image.open(tmp_path / lossless)), image_array)
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"codec": "qoi"}, {"png_compress_level": 10}, {"codec": "jpeg", "jpeg_quality": 0}]
+)
+def test_invalid_frame_format(kwargs):
+    with pytest.raises(ValueError):
+        FrameFormat(**kwargs)
+
+
 def test_save_image_numpy(tmp_path, img_array_factory):
     writer = AsyncImageWriter()
     try:
@@ -177,6 +207,64 @@ def test_save_image_numpy_multiprocessing(tmp_path, img_array_factory):
         writer.stop()
 
 
+def test_save_image_shared_memory(tmp_path, img_array_factory):
+    writer = AsyncImageWriter(num_processes=1, num_threads=2, num_shared_slots=2)
+    try:
+        image_arrays = [img_array_factory() for _ in range(6)] + [img_array_factory(height=50)]
+        fpaths = [tmp_path / f"frame_{i:06d}.png" for i in range(len(image_arrays))]
+        for image_array, fpath in zip(image_arrays, fpaths, strict=True):
+            writer.save_image(image_array, fpath)
+        writer.wait_until_done()
+        # One ring per frame shape, whose slots are reused once their frame is written
+        assert len(writer.rings) == 2
+        for image_array, fpath in zip(image_arrays, fpaths, strict=True):
+            assert np.array_equal(np.array(Image.open(fpath)), image_array)
+    finally:
+        writer.stop()
+    assert writer.rings == {}
+
+
+def test_save_image_shared_memory_backpressure(tmp_path, img_array_factory):
+    writer = AsyncImageWriter(num_processes=1, num_threads=1, num_shared_slots=1)
+    try:
+        num_images = 10
+        for i in range(num_images):
+            writer.save_image(img_array_factory(height=500, width=500), tmp_path / f"frame_{i:06d}.png")
+        writer.wait_until_done()
+        # Frames wait for a free slot instead of being dropped
+        assert writer.num_backpressure_waits > 0
+        assert len(list(tmp_path.glob("*.png"))) == num_images
+    finally:
+        writer.stop()
+
+
+def test_save_image_shared_memory_dead_process(tmp_path, img_array_factory, monkeypatch):
+    monkeypatch.setattr("lerobot.datasets.image_writer.RELEASED_SLOT_POLL_S", 0.01)
+    writer = AsyncImageWriter(num_processes=1, num_threads=1, num_shared_slots=1)
+    try:
+        writer.processes[0].kill()
+        writer.processes[0].join()
+        writer.save_image(img_array_factory(), tmp_path / "frame_000000.png")
+        # The slot of the first frame is never released
+        with pytest.raises(RuntimeError, match="died"):
+            writer.save_image(img_array_factory(), tmp_path / "frame_000001.png")
+    finally:
+        writer.stop()
+
+
+@pytest.mark.parametrize("num_processes", [0, 1])
+def test_save_image_npy(tmp_path, img_array_factory, num_processes):
+    writer = AsyncImageWriter(num_processes=num_processes, num_threads=1, frame_format=FrameFormat("npy"))
+    try:
+        image_array = img_array_factory()
+        fpath = tmp_path / "frame_000000.npy"
+        writer.save_image(image_array, fpath)
+        writer.wait_until_done()
+        assert np.array_equal(np.load(fpath), image_array)
+    finally:
+        writer.stop()
+
+
 def test_save_image_torch(tmp_path, img_tensor_factory):
     writer = AsyncImageWriter()
     try:
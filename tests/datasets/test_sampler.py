@@ -13,10 +13,12 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import pytest
+import torch
 from datasets import Dataset
 
 from lerobot.datasets.push_dataset_to_hub.utils import calculate_episode_data_index
-from lerobot.datasets.sampler import EpisodeAwareSampler
+from lerobot.datasets.sampler import EpisodeAwareSampler, WeightedMixtureSampler
 from lerobot.datasets.utils import (
     hf_transform_to_torch,
 )
@@ -88,3 +90,53 @@ def test_shuffle():
     assert sampler.indices == [0, 1, 2, 3, 4, 5]
     assert len(sampler) == 6
     assert set(sampler) == {0, 1, 2, 3, 4, 5}
+
+
+@pytest.fixture
+def mixture_episode_data_index():
+    # Dataset 0 has episodes [0, 4) and [4, 6), dataset 1 has episode [6, 16).
+    return {"from": torch.tensor([0, 4, 6]), "to": torch.tensor([4, 6, 16])}
+
+
+def test_mixture_drop_frames(mixture_episode_data_index):
+    sampler = WeightedMixtureSampler(
+        mixture_episode_data_index, [0, 6, 16], drop_n_first_frames=1, drop_n_last_frames=1
+    )
+    assert sampler.indices.tolist() == [1, 2, *range(7, 15)]
+    assert sampler.dataset_sizes.tolist() == [2, 8]
+    assert len(sampler) == 10
+    assert set(sampler).issubset({1, 2, *range(7, 15)})
+
+
+@pytest.mark.parametrize(
+    "weights, temperature, expected",
+    [
+        (None, 1.0, [6 / 16, 10 / 16]),
+        (None, 1e6, [0.5, 0.5]),
+        ([1, 3], 1.0, [0.25, 0.75]),
+        ([1, 4], 2.0, [1 / 3, 2 / 3]),
+    ],
+)
+def test_mixture_probabilities(mixture_episode_data_index, weights, temperature, expected):
+    sampler = WeightedMixtureSampler(mixture_episode_data_index, [0, 6, 16], weights, temperature)
+    assert torch.allclose(sampler.probabilities, torch.tensor(expected, dtype=torch.float64), atol=1e-5)
+
+
+def test_mixture_sampling(mixture_episode_data_index):
+    torch.manual_seed(0)
+    sampler = WeightedMixtureSampler(mixture_episode_data_index, [0, 6, 16], weights=[0, 1], num_samples=100)
+    samples = list(sampler)
+    assert len(samples) == 100
+    assert all(6 <= idx < 16 for idx in samples)
+
+    torch.manual_seed(0)
+    assert list(sampler) == samples
+
+
+def test_mixture_invalid_weights(mixture_episode_data_index):
+    with pytest.raises(ValueError):
+        WeightedMixtureSampler(mixture_episode_data_index, [0, 6, 16], weights=[1.0])
+    with pytest.raises(ValueError):
+        WeightedMixtureSampler(mixture_episode_data_index, [0, 6, 16], weights=[0, 0])
+    with pytest.raises(ValueError):
+        WeightedMixtureSampler(mixture_episode_data_index, [0, 6, 16], temperature=0)
@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+
+# Copyright 2024 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import math
+from types import SimpleNamespace
+
+import pytest
+import torch
+
+from lerobot.datasets.streaming_dataset import StreamingLeRobotDataset
+from tests.fixtures.constants import DEFAULT_FPS, DUMMY_REPO_ID
+
+
+def fake_decode_video_frames(video_path, timestamps, tolerance_s, backend=None, decoder_cache=None):
+    """Frames filled with their index in the episode, so that they can be told apart."""
+    frame_indices = torch.tensor([round(ts * DEFAULT_FPS) for ts in timestamps], dtype=torch.float32)
+    return frame_indices[:, None, None, None].expand(-1, 3, 4, 5) / 255
+
+
+@pytest.fixture
+def dataset(tmp_path, info_factory, lerobot_dataset_factory):
+    info = info_factory(total_episodes=4, total_frames=200, total_tasks=1, camera_features={})
+    delta_timestamps = {"action": [i / info["fps"] for i in range(-2, 5)], "state": [-1 / info["fps"], 0]}
+    return lerobot_dataset_factory(root=tmp_path / "test", info=info, delta_timestamps=delta_timestamps)
+
+
+def assert_items_equal(item, expected):
+    assert item.keys() == expected.keys()
+    for key in expected:
+        if isinstance(expected[key], torch.Tensor):
+            assert item[key].dtype == expected[key].dtype, key
+            assert torch.equal(item[key], expected[key]), key
+        else:
+            assert item[key] == expected[key], key
+
+
+def make_streaming_dataset(dataset, **kwargs):
+    return StreamingLeRobotDataset(
+        DUMMY_REPO_ID,
+        root=dataset.root,
+        delta_timestamps=dataset.delta_timestamps,
+        read_batch_size=16,
+        **kwargs,
+    )
+
+
+def test_stream_matches_dataset(dataset):
+    streaming_dataset = make_streaming_dataset(dataset, shuffle=False)
+    assert len(streaming_dataset) == len(dataset)
+
+    items = list(streaming_dataset)
+    assert len(items) == len(dataset)
+    for idx, item in enumerate(items):
+        assert_items_equal(item, dataset[idx])
+
+
+def test_shuffle(dataset):
+    streaming_dataset = make_streaming_dataset(dataset, shuffle_buffer_size=32, seed=1)
+    indices = [item["index"].item() for item in streaming_dataset]
+    assert sorted(indices) == list(range(len(dataset)))
+    assert indices != sorted(indices)
+    assert [item["index"].item() for item in streaming_dataset] == indices
+
+    streaming_dataset.set_epoch(1)
+    assert [item["index"].item() for item in streaming_dataset] != indices
+
+    item = next(item for item in streaming_dataset if item["index"].item() == 60)
+    assert_items_equal(item, dataset[60])
+
+
+@pytest.mark.parametrize("world_size, num_workers", [(1, 3), (2, 2), (3, 2)])
+def test_shards_are_disjoint(dataset, monkeypatch, world_size, num_workers):
+    all_indices = []
+    worker_lengths = [set() for _ in range(num_workers)]
+    for rank in range(world_size):
+        streaming_dataset = make_streaming_dataset(dataset, rank=rank, world_size=world_size)
+        rank_indices = []
+        for worker_id in range(num_workers):
+            worker_info = SimpleNamespace(id=worker_id, num_workers=num_workers)
+            monkeypatch.setattr("torch.utils.data.get_worker_info", lambda info=worker_info: info)
+            worker_indices = [item["index"].item() for item in streaming_dataset]
+            rank_indices.extend(worker_indices)
+            worker_lengths[worker_id].add(len(worker_indices))
+        assert len(rank_indices) == len(streaming_dataset) == math.ceil(len(dataset) / world_size)
+        all_indices.extend(rank_indices)
+
+    # Workers of every rank yield the same number of frames, so that ranks run the same number of steps.
+    assert all(len(lengths) == 1 for lengths in worker_lengths)
+    # The first frames of the epoch are repeated to give the same number of frames to every rank.
+    num_padded = world_size * math.ceil(len(dataset) / world_size) - len(dataset)
+    assert sorted(set(all_indices)) == list(range(len(dataset)))
+    assert len(all_indices) == len(dataset) + num_padded
+
+
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_set_position(dataset, monkeypatch, num_workers):
+    batch_size, num_batches = 4, 5
+    streaming_dataset = make_streaming_dataset(dataset, shuffle_buffer_size=32)
+    for worker_id in range(num_workers):
+        worker_info = SimpleNamespace(id=worker_id, num_workers=num_workers)
+        monkeypatch.setattr("torch.utils.data.get_worker_info", lambda info=worker_info: info)
+
+        streaming_dataset.set_epoch(3)
+        indices = [item["index"].item() for item in streaming_dataset]
+        streaming_dataset.set_position(3, num_batches, batch_size)
+        resumed_indices = [item["index"].item() for item in streaming_dataset]
+
+        num_consumed = len(range(worker_id, num_batches, num_workers)) * batch_size
+        assert resumed_indices == indices[num_consumed:]
+
+
+@pytest.mark.parametrize("shuffle", [False, True])
+def test_stream_videos(tmp_path, monkeypatch, lerobot_dataset_factory, shuffle):
+    decoded = []
+
+    def decode_video_frames(video_path, timestamps, *args, **kwargs):
+        decoded.append((video_path, timestamps[-1]))
+        return fake_decode_video_frames(video_path, timestamps, *args, **kwargs)
+
+    monkeypatch.setattr("lerobot.datasets.streaming_dataset.decode_video_frames", decode_video_frames)
+    delta_timestamps = {"action": [0, 1 / DEFAULT_FPS], "laptop": [-1 / DEFAULT_FPS, 0]}
+    dataset = lerobot_dataset_factory(root=tmp_path / "test", delta_timestamps=delta_timestamps)
+    # The dataset factory doesn't write video files.
+    streaming_dataset = make_streaming_dataset(
+        dataset, shuffle=shuffle, shuffle_buffer_size=32, download_videos=False
+    )
+
+    items = list(streaming_dataset)
+    assert len(items) == len(dataset)
+    # Videos are decoded sequentially even when the frames are shuffled.
+    for video_path in {path for path, _ in decoded}:
+        timestamps = [ts for path, ts in decoded if path == video_path]
+        assert timestamps == sorted(timestamps)
+
+    for item in items:
+        frame_index = item["frame_index"].item()
+        for key in dataset.meta.video_keys:
+            if key == "laptop":
+                assert item[key].shape == (2, 3, 4, 5)
+                expected = torch.tensor([max(frame_index - 1, 0), frame_index], dtype=torch.float32) / 255
+                assert torch.equal(item[key][:, 0, 0, 0], expected)
+                assert item[f"{key}_is_pad"].tolist() == [frame_index == 0, False]
+            else:
+                assert item[key].shape == (3, 4, 5)
+                assert item[key][0, 0, 0] == frame_index / 255
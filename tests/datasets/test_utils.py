@@ -14,12 +14,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import pytest
 import torch
 from datasets import Dataset
 from huggingface_hub import DatasetCard
 
 from lerobot.datasets.push_dataset_to_hub.utils import calculate_episode_data_index
-from lerobot.datasets.utils import create_lerobot_dataset_card, hf_transform_to_torch
+from lerobot.datasets.utils import (
+    create_lerobot_dataset_card,
+    hf_transform_to_torch,
+    load_last_jsonline,
+    write_jsonlines,
+)
 
 
 def test_default_parameters():
@@ -53,3 +59,17 @@ def test_calculate_episode_data_index():
     episode_data_index = calculate_episode_data_index(dataset)
     assert torch.equal(episode_data_index["from"], torch.tensor([0, 2, 3]))
     assert torch.equal(episode_data_index["to"], torch.tensor([2, 3, 6]))
+
+
+@pytest.mark.parametrize("block_size", [4, 4096])
+def test_load_last_jsonline(tmp_path, block_size):
+    fpath = tmp_path / "episodes.jsonl"
+    items = [{"episode_index": i, "tasks": ["Dummy task"] * i} for i in range(20)]
+    write_jsonlines(items, fpath)
+    assert load_last_jsonline(fpath, block_size=block_size) == items[-1]
+
+    write_jsonlines(items[:1], fpath)
+    assert load_last_jsonline(fpath, block_size=block_size) == items[0]
+
+    fpath.write_text("")
+    assert load_last_jsonline(fpath, block_size=block_size) is None
@@ -0,0 +1,213 @@
+#!/usr/bin/env python
+
+# Copyright 2024 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pickle
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+import torch
+from PIL import Image
+
+from lerobot.datasets.image_writer import FrameFormat, write_image
+from lerobot.datasets.video_utils import (
+    StreamingVideoEncoder,
+    VideoDecoderCache,
+    VideoEncodingJob,
+    decode_video_frames_torchcodec,
+    encode_videos,
+    get_frame_paths,
+    get_video_encoding_options,
+    get_video_info,
+)
+from tests.fixtures.constants import DEFAULT_FPS, DUMMY_HWC
+
+
+@pytest.fixture
+def decoder_cache(monkeypatch):
+    monkeypatch.setattr(VideoDecoderCache, "_open", lambda self, video_path, device: object())
+    return VideoDecoderCache(capacity=2)
+
+
+def test_decoder_cache_invalid_capacity():
+    with pytest.raises(ValueError):
+        VideoDecoderCache(capacity=0)
+
+
+def test_decoder_cache_hits_and_misses(decoder_cache):
+    decoder = decoder_cache.get("a.mp4")
+    assert decoder_cache.get("a.mp4") is decoder
+    assert decoder_cache.get("b.mp4") is not decoder
+    assert (decoder_cache.hits, decoder_cache.misses) == (1, 2)
+    assert len(decoder_cache) == 2
+
+
+def test_decoder_cache_evicts_least_recently_used(decoder_cache):
+    decoder_a = decoder_cache.get("a.mp4")
+    decoder_b = decoder_cache.get("b.mp4")
+    decoder_cache.get("a.mp4")
+    decoder_cache.get("c.mp4")
+
+    assert len(decoder_cache) == 2
+    assert decoder_cache.get("a.mp4") is decoder_a
+    assert decoder_cache.get("b.mp4") is not decoder_b
+
+
+def test_decoder_cache_reset_in_new_process(decoder_cache):
+    decoder = decoder_cache.get("a.mp4")
+    decoder_cache._pid = -1  # Simulate a forked process
+    assert decoder_cache.get("a.mp4") is not decoder
+    assert (decoder_cache.hits, decoder_cache.misses) == (0, 1)
+
+
+def test_decoder_cache_pickled_empty(decoder_cache):
+    decoder_cache.get("a.mp4")
+    unpickled = pickle.loads(pickle.dumps(decoder_cache))
+    assert unpickled.capacity == decoder_cache.capacity
+    assert len(unpickled) == 0
+
+
+class FakeVideoDecoder:
+    """Decoder of a 30 fps video whose frames are filled with their index."""
+
+    def __init__(self, fps: int = 30):
+        self.metadata = SimpleNamespace(average_fps=fps)
+        self.fps = fps
+        self.calls = []
+
+    def _frames(self, indices: list[int]) -> SimpleNamespace:
+        return SimpleNamespace(
+            data=torch.tensor(indices, dtype=torch.uint8)[:, None, None, None].expand(-1, 3, 2, 2),
+            pts_seconds=torch.tensor(indices, dtype=torch.float64) / self.fps,
+        )
+
+    def get_frames_at(self, indices: list[int]) -> SimpleNamespace:
+        self.calls.append(("at", list(indices)))
+        return self._frames(list(indices))
+
+    def get_frames_in_range(self, start: int, stop: int) -> SimpleNamespace:
+        self.calls.append(("range", start, stop))
+        return self._frames(list(range(start, stop)))
+
+
+@pytest.mark.parametrize(
+    "frame_indices, expected_call",
+    [
+        ([3, 4, 5, 6], ("range", 3, 7)),
+        ([5, 4, 4, 3], ("range", 3, 6)),
+        ([7], ("range", 7, 8)),
+        ([2, 6, 6, 9], ("at", [2, 6, 9])),
+    ],
+)
+def test_decode_torchcodec_clip(monkeypatch, frame_indices, expected_call):
+    fake_decoder = FakeVideoDecoder()
+    monkeypatch.setattr(VideoDecoderCache, "_open", lambda self, video_path, device: fake_decoder)
+
+    timestamps = [idx / fake_decoder.fps for idx in frame_indices]
+    frames = decode_video_frames_torchcodec(
+        "a.mp4", timestamps, tolerance_s=1e-4, decoder_cache=VideoDecoderCache()
+    )
+
+    assert fake_decoder.calls == [expected_call]
+    assert frames.shape == (len(frame_indices), 3, 2, 2)
+    assert torch.equal(frames[:, 0, 0, 0], torch.tensor(frame_indices, dtype=torch.float32) / 255)
+
+
+def test_streaming_encoder_finish(tmp_path):
+    video_path = tmp_path / "videos" / "episode_000000.mp4"
+    encoder = StreamingVideoEncoder(video_path, DEFAULT_FPS, queue_size=2, max_sampled_frames=4)
+    for _ in range(10):
+        encoder.add_frame(np.random.randint(0, 256, DUMMY_HWC, dtype=np.uint8))
+    assert encoder.finish() == video_path
+
+    assert not encoder.tmp_path.exists()
+    assert get_video_info(video_path)["video.height"] == DUMMY_HWC[0]
+    # 4 samples reached twice: the frames 0, 4 and 8 are kept with a stride of 4
+    assert encoder.num_frames == 10
+    assert len(encoder.sampled_frames) == 3
+    assert encoder.sampled_frames[0].shape == (3, *DUMMY_HWC[:2])
+    with pytest.raises(RuntimeError):
+        encoder.add_frame(np.zeros(DUMMY_HWC, dtype=np.uint8))
+
+
+def test_streaming_encoder_abort(tmp_path):
+    video_path = tmp_path / "episode_000000.mp4"
+    encoder = StreamingVideoEncoder(video_path, DEFAULT_FPS)
+    encoder.add_frame(np.zeros(DUMMY_HWC, dtype=np.uint8))
+    encoder.abort()
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_streaming_encoder_error_is_raised(tmp_path):
+    encoder = StreamingVideoEncoder(tmp_path / "episode_000000.mp4", DEFAULT_FPS)
+    encoder.add_frame(np.zeros(DUMMY_HWC, dtype=np.float32))  # not a uint8 frame
+    with pytest.raises(RuntimeError):
+        encoder.finish()
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize(
+    "vcodec, fast_decode, expected_options",
+    [
+        ("libsvtav1", 0, {"svtav1-params": "lp=2"}),
+        ("libsvtav1", 1, {"svtav1-params": "fast-decode=1:lp=2"}),
+        ("h264", 0, {"threads": "2"}),
+    ],
+)
+def test_video_encoding_options_threads(vcodec, fast_decode, expected_options):
+    _, options = get_video_encoding_options(vcodec, g=None, crf=None, fast_decode=fast_decode, num_threads=2)
+    assert options == expected_options
+
+
+@pytest.mark.parametrize("use_processes", [False, True])
+def test_encode_videos(tmp_path, use_processes):
+    # Videos are encoded in a pool, since encoding them in the main thread of the test process disturbs the
+    # serial port mocks of the motors tests.
+    jobs = []
+    for i in range(3):
+        imgs_dir = tmp_path / "images" / f"episode_{i:06d}"
+        imgs_dir.mkdir(parents=True)
+        for frame_index in range(2):
+            image = Image.fromarray(np.full(DUMMY_HWC, 50 * i, dtype=np.uint8))
+            image.save(imgs_dir / f"frame_{frame_index:06d}.png")
+        jobs.append(VideoEncodingJob(imgs_dir, tmp_path / "videos" / f"episode_{i:06d}.mp4", DEFAULT_FPS))
+
+    done = list(encode_videos(jobs, num_workers=2, threads_per_job=1, use_processes=use_processes))
+
+    assert sorted(job.video_path for job in done) == [job.video_path for job in jobs]
+    for job in jobs:
+        assert get_video_info(job.video_path)["video.width"] == DUMMY_HWC[1]
+
+
+@pytest.mark.parametrize("codec", ["jpeg", "npy"])
+def test_encode_videos_frame_formats(tmp_path, codec):
+    frame_format = FrameFormat(codec)
+    imgs_dir = tmp_path / "images"
+    imgs_dir.mkdir()
+    for frame_index in reversed(range(11)):
+        image = np.full(DUMMY_HWC, 20 * frame_index, dtype=np.uint8)
+        write_image(image, imgs_dir / f"frame_{frame_index:06d}{frame_format.suffix}", frame_format)
+    (imgs_dir / "frame_000011.tmp").touch()  # not a frame
+    frame_paths = get_frame_paths(imgs_dir)
+    assert [int(path[-10:-4]) for path in frame_paths] == list(range(11))
+
+    # 2 jobs, since a single one is encoded in the main thread
+    jobs = [VideoEncodingJob(imgs_dir, tmp_path / f"episode_{i:06d}.mp4", DEFAULT_FPS) for i in range(2)]
+    list(encode_videos(jobs, num_workers=2, threads_per_job=1, use_processes=False))
+
+    for job in jobs:
+        info = get_video_info(job.video_path)
+        assert (info["video.height"], info["video.width"]) == DUMMY_HWC[:2]
@@ -393,6 +393,30 @@ class MockMotors(MockSerial):
         )
         return stub_name
 
+    def build_sync_read_many_stub(self, registers_values: dict[tuple[int, int], dict[int, int]]) -> str:
+        """Sync read of the span of addresses covering several (address, length) registers, which are
+        replied with their 'ids_values' (and zeros in between)."""
+        address = min(addr for addr, _ in registers_values)
+        length = max(addr + length for addr, length in registers_values) - address
+        ids = list(next(iter(registers_values.values())))
+        sync_read_request = MockInstructionPacket.sync_read(ids, address, length)
+        return_packets = b""
+        for id_ in ids:
+            params = [0] * length
+            for (addr, reg_length), ids_values in registers_values.items():
+                start = addr - address
+                params[start : start + reg_length] = _split_into_byte_chunks(ids_values[id_], reg_length)
+            return_packets += MockStatusPacket.build(id_, params=params, length=length + 2)
+
+        sync_read_response = self._build_send_fn(return_packets)
+        stub_name = f"Sync_Read_Many_{address}_{length}_" + "_".join([str(id_) for id_ in ids])
+        self.stub(
+            name=stub_name,
+            receive_bytes=sync_read_request,
+            send_fn=sync_read_response,
+        )
+        return stub_name
+
     def build_sequential_sync_read_stub(
         self, address: int, length: int, ids_values: dict[int, list[int]] | None = None
     ) -> str:
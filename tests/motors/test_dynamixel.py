@@ -281,6 +281,33 @@ def test__sync_read_comm(raise_on_error, mock_motors, dummy_motors):
     assert mock_motors.stubs[stub].called
 
 
+def test_sync_read_many(mock_motors, dummy_motors, dummy_calibration):
+    data_names = ["Present_Position", "Present_Velocity", "Present_Current"]
+    positions = {1: 1337, 2: 42, 3: 3000}
+    velocities = {1: 20, 2: -35, 3: 0}
+    currents = {1: 120, 2: 80, 3: 0}
+    encoded_velocities = {id_: encode_twos_complement(vel, 4) for id_, vel in velocities.items()}
+    registers_values = dict(
+        zip(
+            [X_SERIES_CONTROL_TABLE[name] for name in data_names],
+            [positions, encoded_velocities, currents],
+            strict=True,
+        )
+    )
+    stub = mock_motors.build_sync_read_many_stub(registers_values)
+    bus = DynamixelMotorsBus(port=mock_motors.port, motors=dummy_motors, calibration=dummy_calibration)
+    bus.connect(handshake=False)
+
+    values = bus.sync_read_many(data_names)
+
+    assert mock_motors.stubs[stub].calls == 1
+    expected = [bus._normalize(positions), velocities, currents]
+    assert values == {
+        name: {f"dummy_{id_}": value for id_, value in ids_values.items()}
+        for name, ids_values in zip(data_names, expected, strict=True)
+    }
+
+
 @pytest.mark.parametrize(
     "addr, length, ids_values",
     [
@@ -301,6 +328,43 @@ def test__sync_write(addr, length, ids_values, mock_motors, dummy_motors):
     assert comm == dxl.COMM_SUCCESS
 
 
+def test__sync_read_reuses_reader(mock_motors, dummy_motors):
+    addr, length, ids_values = (10, 2, {1: 1337, 2: 42})
+    stub = mock_motors.build_sync_read_stub(addr, length, ids_values)
+    other_stub = mock_motors.build_sync_read_stub(addr, length, {1: 1337})
+    bus = DynamixelMotorsBus(port=mock_motors.port, motors=dummy_motors)
+    bus.connect(handshake=False)
+
+    bus._sync_read(addr, length, list(ids_values))
+    sync_reader = bus.sync_reader
+    read_values, _ = bus._sync_read(addr, length, list(ids_values))
+
+    assert bus.sync_reader is sync_reader
+    assert mock_motors.stubs[stub].calls == 2
+    assert read_values == ids_values
+
+    read_values, _ = bus._sync_read(addr, length, [1])
+
+    assert bus.sync_reader is not sync_reader
+    assert mock_motors.stubs[other_stub].calls == 1
+    assert read_values == {1: 1337}
+
+
+def test__sync_write_changes_params(mock_motors, dummy_motors):
+    addr, length = (42, 4)
+    bus = DynamixelMotorsBus(port=mock_motors.port, motors=dummy_motors)
+    bus.connect(handshake=False)
+
+    for ids_values in ({1: 1337, 2: 42}, {1: 4016, 2: 7}):
+        stub = mock_motors.build_sync_write_stub(addr, length, ids_values)
+        comm = bus._sync_write(addr, length, ids_values)
+
+        assert mock_motors.stubs[stub].wait_called()
+        assert comm == dxl.COMM_SUCCESS
+
+    assert len(bus._sync_writers) == 1
+
+
 def test_is_calibrated(mock_motors, dummy_motors, dummy_calibration):
     drive_modes = {m.id: m.drive_mode for m in dummy_calibration.values()}
     encoded_homings = {m.id: encode_twos_complement(m.homing_offset, 4) for m in dummy_calibration.values()}
@@ -16,6 +16,8 @@
 
 import re
 import sys
+import threading
+import time
 from collections.abc import Generator
 from unittest.mock import MagicMock, patch
 
@@ -311,6 +313,33 @@ def test__sync_read_comm(raise_on_error, mock_motors, dummy_motors):
     assert mock_motors.stubs[stub].called
 
 
+def test_sync_read_many(mock_motors, dummy_motors, dummy_calibration):
+    data_names = ["Present_Position", "Present_Velocity", "Present_Current"]
+    positions = {1: 1337, 2: 42, 3: 3000}
+    velocities = {1: 20, 2: -35, 3: 0}
+    currents = {1: 120, 2: 80, 3: 0}
+    encoded_velocities = {id_: encode_sign_magnitude(vel, 15) for id_, vel in velocities.items()}
+    registers_values = dict(
+        zip(
+            [STS_SMS_SERIES_CONTROL_TABLE[name] for name in data_names],
+            [positions, encoded_velocities, currents],
+            strict=True,
+        )
+    )
+    stub = mock_motors.build_sync_read_many_stub(registers_values)
+    bus = FeetechMotorsBus(port=mock_motors.port, motors=dummy_motors, calibration=dummy_calibration)
+    bus.connect(handshake=False)
+
+    values = bus.sync_read_many(data_names)
+
+    assert mock_motors.stubs[stub].calls == 1
+    expected = [bus._normalize(positions), velocities, currents]
+    assert values == {
+        name: {f"dummy_{id_}": value for id_, value in ids_values.items()}
+        for name, ids_values in zip(data_names, expected, strict=True)
+    }
+
+
 @pytest.mark.parametrize(
     "addr, length, ids_values",
     [
@@ -331,6 +360,153 @@ def test__sync_write(addr, length, ids_values, mock_motors, dummy_motors):
     assert comm == scs.COMM_SUCCESS
 
 
+def test__sync_read_reuses_reader(mock_motors, dummy_motors):
+    addr, length, ids_values = (10, 2, {1: 1337, 2: 42})
+    stub = mock_motors.build_sync_read_stub(addr, length, ids_values)
+    other_stub = mock_motors.build_sync_read_stub(addr, length, {1: 1337})
+    bus = FeetechMotorsBus(port=mock_motors.port, motors=dummy_motors)
+    bus.connect(handshake=False)
+
+    bus._sync_read(addr, length, list(ids_values))
+    sync_reader = bus.sync_reader
+    read_values, _ = bus._sync_read(addr, length, list(ids_values))
+
+    assert bus.sync_reader is sync_reader
+    assert mock_motors.stubs[stub].calls == 2
+    assert read_values == ids_values
+
+    read_values, _ = bus._sync_read(addr, length, [1])
+
+    assert bus.sync_reader is not sync_reader
+    assert mock_motors.stubs[other_stub].calls == 1
+    assert read_values == {1: 1337}
+
+
+def test__sync_write_changes_params(mock_motors, dummy_motors):
+    addr, length = (42, 4)
+    bus = FeetechMotorsBus(port=mock_motors.port, motors=dummy_motors)
+    bus.connect(handshake=False)
+
+    for ids_values in ({1: 1337, 2: 42}, {1: 4016, 2: 7}):
+        stub = mock_motors.build_sync_write_stub(addr, length, ids_values)
+        comm = bus._sync_write(addr, length, ids_values)
+
+        assert mock_motors.stubs[stub].wait_called()
+        assert comm == scs.COMM_SUCCESS
+
+    assert len(bus._sync_writers) == 1
+
+
+def test_polling(mock_motors, dummy_motors, dummy_calibration):
+    positions = {1: 1337, 2: 42, 3: 3000}
+    addr, length = STS_SMS_SERIES_CONTROL_TABLE["Present_Position"]
+    stub = mock_motors.build_sync_read_stub(addr, length, positions)
+    bus = FeetechMotorsBus(port=mock_motors.port, motors=dummy_motors, calibration=dummy_calibration)
+    bus.connect(handshake=False)
+
+    bus.start_polling(["Present_Position"], fps=100)
+    state = bus.read_latest()
+
+    assert bus.is_polling
+    assert state.values == {
+        "Present_Position": {f"dummy_{id_}": pos for id_, pos in bus._normalize(positions).items()}
+    }
+    assert 0 <= state.age_s < 1
+    assert mock_motors.stubs[stub].wait_calls(min_calls=3)
+
+    bus.disconnect(disable_torque=False)
+    assert not bus.is_polling
+
+
+def test_async_write_coalesced(mock_motors, dummy_motors, dummy_calibration):
+    addr, length = STS_SMS_SERIES_CONTROL_TABLE["Goal_Position"]
+    read_addr, read_length = STS_SMS_SERIES_CONTROL_TABLE["Present_Position"]
+    mock_motors.build_sync_read_stub(read_addr, read_length, {1: 0, 2: 0, 3: 0})
+    outdated_stub = mock_motors.build_sync_write_stub(addr, length, {1: 100, 2: 200})
+    stub = mock_motors.build_sync_write_stub(addr, length, {1: 300, 2: 200, 3: 400})
+    bus = FeetechMotorsBus(port=mock_motors.port, motors=dummy_motors, calibration=dummy_calibration)
+    bus.connect(handshake=False)
+
+    # At 1 fps, the goals queued after the first state are only sent when the polling stops
+    bus.start_polling(["Present_Position"], fps=1)
+    bus.read_latest()
+    bus.async_write("Goal_Position", {"dummy_1": 100, "dummy_2": 200}, normalize=False)
+    bus.async_write("Goal_Position", {"dummy_1": 300, "dummy_3": 400}, normalize=False)
+    bus.stop_polling()
+
+    assert mock_motors.stubs[stub].wait_called()
+    assert not mock_motors.stubs[outdated_stub].called
+
+
+def test_read_latest_max_age(mock_motors, dummy_motors, dummy_calibration):
+    addr, length = STS_SMS_SERIES_CONTROL_TABLE["Present_Position"]
+    mock_motors.build_sync_read_stub(addr, length, {1: 1337, 2: 42, 3: 3000})
+    bus = FeetechMotorsBus(port=mock_motors.port, motors=dummy_motors, calibration=dummy_calibration)
+    bus.connect(handshake=False)
+
+    # At 1 fps, the first state is not refreshed during the test
+    bus.start_polling(["Present_Position"], fps=1)
+    bus.read_latest(max_age_s=1.0)
+    time.sleep(0.05)
+    with pytest.raises(TimeoutError, match="old"):
+        bus.read_latest(max_age_s=0.01)
+
+    bus.disconnect(disable_torque=False)
+
+
+def test_stop_polling_timeout_drops_queued_goals(mock_motors, dummy_motors, dummy_calibration):
+    bus = FeetechMotorsBus(port=mock_motors.port, motors=dummy_motors, calibration=dummy_calibration)
+    bus.connect(handshake=False)
+
+    # Polling thread stuck in a transaction, which doesn't see the stop event
+    release = threading.Event()
+    bus._poll_loop = lambda stop_event, period_s: release.wait()
+    bus.start_polling(["Present_Position"], fps=100)
+    bus.async_write("Goal_Position", {"dummy_1": 100, "dummy_2": 200, "dummy_3": 300}, normalize=False)
+    with patch.object(bus, "sync_write") as sync_write:
+        bus.stop_polling()
+    release.set()
+
+    assert not bus.is_polling
+    assert bus._pending_writes == {}
+    sync_write.assert_not_called()
+    bus.disconnect(disable_torque=False)
+
+
+def test_failed_goals_queued_again(mock_motors, dummy_motors, dummy_calibration):
+    bus = FeetechMotorsBus(port=mock_motors.port, motors=dummy_motors, calibration=dummy_calibration)
+    bus.connect(handshake=False)
+    bus._pending_writes = {("Goal_Position", False): {"dummy_1": 100, "dummy_2": 200}}
+
+    def failing_sync_write(data_name, values, normalize):
+        # A newer goal is queued while the write is in flight
+        bus._pending_writes = {("Goal_Position", False): {"dummy_2": 300}}
+        raise ConnectionError("No status packet")
+
+    with patch.object(bus, "sync_write", side_effect=failing_sync_write), pytest.raises(ConnectionError):
+        bus._send_pending_writes()
+
+    assert bus._pending_writes == {("Goal_Position", False): {"dummy_2": 300, "dummy_1": 100}}
+    bus.disconnect(disable_torque=False)
+
+
+def test_polling_errors_logged_once(mock_motors, dummy_motors, dummy_calibration, caplog):
+    bus = FeetechMotorsBus(port=mock_motors.port, motors=dummy_motors, calibration=dummy_calibration)
+    bus.connect(handshake=False)
+
+    with patch.object(
+        bus, "sync_read_many", side_effect=ConnectionError("No status packet")
+    ) as sync_read_many:
+        bus.start_polling(["Present_Position"], fps=1000)
+        while sync_read_many.call_count < 10:
+            time.sleep(0.01)
+        bus.stop_polling()
+
+    errors = [record for record in caplog.records if "Error polling" in record.getMessage()]
+    assert len(errors) == 1
+    bus.disconnect(disable_torque=False)
+
+
 def test_is_calibrated(mock_motors, dummy_motors, dummy_calibration):
     mins_stubs, maxes_stubs, homings_stubs = [], [], []
     for cal in dummy_calibration.values():
@@ -15,12 +15,15 @@
 # limitations under the License.
 
 import re
+import struct
 from unittest.mock import patch
 
+import numpy as np
 import pytest
 
 from lerobot.motors.motors_bus import (
     Motor,
+    MotorCalibration,
     MotorNormMode,
     assert_same_address,
     get_address,
@@ -356,3 +359,104 @@ def test_sync_write_by_value_dict(data_name, ids_values, dummy_motors):
     mock__encode_sign.assert_called_once_with(data_name, ids_values)
     if data_name in bus.normalized_data:
         mock__unnormalize.assert_called_once_with(ids_values)
+
+
+def _loop_normalize(bus, ids_values):
+    """Normalization motor by motor with Python numbers, which the vectorized one reproduces."""
+    normalized_values = {}
+    for id_, val in ids_values.items():
+        motor = bus._id_to_name(id_)
+        min_, max_ = bus.calibration[motor].range_min, bus.calibration[motor].range_max
+        drive_mode = bus.apply_drive_mode and bus.calibration[motor].drive_mode
+        bounded_val = min(max_, max(min_, val))
+        if bus.motors[motor].norm_mode is MotorNormMode.RANGE_M100_100:
+            norm = (((bounded_val - min_) / (max_ - min_)) * 200) - 100
+            normalized_values[id_] = -norm if drive_mode else norm
+        elif bus.motors[motor].norm_mode is MotorNormMode.RANGE_0_100:
+            norm = ((bounded_val - min_) / (max_ - min_)) * 100
+            normalized_values[id_] = 100 - norm if drive_mode else norm
+        else:
+            max_res = bus.model_resolution_table[bus._id_to_model(id_)] - 1
+            normalized_values[id_] = (val - (min_ + max_) / 2) * 360 / max_res
+    return normalized_values
+
+
+def _loop_unnormalize(bus, ids_values):
+    unnormalized_values = {}
+    for id_, val in ids_values.items():
+        motor = bus._id_to_name(id_)
+        min_, max_ = bus.calibration[motor].range_min, bus.calibration[motor].range_max
+        drive_mode = bus.apply_drive_mode and bus.calibration[motor].drive_mode
+        if bus.motors[motor].norm_mode is MotorNormMode.RANGE_M100_100:
+            val = -val if drive_mode else val
+            bounded_val = min(100.0, max(-100.0, val))
+            unnormalized_values[id_] = int(((bounded_val + 100) / 200) * (max_ - min_) + min_)
+        elif bus.motors[motor].norm_mode is MotorNormMode.RANGE_0_100:
+            val = 100 - val if drive_mode else val
+            bounded_val = min(100.0, max(0.0, val))
+            unnormalized_values[id_] = int((bounded_val / 100) * (max_ - min_) + min_)
+        else:
+            max_res = bus.model_resolution_table[bus._id_to_model(id_)] - 1
+            unnormalized_values[id_] = int((val * max_res / 360) + (min_ + max_) / 2)
+    return unnormalized_values
+
+
+def _bits(values: dict) -> dict:
+    return {id_: struct.pack("<d", val) if isinstance(val, float) else val for id_, val in values.items()}
+
+
+@pytest.mark.parametrize("apply_drive_mode", [False, True])
+def test_normalize_matches_loop(apply_drive_mode):
+    motors = {
+        f"dummy_{id_}": Motor(id_, model, norm_mode)
+        for id_, (model, norm_mode) in enumerate(
+            [
+                ("model_2", MotorNormMode.RANGE_M100_100),
+                ("model_3", MotorNormMode.RANGE_M100_100),
+                ("model_3", MotorNormMode.RANGE_0_100),
+                ("model_2", MotorNormMode.RANGE_0_100),
+                ("model_3", MotorNormMode.DEGREES),
+                ("model_2", MotorNormMode.DEGREES),
+            ],
+            start=1,
+        )
+    }
+    bus = MockMotorsBus("/dev/dummy-port", motors)
+    bus.apply_drive_mode = apply_drive_mode
+    bus.calibration = {
+        motor: MotorCalibration(m.id, m.id % 2, 0, range_min=100 + 7 * m.id, range_max=1000 - 13 * m.id)
+        for motor, m in motors.items()
+    }
+
+    rng = np.random.default_rng(0)
+    for positions in rng.integers(0, 1024, size=(200, len(motors))):
+        ids_values = dict(zip(bus.ids, positions.tolist(), strict=True))
+        assert _bits(bus._normalize(ids_values)) == _bits(_loop_normalize(bus, ids_values))
+
+    edges = [-150.0, -100.0, -0.0, 0.0, 50.0, 100.0, 150.0]
+    for values in [*rng.uniform(-120, 120, size=(200, len(motors))), *np.resize(edges, (3, len(motors)))]:
+        ids_values = dict(zip(bus.ids, values.tolist(), strict=True))
+        assert _bits(bus._unnormalize(ids_values)) == _bits(_loop_unnormalize(bus, ids_values))
+
+    # Selection of motors in another order
+    ids_values = {5: 512, 3: 77, 1: 1000}
+    assert _bits(bus._normalize(ids_values)) == _bits(_loop_normalize(bus, ids_values))
+
+
+def test_normalize_calibration_updates(dummy_motors):
+    bus = MockMotorsBus("/dev/dummy-port", dummy_motors)
+    bus.apply_drive_mode = False
+    with pytest.raises(RuntimeError, match="no calibration"):
+        bus._normalize({1: 0})
+
+    bus.calibration = {motor: MotorCalibration(m.id, 0, 0, 0, 1000) for motor, m in dummy_motors.items()}
+    assert bus._normalize({1: 500, 3: 500}) == {1: 0.0, 3: 50.0}
+
+    bus.calibration = {motor: MotorCalibration(m.id, 0, 0, 500, 1000) for motor, m in dummy_motors.items()}
+    assert bus._normalize({1: 500, 3: 500}) == {1: -100.0, 3: 0.0}
+
+    bus.calibration["dummy_1"].range_max = 500
+    bus.calibration = bus.calibration
+    with pytest.raises(ValueError, match="'dummy_1': min and max are equal"):
+        bus._normalize({1: 500})
+    assert bus._normalize({3: 1000}) == {3: 100.0}
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from contextlib import contextmanager
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from lerobot.errors import DeviceNotConnectedError
+from lerobot.robots.bi_so100_follower import BiSO100Follower, BiSO100FollowerConfig
+from lerobot.robots.so100_follower import SO100Follower
+
+
+def _make_bus_mock(*_args, **kwargs) -> MagicMock:
+    """Return a bus mock of one arm, with just the attributes used by the robot."""
+    bus = MagicMock(name="FeetechBusMock")
+    bus.motors = kwargs["motors"]
+    bus.is_connected = False
+    bus.is_calibrated = True
+    bus.sync_read.return_value = {motor: idx for idx, motor in enumerate(bus.motors, 1)}
+
+    def _connect():
+        bus.is_connected = True
+
+    def _disconnect(_disable=True):
+        bus.is_connected = False
+
+    bus.connect.side_effect = _connect
+    bus.disconnect.side_effect = _disconnect
+
+    @contextmanager
+    def _dummy_cm():
+        yield
+
+    bus.torque_disabled.side_effect = _dummy_cm
+    return bus
+
+
+@pytest.fixture
+def follower():
+    with (
+        patch("lerobot.robots.so100_follower.so100_follower.FeetechMotorsBus", side_effect=_make_bus_mock),
+        patch.object(SO100Follower, "configure", lambda self: None),
+    ):
+        cfg = BiSO100FollowerConfig(left_arm_port="/dev/null", right_arm_port="/dev/null")
+        robot = BiSO100Follower(cfg)
+        yield robot
+        if robot.is_connected:
+            robot.disconnect()
+
+
+def test_arms_executor_lifecycle(follower):
+    assert follower.arms_executor is None
+
+    for _ in range(2):
+        follower.connect()
+        executor = follower.arms_executor
+        obs = follower.get_observation()
+        assert set(obs) == set(follower._motors_ft)
+
+        follower.disconnect()
+        assert follower.arms_executor is None
+        with pytest.raises(RuntimeError):
+            executor.submit(lambda: None)
+
+
+def test_not_connected(follower):
+    with pytest.raises(DeviceNotConnectedError):
+        follower.get_observation()
+    with pytest.raises(DeviceNotConnectedError):
+        follower.send_action({})
+
+    follower.connect()
+    follower.disconnect()
+    with pytest.raises(DeviceNotConnectedError):
+        follower.get_observation()
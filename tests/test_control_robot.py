@@ -14,9 +14,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
+from types import SimpleNamespace
+
+import torch
+
 from lerobot.calibrate import CalibrateConfig, calibrate
-from lerobot.record import DatasetRecordConfig, RecordConfig, record
+from lerobot.datasets.lerobot_dataset import LeRobotDataset
+from lerobot.datasets.utils import DEFAULT_TIMINGS_PATH, hw_to_dataset_features
+from lerobot.record import DatasetRecordConfig, RecordConfig, pipelined_record_loop, record
 from lerobot.replay import DatasetReplayConfig, ReplayConfig, replay
+from lerobot.robots import make_robot_from_config
 from lerobot.teleoperate import TeleoperateConfig, teleoperate
 from tests.fixtures.constants import DUMMY_REPO_ID
 from tests.mocks.mock_robot import MockRobotConfig
@@ -74,6 +82,61 @@ def test_record_and_resume(tmp_path):
     assert dataset.meta.total_tasks == 1
 
 
+def test_record_pipelined(tmp_path):
+    robot_cfg = MockRobotConfig()
+    teleop_cfg = MockTeleopConfig()
+    dataset_cfg = DatasetRecordConfig(
+        repo_id=DUMMY_REPO_ID,
+        single_task="Dummy task",
+        root=tmp_path / "record",
+        num_episodes=2,
+        episode_time_s=0.2,
+        reset_time_s=0.1,
+        push_to_hub=False,
+    )
+    cfg = RecordConfig(
+        robot=robot_cfg,
+        dataset=dataset_cfg,
+        teleop=teleop_cfg,
+        play_sounds=False,
+        pipelined_loop=True,
+    )
+
+    dataset = record(cfg)
+
+    assert dataset.meta.total_episodes == dataset.num_episodes == 2
+    # Up to 6 frames per episode, fewer if deadlines are missed on a loaded machine
+    assert 2 <= dataset.meta.total_frames == dataset.num_frames <= 12
+    for episode_index in range(2):
+        timings_path = dataset.root / DEFAULT_TIMINGS_PATH.format(episode_index=episode_index)
+        with open(timings_path) as f:
+            assert "observation" in json.load(f)["stages"]
+
+
+def test_pipelined_record_loop_with_policy(tmp_path, monkeypatch):
+    robot = make_robot_from_config(MockRobotConfig())
+    robot.connect()
+    features = {
+        **hw_to_dataset_features(robot.action_features, "action"),
+        **hw_to_dataset_features(robot.observation_features, "observation"),
+    }
+    dataset = LeRobotDataset.create(DUMMY_REPO_ID, 30, root=tmp_path / "record", features=features)
+    policy = SimpleNamespace(reset=lambda: None, config=SimpleNamespace(device="cpu", use_amp=False))
+    monkeypatch.setattr(
+        "lerobot.record.predict_action", lambda *args, **kwargs: torch.zeros(len(robot.action_features))
+    )
+
+    timings = pipelined_record_loop(
+        robot, {"exit_early": False}, 30, dataset, policy=policy, control_time_s=0.2, single_task="Dummy task"
+    )
+    robot.disconnect()
+
+    # Every action sent is recorded, with the observation it was computed from
+    assert 1 <= dataset.episode_buffer["size"] == timings.histograms["action"].count <= 6
+    assert timings.histograms["inference"].count >= dataset.episode_buffer["size"]
+    assert dataset.episode_buffer["action"][0].tolist() == [0.0] * len(robot.action_features)
+
+
 def test_record_and_replay(tmp_path):
     robot_cfg = MockRobotConfig()
     teleop_cfg = MockTeleopConfig()
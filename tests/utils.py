@@ -16,9 +16,12 @@
 import os
 import platform
 from functools import wraps
+from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 import torch
+from huggingface_hub.utils import filter_repo_objects
 
 from lerobot import available_cameras, available_motors, available_robots
 from lerobot.utils.import_utils import is_package_available
@@ -182,3 +185,20 @@ def require_package(package_name):
         return wrapper
 
     return decorator
+
+
+def pushed_files(dataset) -> list[str]:
+    """Paths (relative to its root) of the files of 'dataset' which `push_to_hub` uploads, without uploading."""
+    with patch("lerobot.datasets.lerobot_dataset.HfApi") as hf_api_cls:
+        dataset.push_to_hub(tag_version=False)
+
+    upload_kwargs = hf_api_cls.return_value.upload_folder.call_args.kwargs
+    root = Path(upload_kwargs["folder_path"])
+    local_files = [path.relative_to(root).as_posix() for path in root.rglob("*") if path.is_file()]
+    return list(
+        filter_repo_objects(
+            local_files,
+            allow_patterns=upload_kwargs["allow_patterns"],
+            ignore_patterns=upload_kwargs["ignore_patterns"],
+        )
+    )
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+
+# Copyright 2024 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import threading
+import time
+
+import pytest
+
+from lerobot.utils.robot_utils import make_arms_executor, run_on_arms
+from lerobot.utils.timing_utils import StageTimer
+
+
+def test_run_on_arms_concurrently():
+    executor = make_arms_executor("bimanual")
+    # Both arms have to be running at the same time to pass the barrier
+    barrier = threading.Barrier(2, timeout=1.0)
+
+    def arm_fn(value):
+        def fn():
+            barrier.wait()
+            time.sleep(0.01 * value)
+            return value
+
+        return fn
+
+    timer = StageTimer()
+    with timer.activate():
+        results = run_on_arms(executor, arm_fn(2), arm_fn(1), "bimanual read")
+
+    assert results == (2, 1)
+    assert timer.histograms["bimanual read left_arm"].count == 1
+    assert timer.histograms["bimanual read right_arm"].count == 1
+    executor.shutdown()
+
+
+def test_run_on_arms_error():
+    executor = make_arms_executor("bimanual")
+    right_done = threading.Event()
+
+    def left_fn():
+        raise ConnectionError("left bus")
+
+    def right_fn():
+        time.sleep(0.05)
+        right_done.set()
+
+    with pytest.raises(ConnectionError, match="left bus"):
+        run_on_arms(executor, left_fn, right_fn, "bimanual send")
+    assert right_done.is_set()
+    executor.shutdown()
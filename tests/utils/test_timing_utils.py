@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+
+# Copyright 2024 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import math
+import threading
+
+import numpy as np
+import pytest
+
+from lerobot.utils.timing_utils import LatencyHistogram, StageTimer, record_stage
+
+
+@pytest.mark.parametrize("q", [1, 50, 90, 99, 99.9])
+def test_histogram_percentile_relative_error(q):
+    durations = np.random.default_rng(0).lognormal(mean=math.log(0.01), sigma=1.0, size=10_000)
+    histogram = LatencyHistogram()
+    for duration in durations:
+        histogram.record(duration)
+
+    expected = np.percentile(durations, q, method="inverted_cdf")
+    assert histogram.percentile(q) == pytest.approx(expected, rel=2 ** (1 / 32) - 1)
+    assert histogram.count == len(durations)
+    assert histogram.max == durations.max()
+    assert histogram.mean == pytest.approx(durations.mean())
+
+
+def test_histogram_out_of_range():
+    histogram = LatencyHistogram(min_s=1e-3, max_s=1.0)
+    for duration in [0.0, 1e-6, 5.0, 50.0]:
+        histogram.record(duration)
+    assert histogram.counts[0] == 2 and histogram.counts[-1] == 2
+    # Percentiles stay within the recorded durations
+    assert histogram.percentile(1) == 1e-3
+    assert histogram.percentile(100) == 50.0
+
+
+def test_histogram_merge():
+    histograms = [LatencyHistogram(), LatencyHistogram()]
+    for i, duration in enumerate([0.001, 0.002, 0.003, 0.1]):
+        histograms[i % 2].record(duration)
+    histograms[0].merge(histograms[1])
+    assert histograms[0].count == 4
+    assert histograms[0].max == 0.1
+    assert histograms[0].percentile(50) == pytest.approx(0.002, rel=0.03)
+
+    with pytest.raises(ValueError):
+        histograms[0].merge(LatencyHistogram(min_s=1e-3))
+
+
+def test_empty_histogram():
+    histogram = LatencyHistogram()
+    assert math.isnan(histogram.percentile(50))
+    assert math.isnan(histogram.mean)
+
+
+def test_stage_timer_deadline_misses():
+    timer = StageTimer(fps=10)
+    for dt_s in [0.05, 0.09, 0.11, 0.5]:
+        timer.tick(dt_s)
+    summary = timer.summary()
+    assert summary["counters"] == {"deadline_misses": 2}
+    assert summary["stages"]["loop"]["count"] == 4
+    assert summary["stages"]["loop"]["max_ms"] == pytest.approx(500)
+
+
+def test_record_stage_in_active_timer():
+    timer = StageTimer()
+    record_stage("camera", 0.01)  # no active timer
+    with timer.activate():
+        with timer.time("observation"):
+            record_stage("camera", 0.01)
+        thread = threading.Thread(target=record_stage, args=("camera", 0.02))
+        thread.start()
+        thread.join()
+    record_stage("camera", 0.03)
+
+    assert timer.histograms["camera"].count == 2
+    assert timer.histograms["observation"].count == 1
+
+
+def test_stage_timer_save(tmp_path):
+    timer = StageTimer(fps=30)
+    timer.record("inference", 0.02)
+    timer.increment("dropped_observations")
+    path = tmp_path / "timings" / "episode_000000.json"
+    timer.save(path)
+
+    with open(path) as f:
+        summary = json.load(f)
+    assert summary["fps"] == 30
+    assert summary["counters"] == {"dropped_observations": 1, "deadline_misses": 0}
+    assert set(summary["stages"]["inference"]) == {"count", "mean_ms", "p50_ms", "p99_ms", "max_ms"}
+
+    timer.reset()
+    assert timer.summary()["stages"] == {}